@@ -0,0 +1,178 @@
+"""Data layer and analytics benchmarks against a real MongoDB.
+
+    MONGODB_URI=mongodb://localhost:27017 \\
+        python -m benchmarks.data_layer --sizes 10000 100000 --output bench.json
+    python -m benchmarks.data_layer --sizes 10000 --baseline bench.json
+
+Every size is seeded into --db-name with the synthetic data generator, which
+drops that database's transactions, products and daily_sales first. Results
+are written as JSON; --baseline prints the ratio to an earlier run.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from src.config import Config
+from src.database.seed import seed_dataset
+from src.models.product import ProductManager
+from src.models.transaction import Transaction, TransactionManager
+from src.utils import excel_export
+from src.utils.calculate_metrics import calculate_metrics, calculate_metrics_vectorized
+from src.utils.calculate_totals import calculate_totals
+
+
+def timed(fn, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {
+        "min_seconds": round(min(times), 6),
+        "median_seconds": round(statistics.median(times), 6),
+        "rounds": rounds,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(size, args):
+    seed_start = date.fromisoformat(args.start)
+    seed_dataset(
+        args.products, size, seed=args.seed, start=seed_start, days=args.days, drop=True
+    )
+
+    transaction_manager = TransactionManager()
+    products = ProductManager().get_all_products()
+    # Rentang 30 hari terakhir, seperti laporan bulanan
+    range_end = seed_start + timedelta(days=args.days - 1)
+    range_start = range_end - timedelta(days=29)
+    all_start, all_end = seed_start, range_end
+
+    transactions = transaction_manager.get_all_transactions()
+    batch = transaction_manager.get_transaction_batch()
+    documents = list(transaction_manager.collection.find())
+    xlsx_path = os.path.join(tempfile.gettempdir(), "benchmark_export.xlsx")
+
+    def export_xlsx():
+        excel_export.write_sales_report(
+            xlsx_path,
+            transaction_manager.iter_transactions_by_date_range(
+                all_start, all_end, projection=excel_export.PROJECTION
+            ),
+        )
+
+    cases = {
+        "get_all_transactions": transaction_manager.get_all_transactions,
+        "get_transactions_by_date_range": lambda: (
+            transaction_manager.get_transactions_by_date_range(range_start, range_end)
+        ),
+        "get_transaction_batch": transaction_manager.get_transaction_batch,
+        "transaction_from_dict": lambda: [
+            Transaction.from_dict(document) for document in documents
+        ],
+        "calculate_totals": lambda: calculate_totals(transactions),
+        "get_sales_totals": transaction_manager.get_sales_totals,
+        "calculate_metrics_vectorized": lambda: calculate_metrics_vectorized(
+            batch, products
+        ),
+        # Pengganti calculate_trends sejak ringkasan dihitung di server
+        "summarize_range": lambda: transaction_manager.summarize_range(
+            all_start, all_end
+        ),
+        "xlsx_export": export_xlsx,
+    }
+    if size <= args.legacy_limit:
+        # Versi loop lama kuadratik terhadap jumlah hari, hanya untuk data kecil
+        cases["calculate_metrics"] = lambda: calculate_metrics(
+            SimpleNamespace(), transactions, products
+        )
+
+    results = {}
+    for name, fn in cases.items():
+        results[name] = timed(fn, args.rounds)
+        print(f"{size:>9} {name:<32}{results[name]['median_seconds']:>10.4f}s")
+    os.remove(xlsx_path)
+    return results
+
+
+def compare(result, baseline):
+    print(f"\n{'Size':>9} {'Benchmark':<32}{'Baseline':>10}{'Now':>10}{'Ratio':>8}")
+    for size, cases in result["sizes"].items():
+        for name, timing in cases.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(name)
+            if not old or not old["median_seconds"]:
+                continue
+            ratio = timing["median_seconds"] / old["median_seconds"]
+            print(
+                f"{size:>9} {name:<32}{old['median_seconds']:>10.4f}"
+                f"{timing['median_seconds']:>10.4f}{ratio:>8.2f}"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.data_layer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="2023-01-01")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--legacy-limit",
+        type=int,
+        default=20000,
+        help="Largest size the loop based calculate_metrics runs on",
+    )
+    parser.add_argument("--db-name", default="PyStockFlow_benchmark")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    parser.add_argument("--baseline", help="earlier JSON result to compare with")
+    args = parser.parse_args(argv)
+
+    # Jangan pernah seed ke database aplikasi
+    os.environ["DB_NAME"] = args.db_name
+    Config.invalidate_env_cache()
+
+    result = {
+        "benchmark": "data_layer",
+        "commit": git_commit(),
+        "db_name": args.db_name,
+        "seed": args.seed,
+        "products": args.products,
+        "sizes": {},
+    }
+    for size in args.sizes:
+        result["sizes"][str(size)] = run_size(size, args)
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(result, json.load(f))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Repaint/scroll benchmark for the table models, runs offscreen.
+
+    python -m benchmarks.table_models --rows 5000 --rounds 3
+
+Compares the cached display strings of SalesTableModel with a model that
+formats every cell inside data(), like the models did before.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from bson import ObjectId
+from PySide6.QtCore import Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QAbstractSlider, QApplication, QTableView
+from src.models.transaction import Transaction
+from src.ui.models.sales_table_model import SalesTableModel
+
+
+class UncachedSalesTableModel(SalesTableModel):
+    """Formats on every data() call, the behaviour before caching"""
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.display_row(self._rows[index.row()])[index.column()]
+        return None
+
+
+def make_transactions(count):
+    product_id = ObjectId()
+    start = datetime(2024, 1, 1)
+    return [
+        Transaction(
+            product_id=product_id,
+            product_name=f"Product {i % 50}",
+            quantity=i % 7 + 1,
+            total=Decimal(15000 + i),
+            capital=Decimal(10000),
+            profit=Decimal(5000 + i),
+            date=start + timedelta(days=i % 365),
+            _id=ObjectId(),
+        )
+        for i in range(count)
+    ]
+
+
+def measure_data(model_class, transactions, rounds):
+    """Raw data() cost: every cell read once per round, as a repaint does"""
+    model = model_class(transactions)
+    indexes = [
+        model.index(row, col)
+        for row in range(model.rowCount())
+        for col in range(model.columnCount())
+    ]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for index in indexes:
+            model.data(index, Qt.DisplayRole)
+    return time.perf_counter() - start
+
+
+def measure(model_class, transactions, rounds):
+    view = QTableView()
+    view.resize(1000, 700)
+    model = model_class(transactions)
+    view.setModel(model)
+    view.show()
+    QTest.qWaitForWindowExposed(view)
+
+    scroll_bar = view.verticalScrollBar()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        view.scrollToTop()
+        # Scroll satu layar per langkah sampai akhir tabel
+        while scroll_bar.value() < scroll_bar.maximum():
+            scroll_bar.triggerAction(QAbstractSlider.SliderPageStepAdd)
+            view.viewport().repaint()
+            QTest.qWait(0)
+    elapsed = time.perf_counter() - start
+
+    view.close()
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.table_models")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    transactions = make_transactions(args.rows)
+
+    # Pemanasan agar font dan style sudah dimuat sebelum diukur
+    measure(SalesTableModel, transactions[:100], 1)
+
+    result = {"benchmark": "table_models", "rows": args.rows, "rounds": args.rounds}
+    for name, run in (("data_calls", measure_data), ("scroll_repaint", measure)):
+        uncached = run(UncachedSalesTableModel, transactions, args.rounds)
+        cached = run(SalesTableModel, transactions, args.rounds)
+        result[name] = {
+            "uncached_seconds": round(uncached, 4),
+            "cached_seconds": round(cached, 4),
+            "speedup": round(uncached / cached, 2) if cached else None,
+        }
+    output = json.dumps(result, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    app.quit()
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""UI latency benchmarks of MainWindow against a seeded MongoDB, runs offscreen.
+
+    MONGODB_URI=mongodb://localhost:27017 \\
+        python -m benchmarks.ui --sizes 10000 100000 1000000 --output ui.json
+    python -m benchmarks.ui --sizes 100000 --budget sales_page_flip=100 \\
+        --budget 1000000:sales_sort_change=3000
+
+Every size is seeded into --db-name like benchmarks.data_layer, ending today
+so the Charts tab has data for the selected years. Each action is timed from
+the call that a user interaction triggers until every DataLoader delivered
+its result and the window is repainted; search debouncing is not included.
+Budgets are median milliseconds, the process exits with status 1 when one is
+exceeded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QThreadPool
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QTabWidget
+from src.config import Config
+from src.database.seed import seed_dataset
+from src.ui.main_window import MainWindow
+from src.utils.data_loader import DataLoader
+
+from benchmarks.data_layer import git_commit
+
+DEFAULT_BUDGETS = {
+    "first_paint": 1500,
+    "first_data": 5000,
+    "sales_search_first": 5000,
+    "sales_search_keystroke": 100,
+    "product_search_keystroke": 100,
+    "sales_page_flip": 250,
+    "sales_last_page": 500,
+    "sales_sort_change": 2000,
+    "product_sort_change": 250,
+    "chart_year_switch": 1000,
+    "chart_year_switch_cached": 100,
+}
+
+
+def wait_idle(window, timeout):
+    """Pump events until no DataLoader of the window has a pending job"""
+    app = QApplication.instance()
+    pool = QThreadPool.globalInstance()
+    deadline = time.perf_counter() + timeout
+    while True:
+        app.processEvents()
+        # Loader baru bisa dibuat selama berjalan, jadi dicari ulang tiap putaran
+        if all(loader.is_idle() for loader in window.findChildren(DataLoader)):
+            break
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"UI did not become idle within {timeout}s")
+        pool.waitForDone(5)
+    window.repaint()
+    app.processEvents()
+
+
+def timed_action(window, action, timeout):
+    start = time.perf_counter()
+    action()
+    wait_idle(window, timeout)
+    return (time.perf_counter() - start) * 1000
+
+
+def summarize(samples):
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "samples": len(samples),
+    }
+
+
+def type_text(entry, apply, text):
+    """One action per keystroke, as the search timer would fire it"""
+    return [
+        lambda prefix=text[:length]: (entry.setText(prefix), apply())
+        for length in range(1, len(text) + 1)
+    ]
+
+
+def run_window(args):
+    app = QApplication.instance()
+    timings = {}
+
+    start = time.perf_counter()
+    window = MainWindow()
+    window.show()
+    QTest.qWaitForWindowExposed(window)
+    timings["first_paint"] = [(time.perf_counter() - start) * 1000]
+    wait_idle(window, args.timeout)
+    timings["first_data"] = [(time.perf_counter() - start) * 1000]
+
+    notebook = window.findChild(QTabWidget)
+    sales_tab = window.sales_tab
+    product_tab = window.product_tab
+    chart_tab = window.chart_tab
+
+    def measure(name, actions):
+        timings[name] = [
+            timed_action(window, action, args.timeout) for action in actions
+        ]
+
+    # Products: filter dan sort pada cache
+    notebook.setCurrentWidget(product_tab)
+    measure(
+        "product_search_keystroke",
+        type_text(product_tab.search_entry, product_tab.apply_filter, args.query),
+    )
+    product_tab.search_entry.clear()
+    product_tab.apply_filter()
+    measure(
+        "product_sort_change",
+        [
+            lambda index=index: product_tab.sort_combobox.setCurrentIndex(index)
+            for index in range(1, product_tab.sort_combobox.count())
+        ],
+    )
+    product_tab.sort_combobox.setCurrentIndex(0)
+
+    # Sales: paging dan sort di server, pencarian pada snapshot
+    notebook.setCurrentWidget(sales_tab)
+    pagination = sales_tab.pagination
+    measure(
+        "sales_page_flip",
+        [pagination.next_page for _ in range(args.rounds)],
+    )
+    measure(
+        "sales_last_page",
+        [lambda: pagination.set_page(pagination.total_pages)],
+    )
+    measure(
+        "sales_sort_change",
+        [
+            lambda index=index: sales_tab.sort_combobox.setCurrentIndex(index)
+            for index in range(1, sales_tab.sort_combobox.count())
+        ],
+    )
+    sales_tab.sort_combobox.setCurrentIndex(0)
+    wait_idle(window, args.timeout)
+
+    keystrokes = type_text(sales_tab.search_entry, sales_tab.apply_search, args.query)
+    # Huruf pertama juga memuat snapshot, diukur terpisah
+    measure("sales_search_first", keystrokes[:1])
+    measure("sales_search_keystroke", keystrokes[1:])
+    sales_tab.search_entry.clear()
+    sales_tab.apply_search()
+    wait_idle(window, args.timeout)
+
+    # Charts: putaran pertama mengisi cache, putaran kedua memakainya
+    notebook.setCurrentWidget(chart_tab)
+    years = [
+        chart_tab.year_combo.itemText(i)
+        for i in range(chart_tab.year_combo.count())
+        if chart_tab.year_combo.itemText(i) != chart_tab.year_combo.currentText()
+    ]
+    years.append(chart_tab.year_combo.currentText())
+    for name in ("chart_year_switch", "chart_year_switch_cached"):
+        measure(
+            name,
+            [
+                lambda year=year: chart_tab.year_combo.setCurrentText(year)
+                for year in years
+            ],
+        )
+
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+    return {name: summarize(samples) for name, samples in timings.items()}
+
+
+def parse_budget(value):
+    """NAME=MS for every size or SIZE:NAME=MS for one size"""
+    try:
+        target, ms = value.split("=")
+        size, _, name = target.rpartition(":")
+        return (int(size) if size else None), name, float(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"budget must be NAME=MS or SIZE:NAME=MS, got {value!r}"
+        ) from None
+
+
+def budgets_for(size, overrides):
+    budgets = dict(DEFAULT_BUDGETS)
+    # Budget khusus ukuran menang atas budget umum
+    for scoped in (False, True):
+        for budget_size, name, ms in overrides:
+            if (budget_size is not None) == scoped and budget_size in (None, size):
+                budgets[name] = ms
+    return budgets
+
+
+def check_budgets(size, results, budgets):
+    exceeded = []
+    for name, timing in results.items():
+        budget = budgets.get(name)
+        timing["budget_ms"] = budget
+        if budget is not None and timing["median_ms"] > budget:
+            exceeded.append(f"{size} {name}: {timing['median_ms']:.1f}ms > {budget}ms")
+    return exceeded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.ui")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--rounds", type=int, default=10, help="Page flips per size")
+    parser.add_argument(
+        "--query", default="kopi hemat", help="Typed one character at a time"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=120, help="Seconds to wait for one action"
+    )
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        action="append",
+        default=[],
+        metavar="[SIZE:]NAME=MS",
+        help="Median budget in milliseconds, can be repeated",
+    )
+    parser.add_argument(
+        "--skip-seed",
+        action="store_true",
+        help="Reuse the data already in --db-name, needs exactly one size",
+    )
+    parser.add_argument("--db-name", default="PyStockFlow_benchmark")
+    parser.add_argument("--output", help="write the JSON result to this file")
+    args = parser.parse_args(argv)
+    if args.skip_seed and len(args.sizes) != 1:
+        parser.error("--skip-seed needs exactly one size")
+
+    # Jangan pernah seed ke database aplikasi
+    os.environ["DB_NAME"] = args.db_name
+    Config.invalidate_env_cache()
+    app = QApplication.instance() or QApplication(sys.argv)
+    start = date.today() - timedelta(days=args.days - 1)
+
+    result = {
+        "benchmark": "ui",
+        "commit": git_commit(),
+        "db_name": args.db_name,
+        "seed": args.seed,
+        "products": args.products,
+        "sizes": {},
+    }
+    exceeded = []
+    for size in args.sizes:
+        if not args.skip_seed:
+            seed_dataset(
+                args.products,
+                size,
+                seed=args.seed,
+                start=start,
+                days=args.days,
+                drop=True,
+            )
+        results = run_window(args)
+        exceeded += check_budgets(size, results, budgets_for(size, args.budget))
+        result["sizes"][str(size)] = results
+        for name, timing in results.items():
+            print(f"{size:>9} {name:<28}{timing['median_ms']:>10.1f}ms")
+    result["exceeded"] = exceeded
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    app.quit()
+    if exceeded:
+        print("\nBudget exceeded:\n  " + "\n  ".join(exceeded))
+        raise SystemExit(1)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
+import io
 import os
 import atexit
-from dotenv import load_dotenv
-from PySide6.QtWidgets import QMessageBox
+from dotenv import dotenv_values
 from cryptography.fernet import Fernet, InvalidToken
-from utils.manifest_handler import ManifestHandler
+from src.utils.manifest_handler import ManifestHandler
 
 
 class Config:
@@ -25,6 +25,9 @@ class Config:
     LOG_DIR = os.path.join(os.path.dirname(ENV_FILE_ENC), "logs")
     ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 
+    # (path, mtime) dari file .env terenkripsi yang nilainya sedang dipakai
+    _env_cache_key = None
+
     @classmethod
     def load_env(cls):
         if not os.path.exists(cls.ENV_FILE_ENC):
@@ -33,14 +36,28 @@ class Config:
             )
             cls._initialize_default_env()
 
-        cls.decrypt_env_file()
-        load_dotenv(cls.TEMP_ENV_FILE)
+        # Dekripsi hanya jika file berubah, selain itu pakai nilai di memory
+        cache_key = (cls.ENV_FILE_ENC, os.path.getmtime(cls.ENV_FILE_ENC))
+        if cache_key == cls._env_cache_key:
+            return
+
+        decrypted_data = cls.decrypt_env_file()
+        env_values = dotenv_values(stream=io.StringIO(decrypted_data.decode("utf-8")))
+        for key, value in env_values.items():
+            # Sama seperti load_dotenv: environment variable yang ada tidak ditimpa
+            if value is not None:
+                os.environ.setdefault(key, value)
 
         cls.MONGODB_URI = os.getenv("MONGODB_URI", "")
         cls.DB_NAME = os.getenv("DB_NAME", "PyStockFlow")
         cls.CONNECTION_STRING = (
             os.getenv("CONNECTION_STRING", "false").lower() == "true"
         )
+        cls._env_cache_key = cache_key
+
+    @classmethod
+    def invalidate_env_cache(cls):
+        cls._env_cache_key = None
 
     @classmethod
     def _initialize_default_env(cls):
@@ -76,6 +93,8 @@ class Config:
             with open(cls.TEMP_ENV_FILE, "wb") as file:
                 file.write(decrypted_data)
 
+            return decrypted_data
+
         except InvalidToken:
             print("Invalid encryption token. Unable to decrypt the .env file.")
             raise
@@ -132,6 +151,7 @@ class Config:
             os.environ["CONNECTION_STRING"] = "true"
 
             cls.encrypt_env_file()
+            cls.invalidate_env_cache()
         except Exception as e:
             print(f"Error saving config: {str(e)}")
             raise
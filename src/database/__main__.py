@@ -0,0 +1,194 @@
+import argparse
+import os
+from datetime import date
+from src.config import Config
+from src.database.indexes import IndexManager
+from src.database.migrations import migrate_money_fields
+from src.database.seed import seed_dataset
+from src.database.transfer import COLUMNS, export_collections, import_collections
+from src.models.daily_sales import DailySalesManager
+
+
+def run_indexes(args):
+    manager = IndexManager()
+    created = manager.ensure_indexes()
+    print(f"Created indexes: {', '.join(created) if created else '-'}")
+
+    print(f"{'Collection':<14}{'Index':<20}{'Exists':<8}{'Ops':>10}  Query shape")
+    for row in manager.index_report():
+        print(
+            f"{row['collection']:<14}{row['index']:<20}"
+            f"{'yes' if row['exists'] else 'no':<8}{row['ops']:>10}  "
+            f"{row['query_shape']}"
+        )
+
+
+def run_migrate_money(args):
+    migrated = migrate_money_fields(batch_size=args.batch_size, pause=args.pause)
+    for collection_name, count in migrated.items():
+        print(f"{collection_name}: {count} documents converted to Decimal128")
+
+
+def run_backfill_rollup(args):
+    buckets = DailySalesManager().backfill()
+    print(f"daily_sales rebuilt: {buckets} (date, product) buckets")
+
+
+def run_verify_rollup(args):
+    manager = DailySalesManager()
+    if manager.is_dirty():
+        print("daily_sales is marked out of sync after a failed write")
+        print("The app rebuilds it on the next start, or run backfill-rollup")
+        raise SystemExit(1)
+
+    mismatches = manager.verify()
+    if not mismatches:
+        print("daily_sales matches the transactions")
+        return
+
+    for row in mismatches[: args.limit]:
+        print(
+            f"{row['date']:%Y-%m-%d} {row['product_id']} {row['field']}: "
+            f"expected {row['expected']}, found {row['actual']}"
+        )
+    print(f"{len(mismatches)} mismatching values, run backfill-rollup to rebuild")
+    raise SystemExit(1)
+
+
+def run_export(args):
+    exported = export_collections(args.directory, args.format, args.collections)
+    for collection_name, count in exported.items():
+        print(f"{collection_name}: {count} documents exported to {args.directory}")
+
+
+def run_import(args):
+    imported = import_collections(
+        args.directory, args.format, args.collections, batch_size=args.batch_size
+    )
+    for collection_name, counts in imported.items():
+        print(
+            f"{collection_name}: {counts['inserted']} inserted, "
+            f"{counts['skipped']} already present"
+        )
+
+
+def run_seed(args):
+    seeded = seed_dataset(
+        args.products,
+        args.transactions,
+        seed=args.seed,
+        start=date.fromisoformat(args.start),
+        days=args.days,
+        batch_size=args.batch_size,
+        drop=args.drop,
+    )
+    print(
+        f"{Config.DB_NAME}: {seeded['products']} products, "
+        f"{seeded['transactions']} transactions (seed {args.seed})"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.database", description="PyStockFlow database tools"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    indexes_parser = subparsers.add_parser(
+        "indexes", help="Create missing indexes and show their usage"
+    )
+    indexes_parser.set_defaults(func=run_indexes)
+
+    money_parser = subparsers.add_parser(
+        "migrate-money", help="Convert string money fields to Decimal128"
+    )
+    money_parser.add_argument("--batch-size", type=int, default=1000)
+    money_parser.add_argument(
+        "--pause", type=float, default=0.0, help="Seconds to sleep between batches"
+    )
+    money_parser.set_defaults(func=run_migrate_money)
+
+    backfill_parser = subparsers.add_parser(
+        "backfill-rollup", help="Rebuild the daily_sales rollup from transactions"
+    )
+    backfill_parser.set_defaults(func=run_backfill_rollup)
+
+    verify_parser = subparsers.add_parser(
+        "verify-rollup", help="Check the daily_sales rollup against transactions"
+    )
+    verify_parser.add_argument(
+        "--limit", type=int, default=50, help="Mismatches to print"
+    )
+    verify_parser.set_defaults(func=run_verify_rollup)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Export collections as Parquet or gzip CSV files"
+    )
+    export_parser.add_argument("directory")
+    export_parser.add_argument(
+        "--format", choices=["parquet", "csv"], default="parquet"
+    )
+    export_parser.add_argument(
+        "--collections", nargs="+", choices=list(COLUMNS), default=list(COLUMNS)
+    )
+    export_parser.set_defaults(func=run_export)
+
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk insert files written by export"
+    )
+    import_parser.add_argument("directory")
+    import_parser.add_argument(
+        "--format",
+        choices=["parquet", "csv"],
+        help="Detected from the files when omitted",
+    )
+    import_parser.add_argument(
+        "--collections", nargs="+", choices=list(COLUMNS), default=list(COLUMNS)
+    )
+    import_parser.add_argument("--batch-size", type=int, default=10000)
+    import_parser.set_defaults(func=run_import)
+
+    seed_parser = subparsers.add_parser(
+        "seed", help="Load a reproducible synthetic dataset for scale testing"
+    )
+    seed_parser.add_argument("--products", type=int, default=200)
+    seed_parser.add_argument("--transactions", type=int, default=10000)
+    seed_parser.add_argument("--seed", type=int, default=0)
+    seed_parser.add_argument("--start", default="2023-01-01", help="First sale day")
+    seed_parser.add_argument("--days", type=int, default=730)
+    seed_parser.add_argument("--batch-size", type=int, default=10000)
+    seed_parser.add_argument(
+        "--db-name",
+        required=True,
+        help="Database to seed, must differ from the app's DB_NAME unless --force",
+    )
+    seed_parser.add_argument(
+        "--drop",
+        action="store_true",
+        help="Drop transactions, products and daily_sales in it first",
+    )
+    seed_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Allow seeding the database the app itself uses",
+    )
+    seed_parser.set_defaults(func=run_seed)
+
+    args = parser.parse_args(argv)
+    if args.func is run_seed and not args.force:
+        # Data sintetis (apalagi --drop) tidak boleh masuk ke database aplikasi
+        Config.load_env()
+        if args.db_name == Config.DB_NAME:
+            parser.error(
+                f"{args.db_name} is the application database, pass --force "
+                "to seed it anyway"
+            )
+    if getattr(args, "db_name", None):
+        # Environment variable menang atas nilai di file .env
+        os.environ["DB_NAME"] = args.db_name
+        Config.invalidate_env_cache()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from decimal import Decimal
+from bson.codec_options import CodecOptions, TypeCodec, TypeRegistry
+from bson.decimal128 import Decimal128
+
+
+class DecimalCodec(TypeCodec):
+    """Store Python Decimal as BSON Decimal128 and read it back as Decimal."""
+
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value):
+        return Decimal128(value)
+
+    def transform_bson(self, value):
+        return value.to_decimal()
+
+
+CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([DecimalCodec()]))
+
+
+def to_decimal(value) -> Decimal:
+    """Read a money field stored either as Decimal128 or as the legacy string."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, Decimal128):
+        return value.to_decimal()
+    return Decimal(str(value))
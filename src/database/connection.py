@@ -1,12 +1,17 @@
 from pymongo import MongoClient
 from pymongo.collection import Collection
 from src.config import Config
+from src.database.codecs import CODEC_OPTIONS
+from src.database.monitoring import CommandMonitor
 import certifi
 
 
 class DatabaseConnection:
     _instance = None
     _client = None
+    _supports_transactions = None
+    # session -> callback yang dijalankan setelah transaction commit
+    _after_commit = {}
 
     @classmethod
     def get_instance(cls):
@@ -19,19 +24,96 @@ class DatabaseConnection:
         """Initialize the database connection."""
         self._refresh_env()
         if self._client is None:
-            self._client = MongoClient(Config.MONGODB_URI, tlsCAFile=certifi.where())
+            self._client = MongoClient(
+                Config.MONGODB_URI,
+                event_listeners=[CommandMonitor.get_instance()],
+                **self._tls_options(),
+            )
         self.db = self._client[Config.DB_NAME]
 
+    LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+    @classmethod
+    def uses_tls(cls, uri: str) -> bool:
+        """False only for URIs that turn TLS off or point at localhost."""
+        scheme, _, rest = uri.strip().lower().partition("://")
+        rest, _, options = rest.partition("?")
+        for option in options.split("&"):
+            key, _, value = option.partition("=")
+            if key in ("tls", "ssl"):
+                return value == "true"
+        if scheme == "mongodb+srv":
+            return True
+
+        hosts = rest.split("/", 1)[0].rsplit("@", 1)[-1]
+        for host in hosts.split(","):
+            # Format host: nama:port atau [ipv6]:port
+            if host.startswith("["):
+                name = host[1:].split("]", 1)[0]
+            else:
+                name = host.rsplit(":", 1)[0]
+            if name not in cls.LOCAL_HOSTS:
+                return True
+        return False
+
+    @classmethod
+    def _tls_options(cls):
+        # tlsCAFile menyalakan TLS, mongod lokal tanpa TLS tidak boleh memakainya
+        if cls.uses_tls(Config.MONGODB_URI):
+            return {"tlsCAFile": certifi.where()}
+        return {}
+
     @staticmethod
     def _refresh_env():
-        """Reload environment variables from the .env file."""
+        """Reload environment variables if the encrypted .env file changed."""
         Config.load_env()
 
     def get_collection(self, name: str) -> Collection:
         """Get a MongoDB collection by name."""
-        self._refresh_env()  # Refresh env before accessing the collection
+        self._refresh_env()  # Cheap unless the .env file changed
         self.db = self._client[Config.DB_NAME]  # Update database if DB_NAME changes
-        return self.db[name]
+        return self.db.get_collection(name, codec_options=CODEC_OPTIONS)
+
+    def supports_transactions(self) -> bool:
+        """Multi-document transactions need a replica set or sharded cluster."""
+        if self._supports_transactions is None:
+            try:
+                hello = self._client.admin.command("hello")
+                self._supports_transactions = (
+                    "setName" in hello or hello.get("msg") == "isdbgrid"
+                )
+            except Exception as e:
+                print(f"Error checking transaction support: {e}")
+                self._supports_transactions = False
+        return self._supports_transactions
+
+    def run_in_transaction(self, callback):
+        """Run callback(session) in a transaction, or callback(None) if unsupported."""
+        if not self.supports_transactions():
+            return callback(None)
+        with self._client.start_session() as session:
+            callbacks = self._after_commit[session] = []
+
+            def attempt(session):
+                # with_transaction mengulang callback, hasil percobaan gagal dibuang
+                callbacks.clear()
+                return callback(session)
+
+            try:
+                result = session.with_transaction(attempt)
+            finally:
+                del self._after_commit[session]
+        for after in callbacks:
+            after()
+        return result
+
+    def after_commit(self, session, callback):
+        """Run callback once the transaction of session commits, or right away."""
+        callbacks = self._after_commit.get(session) if session is not None else None
+        if callbacks is None:
+            callback()
+        else:
+            callbacks.append(callback)
 
     def close(self):
         """Close the database connection."""
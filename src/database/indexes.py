@@ -0,0 +1,156 @@
+from typing import Any, Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+from src.database.connection import DatabaseConnection
+
+
+class IndexManager:
+    """Declares the indexes each collection needs and creates missing ones."""
+
+    # collection -> list of (index name, keys, options, query shape served)
+    REQUIRED_INDEXES = {
+        "transactions": [
+            (
+                "date_id",
+                [("date", DESCENDING), ("_id", DESCENDING)],
+                {},
+                "date range filter / sort by date",
+            ),
+            (
+                "product_id_date",
+                [("product_id", ASCENDING), ("date", DESCENDING)],
+                {},
+                "sales of one product by date",
+            ),
+            (
+                "created_at_id",
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                {},
+                "sort by created time",
+            ),
+            (
+                "total_id",
+                [("total", DESCENDING), ("_id", DESCENDING)],
+                {},
+                "sort by amount (Decimal128 after migrate-money)",
+            ),
+            (
+                "quantity_id",
+                [("quantity", DESCENDING), ("_id", DESCENDING)],
+                {},
+                "sort by quantity",
+            ),
+            (
+                "product_name",
+                [("product_name", ASCENDING)],
+                {},
+                "search by product name",
+            ),
+        ],
+        "products": [
+            (
+                "created_at",
+                [("created_at", DESCENDING)],
+                {},
+                "sort by created time",
+            ),
+            ("name", [("name", ASCENDING)], {}, "lookup by product name"),
+            (
+                "updated_at",
+                [("updated_at", DESCENDING)],
+                {},
+                "product catalog change probe",
+            ),
+        ],
+        "daily_sales": [
+            (
+                "date_product_unique",
+                [("date", ASCENDING), ("product_id", ASCENDING)],
+                {"unique": True},
+                "rollup upsert key / date range reads",
+            ),
+        ],
+        "users": [
+            (
+                "username_unique",
+                [("username", ASCENDING)],
+                {"unique": True},
+                "login lookup by username",
+            ),
+        ],
+    }
+
+    def __init__(self):
+        self.db = DatabaseConnection.get_instance()
+
+    @staticmethod
+    def _key_of(keys) -> tuple:
+        return tuple(
+            (field, direction if isinstance(direction, str) else int(direction))
+            for field, direction in keys
+        )
+
+    def _existing_keys(self, collection) -> Dict[tuple, str]:
+        return {
+            self._key_of(info["key"]): name
+            for name, info in collection.index_information().items()
+        }
+
+    def ensure_indexes(self) -> List[str]:
+        """Create every missing index, returns the names that were created."""
+        created = []
+        for collection_name, indexes in self.REQUIRED_INDEXES.items():
+            collection = self.db.get_collection(collection_name)
+            try:
+                existing = self._existing_keys(collection)
+            except OperationFailure as e:
+                print(f"Error reading indexes of {collection_name}: {e}")
+                continue
+
+            # Index dengan key yang sama (walau beda nama) dianggap sudah ada
+            missing = [
+                IndexModel(keys, name=name, **options)
+                for name, keys, options, _ in indexes
+                if self._key_of(keys) not in existing
+            ]
+            for model in missing:
+                try:
+                    collection.create_indexes([model])
+                    created.append(f"{collection_name}.{model.document['name']}")
+                except OperationFailure as e:
+                    print(
+                        f"Error creating index {model.document['name']} "
+                        f"on {collection_name}: {e}"
+                    )
+        return created
+
+    def index_report(self) -> List[Dict[str, Any]]:
+        """List declared indexes with their state and usage since server start."""
+        report = []
+        for collection_name, indexes in self.REQUIRED_INDEXES.items():
+            collection = self.db.get_collection(collection_name)
+            try:
+                existing = self._existing_keys(collection)
+                usage = {
+                    stats["name"]: stats["accesses"]
+                    for stats in collection.aggregate([{"$indexStats": {}}])
+                }
+            except OperationFailure as e:
+                print(f"Error reading index stats of {collection_name}: {e}")
+                existing, usage = {}, {}
+
+            for name, keys, _, query_shape in indexes:
+                actual_name = existing.get(self._key_of(keys))
+                accesses = usage.get(actual_name, {})
+                report.append(
+                    {
+                        "collection": collection_name,
+                        "index": actual_name or name,
+                        "keys": keys,
+                        "query_shape": query_shape,
+                        "exists": actual_name is not None,
+                        "ops": accesses.get("ops", 0),
+                        "since": accesses.get("since"),
+                    }
+                )
+        return report
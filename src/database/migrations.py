@@ -0,0 +1,69 @@
+import time
+from decimal import InvalidOperation
+from typing import Dict
+from pymongo import UpdateOne
+from src.database.codecs import to_decimal
+from src.database.connection import DatabaseConnection
+
+# Field uang yang dulu disimpan sebagai string
+MONEY_FIELDS = {
+    "products": ["price", "capital"],
+    "transactions": ["total", "capital", "profit"],
+}
+
+
+def migrate_money_fields(batch_size: int = 1000, pause: float = 0.0) -> Dict[str, int]:
+    """Convert string money fields to Decimal128 in batches while the app runs.
+
+    Each update is filtered on the old string value, so a document changed
+    concurrently is left alone instead of being overwritten. Returns the
+    number of converted documents per collection.
+    """
+    db = DatabaseConnection.get_instance()
+    migrated = {}
+
+    for collection_name, fields in MONEY_FIELDS.items():
+        collection = db.get_collection(collection_name)
+        legacy_filter = {"$or": [{field: {"$type": "string"}} for field in fields]}
+        projection = {field: 1 for field in fields}
+        last_id = None
+        converted = 0
+
+        while True:
+            query = dict(legacy_filter)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            docs = list(
+                collection.find(query, projection).sort("_id", 1).limit(batch_size)
+            )
+            if not docs:
+                break
+            last_id = docs[-1]["_id"]
+
+            operations = []
+            for doc in docs:
+                old_values = {
+                    field: doc[field]
+                    for field in fields
+                    if isinstance(doc.get(field), str)
+                }
+                try:
+                    new_values = {
+                        field: to_decimal(value) for field, value in old_values.items()
+                    }
+                except InvalidOperation:
+                    print(f"Skipping {collection_name} {doc['_id']}: invalid amount")
+                    continue
+                operations.append(
+                    UpdateOne({"_id": doc["_id"], **old_values}, {"$set": new_values})
+                )
+
+            if operations:
+                result = collection.bulk_write(operations, ordered=False)
+                converted += result.modified_count
+            if pause:
+                time.sleep(pause)
+
+        migrated[collection_name] = converted
+
+    return migrated
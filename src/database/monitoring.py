@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import bson
+from pymongo import monitoring
+from src.config import Config
+from src.database.codecs import CODEC_OPTIONS
+
+# Batas atas bucket histogram dalam milidetik, bucket terakhir untuk sisanya
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_SLOW_MS = 100
+# Ukuran dokumen hasil cursor hanya diukur ulang setiap N reply
+SIZE_SAMPLE_EVERY = 50
+RECENT_SLOW_QUERIES = 50
+MAX_COMMAND_LENGTH = 1000
+# Field yang menjelaskan query di slow query log
+COMMAND_FIELDS = (
+    "filter",
+    "sort",
+    "projection",
+    "skip",
+    "limit",
+    "pipeline",
+    "query",
+    "key",
+    "updates",
+    "deletes",
+)
+
+
+class CommandStats:
+    """Latency histogram and totals of one command on one collection"""
+
+    def __init__(self, collection: str, command: str):
+        self.collection = collection
+        self.command = command
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.documents = 0
+        # Perkiraan: jumlah dokumen cursor dikali ukuran dokumen sampel
+        self.est_bytes = 0
+        # Ukuran BSON satu dokumen hasil, dari sampel terakhir
+        self.document_size = 0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, duration_ms, documents=0, size=0, failed=False):
+        self.count += 1
+        self.failures += failed
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.documents += documents
+        self.est_bytes += size
+        self.histogram[_bucket(duration_ms)] += 1
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile_ms(self, percentile: float) -> float:
+        """Upper bound of the bucket holding the percentile, max_ms beyond the last"""
+        target = self.count * percentile / 100
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "collection": self.collection,
+            "command": self.command,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "failures": self.failures,
+            "average_ms": round(self.average_ms, 3),
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "max_ms": round(self.max_ms, 3),
+            "documents": self.documents,
+            "est_bytes": self.est_bytes,
+            "histogram": dict(zip([*map(str, BUCKETS_MS), "inf"], self.histogram)),
+        }
+
+
+def _bucket(duration_ms) -> int:
+    for index, bound in enumerate(BUCKETS_MS):
+        if duration_ms <= bound:
+            return index
+    return len(BUCKETS_MS)
+
+
+def _collection_name(command_name, command) -> str:
+    if command_name == "getMore":
+        return command.get("collection", "")
+    name = command.get(command_name)
+    # Perintah level database seperti hello atau aggregate: 1 tidak punya collection
+    return name if isinstance(name, str) else ""
+
+
+def _batch(reply):
+    cursor = reply.get("cursor")
+    if not isinstance(cursor, dict):
+        return None
+    return cursor.get("firstBatch", cursor.get("nextBatch"))
+
+
+def _encoded_size(value) -> int:
+    try:
+        return len(bson.encode(value, codec_options=CODEC_OPTIONS))
+    except Exception:
+        return 0
+
+
+def _slow_ms_from_env() -> float:
+    try:
+        return float(os.getenv("SLOW_QUERY_MS", DEFAULT_SLOW_MS))
+    except ValueError:
+        return DEFAULT_SLOW_MS
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Collects per collection and command latency of every MongoDB command.
+
+    Registered on the client by DatabaseConnection. Commands slower than
+    ``slow_ms`` are appended to ``slow_queries_YYYYMMDD.log`` in the log
+    directory and kept in memory for the diagnostics dialog. Bytes received
+    of cursor replies are only estimated from a sampled document size in the
+    stats (``est_bytes``), slow commands get the encoded size of their whole
+    reply. Listener callbacks run on whichever thread issued the command.
+    """
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, slow_ms=None):
+        self.slow_ms = _slow_ms_from_env() if slow_ms is None else slow_ms
+        self._lock = threading.Lock()
+        self._started = {}
+        self._stats = {}
+        self.slow_queries = deque(maxlen=RECENT_SLOW_QUERIES)
+        self.since = datetime.now()
+
+    def started(self, event):
+        command = event.command
+        collection = _collection_name(event.command_name, command)
+        # Hanya referensi yang disimpan, teks query dibuat jika perintahnya lambat
+        details = {
+            field: command[field] for field in COMMAND_FIELDS if field in command
+        }
+        with self._lock:
+            self._started[(event.connection_id, event.request_id)] = (
+                event.database_name,
+                collection,
+                details,
+            )
+
+    def succeeded(self, event):
+        self._record(event, event.reply, False)
+
+    def failed(self, event):
+        self._record(event, None, True)
+
+    def _record(self, event, reply, failed):
+        duration_ms = event.duration_micros / 1000
+        with self._lock:
+            started = self._started.pop((event.connection_id, event.request_id), None)
+            database, collection, details = started or ("", "", {})
+            key = (collection, event.command_name)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = CommandStats(*key)
+            sample = stats.count % SIZE_SAMPLE_EVERY == 0 or not stats.document_size
+
+        batch = _batch(reply) if reply is not None else None
+        documents = len(batch) if batch is not None else 0
+        if reply is None:
+            size = 0
+        elif batch is None:
+            size = _encoded_size(reply)
+        else:
+            # Listener hanya menerima reply yang sudah di-decode, meng-encode
+            # ulang semua dokumen (terutama Decimal) lebih mahal dari query-nya
+            if sample and batch:
+                stats.document_size = _encoded_size(batch[0])
+            size = stats.document_size * documents
+
+        with self._lock:
+            stats.add(duration_ms, documents, size, failed)
+
+        if duration_ms >= self.slow_ms:
+            if batch is not None and reply is not None:
+                # Perintah lambat cukup jarang untuk diukur dengan tepat
+                size = _encoded_size(reply)
+            text = json.dumps(details, default=str)
+            if len(text) > MAX_COMMAND_LENGTH:
+                text = text[:MAX_COMMAND_LENGTH] + "..."
+            self._log_slow_query(
+                {
+                    "time": datetime.now(),
+                    "namespace": f"{database}.{collection}" if collection else database,
+                    "command": event.command_name,
+                    "duration_ms": round(duration_ms, 3),
+                    "documents": documents,
+                    "bytes": size,
+                    "failed": failed,
+                    "details": text,
+                }
+            )
+
+    def _log_slow_query(self, entry):
+        with self._lock:
+            self.slow_queries.append(entry)
+
+        try:
+            if not os.path.exists(Config.LOG_DIR):
+                os.makedirs(Config.LOG_DIR)
+            log_file = os.path.join(
+                Config.LOG_DIR, f"slow_queries_{entry['time']:%Y%m%d}.log"
+            )
+            status = " FAILED" if entry["failed"] else ""
+            with open(log_file, "a", encoding="utf-8") as f:
+                f.write(
+                    f"[{entry['time']:%Y-%m-%d %H:%M:%S}] {entry['duration_ms']:.1f}ms "
+                    f"{entry['namespace']} {entry['command']}{status} "
+                    f"docs={entry['documents']} bytes={entry['bytes']} "
+                    f"{entry['details']}\n"
+                )
+        except OSError as e:
+            print(f"Error writing slow query log: {e}")
+
+    def snapshot(self) -> Tuple[List[Dict], List[Dict]]:
+        """Copies of the stats, slowest total time first, and recent slow queries"""
+        with self._lock:
+            stats = [stats.to_dict() for stats in self._stats.values()]
+            slow_queries = list(self.slow_queries)
+        stats.sort(key=lambda row: row["total_ms"], reverse=True)
+        return stats, slow_queries
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+            self.slow_queries.clear()
+            self.since = datetime.now()
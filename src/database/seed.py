@@ -0,0 +1,195 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+import numpy as np
+from bson import ObjectId
+from src.database.connection import DatabaseConnection
+from src.database.indexes import IndexManager
+from src.models.daily_sales import DailySalesManager
+from src.models.product import Product
+from src.models.transaction import Transaction
+
+CATEGORIES = (
+    "Kopi,Teh,Gula,Beras,Minyak Goreng,Mie Instan,Susu,Roti,Sabun,Sampo,"
+    "Deterjen,Air Mineral,Kecap,Saus,Telur,Tepung,Biskuit,Snack,Pasta Gigi,Tisu"
+).split(",")
+VARIANTS = (
+    "Original,Premium,Hemat,Spesial,Organik,Lite,Ekstra,Klasik,Gold,Fresh"
+).split(",")
+SIZES = "100g,250g,500g,1kg,2kg,1L,600ml,Isi 10,Sachet".split(",")
+EPOCH = datetime(1970, 1, 1)
+
+# Setiap CHUNK transaksi memakai generator sendiri yang diturunkan dari seed,
+# jadi hasilnya sama berapa pun batch_size yang dipakai untuk insert
+CHUNK = 100000
+# Tahun ke tahun penjualan naik, akhir pekan lebih ramai
+YEARLY_GROWTH = 0.25
+WEEKDAY_FACTORS = np.array([0.9, 0.85, 0.9, 0.95, 1.1, 1.35, 1.25])
+POPULARITY_EXPONENT = 1.1
+
+
+def _object_ids(rng, timestamps) -> List[ObjectId]:
+    """ObjectIds from the generator instead of the clock, so reruns match"""
+    tails = rng.integers(0, 1 << 64, size=len(timestamps), dtype=np.uint64)
+    return [
+        ObjectId(int(ts).to_bytes(4, "big") + int(tail).to_bytes(8, "big"))
+        for ts, tail in zip(timestamps, tails)
+    ]
+
+
+def _product_names(count) -> List[str]:
+    names = []
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        variant = VARIANTS[(i // len(CATEGORIES)) % len(VARIANTS)]
+        # 200 dan 9 tidak punya faktor sama, kombinasi baru berulang tiap 1800
+        size = SIZES[i % len(SIZES)]
+        name = f"{category} {variant} {size}"
+        cycle = i // (len(CATEGORIES) * len(VARIANTS) * len(SIZES))
+        names.append(f"{name} #{cycle + 1}" if cycle else name)
+    return names
+
+
+def _timestamp(value: datetime) -> int:
+    # Tanpa zona waktu lokal agar id sama di setiap mesin
+    return int((value - EPOCH).total_seconds())
+
+
+def build_products(count: int, seed: int, start: date) -> Dict[str, np.ndarray]:
+    """Product columns: names, price/capital in whole rupiah and popularity"""
+    rng = np.random.default_rng([seed, 0])
+    # Harga log-normal, dibulatkan ke Rp500 seperti harga di toko
+    price = np.maximum(np.round(rng.lognormal(9.6, 0.8, count) / 500) * 500, 1000)
+    margin = rng.uniform(0.12, 0.35, count)
+    capital = np.round(price * (1 - margin) / 100) * 100
+
+    # Popularitas mengikuti distribusi Zipf atas urutan acak produk
+    ranks = rng.permutation(count) + 1
+    popularity = 1.0 / ranks**POPULARITY_EXPONENT
+    popularity /= popularity.sum()
+
+    created = datetime.combine(start, datetime.min.time())
+    timestamps = [_timestamp(created)] * count
+    return {
+        "ids": _object_ids(rng, timestamps),
+        "names": _product_names(count),
+        "price": price.astype(np.int64),
+        "capital": capital.astype(np.int64),
+        "popularity": popularity,
+    }
+
+
+def _day_weights(start: date, days: int) -> np.ndarray:
+    offsets = np.arange(days)
+    weekdays = (start.weekday() + offsets) % 7
+    weights = (1 + YEARLY_GROWTH * offsets / 365) * WEEKDAY_FACTORS[weekdays]
+    return weights / weights.sum()
+
+
+def build_transactions(
+    products, chunk: int, size: int, seed: int, start: date, days: int
+) -> List[Transaction]:
+    """One deterministic chunk of transactions"""
+    rng = np.random.default_rng([seed, 1, chunk])
+    day = rng.choice(days, size=size, p=_day_weights(start, days))
+    product = rng.choice(len(products["names"]), size=size, p=products["popularity"])
+    # Barang murah lebih sering dibeli lebih dari satu
+    cheap = products["price"][product] < 20000
+    quantity = 1 + rng.poisson(np.where(cheap, 1.2, 0.3))
+    # Jam transaksi antara 07:00 dan 21:00
+    seconds = rng.integers(7 * 3600, 21 * 3600, size=size)
+
+    start_dt = datetime.combine(start, datetime.min.time())
+    created = [
+        start_dt + timedelta(days=int(d), seconds=int(s))
+        for d, s in zip(day, seconds)
+    ]
+    ids = _object_ids(rng, [_timestamp(c) for c in created])
+
+    transactions = []
+    for i in range(size):
+        code = product[i]
+        qty = int(quantity[i])
+        total = Decimal(int(products["price"][code]) * qty)
+        capital = Decimal(int(products["capital"][code]) * qty)
+        transactions.append(
+            Transaction(
+                product_id=products["ids"][code],
+                product_name=products["names"][code],
+                quantity=qty,
+                total=total,
+                capital=capital,
+                profit=total - capital,
+                date=created[i].date(),
+                _id=ids[i],
+                created_at=created[i],
+            )
+        )
+    return transactions
+
+
+def seed_dataset(
+    product_count: int,
+    transaction_count: int,
+    seed: int = 0,
+    start: date = date(2023, 1, 1),
+    days: int = 730,
+    batch_size: int = 10000,
+    drop: bool = False,
+) -> Dict[str, int]:
+    """Generate and bulk load a reproducible dataset.
+
+    The same arguments always produce the same documents, ids included.
+    Products get Zipf popularity, transactions grow over time and peak on
+    weekends, and each product's stock is what is left after restocking a
+    fixed amount every time it sold out. Returns the inserted counts.
+    """
+    db = DatabaseConnection.get_instance()
+    transactions = db.get_collection("transactions")
+    products_collection = db.get_collection("products")
+    if drop:
+        for name in ("transactions", "products", "daily_sales"):
+            db.get_collection(name).drop()
+
+    products = build_products(product_count, seed, start)
+    sold = np.zeros(product_count, dtype=np.int64)
+    code_of = {product_id: code for code, product_id in enumerate(products["ids"])}
+
+    inserted = 0
+    for chunk, offset in enumerate(range(0, transaction_count, CHUNK)):
+        size = min(CHUNK, transaction_count - offset)
+        rows = build_transactions(products, chunk, size, seed, start, days)
+        for row in rows:
+            sold[code_of[row.product_id]] += row.quantity
+        for first in range(0, size, batch_size):
+            batch = rows[first : first + batch_size]
+            transactions.insert_many([row.to_dict() for row in batch], ordered=False)
+            inserted += len(batch)
+        print(f"transactions: {inserted}/{transaction_count}")
+
+    end = datetime.combine(start + timedelta(days=days), datetime.min.time())
+    # Restock kira-kira dua minggu penjualan rata-rata produk, minimal 12
+    daily_units = products["popularity"] * transaction_count / days * 1.5
+    restock = np.maximum(np.round(daily_units * 14), 12).astype(np.int64)
+    documents = [
+        Product(
+            name=products["names"][code],
+            price=Decimal(int(products["price"][code])),
+            capital=Decimal(int(products["capital"][code])),
+            stock=int(restock[code] - sold[code] % restock[code]),
+            _id=products["ids"][code],
+            created_at=datetime.combine(start, datetime.min.time()),
+            updated_at=end,
+        ).to_dict()
+        for code in range(product_count)
+    ]
+    for first in range(0, len(documents), batch_size):
+        products_collection.insert_many(
+            documents[first : first + batch_size], ordered=False
+        )
+
+    # Index dan rollup dibuat setelah data masuk, lebih cepat dari per insert
+    IndexManager().ensure_indexes()
+    DailySalesManager().backfill()
+    return {"products": len(documents), "transactions": inserted}
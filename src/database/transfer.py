@@ -0,0 +1,371 @@
+import csv
+import gzip
+import os
+import re
+from datetime import datetime
+from decimal import Decimal
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, Optional
+
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from src.database.connection import DatabaseConnection
+from src.models.daily_sales import DailySalesManager
+
+# Kolom per collection: (field, kind)
+COLUMNS = {
+    "transactions": [
+        ("_id", "id"),
+        ("product_id", "id"),
+        ("product_name", "str"),
+        ("quantity", "int"),
+        ("total", "money"),
+        ("capital", "money"),
+        ("profit", "money"),
+        ("date", "datetime"),
+        ("created_at", "datetime"),
+    ],
+    "products": [
+        ("_id", "id"),
+        ("name", "str"),
+        ("price", "money"),
+        ("capital", "money"),
+        ("stock", "int"),
+        ("created_at", "datetime"),
+        ("updated_at", "datetime"),
+    ],
+}
+# transactions dipecah per bulan dari field ini, collection lain satu file
+PARTITION_FIELD = {"transactions": "date"}
+EXTENSIONS = {"parquet": ".parquet", "csv": ".csv.gz"}
+# Nama file partisi bulanan, hanya file ini yang dihapus sebelum export ulang
+PARTITION_FILE = re.compile(r"^\d{4}-\d{2}(\.parquet|\.csv\.gz)$")
+# Presisi uang di Parquet. Server membulatkan ke skala ini (half to even,
+# aturan $round) sebelum ditulis, CSV menyimpan nilai apa adanya
+MONEY_SCALE = 4
+# Jumlah dokumen yang ditulis sekaligus, satu partisi tidak pernah dimuat utuh
+EXPORT_BATCH_SIZE = 50000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError(
+            "Parquet needs pyarrow, install it with 'pip install pyarrow' "
+            "or use the csv format"
+        ) from None
+    return pyarrow
+
+
+def _arrow_type(pa, kind):
+    return {
+        "id": pa.string(),
+        "str": pa.string(),
+        "int": pa.int64(),
+        "money": pa.decimal128(38, MONEY_SCALE),
+        # BSON menyimpan tanggal dalam milidetik
+        "datetime": pa.timestamp("ms"),
+    }[kind]
+
+
+def _projection(columns, money_scale=None):
+    """$project stage that makes the server format ids and money as strings.
+
+    Converting Decimal128 values in Python dominates the export time, as
+    strings they go to CSV unchanged and Arrow parses them to decimals in C++.
+    With ``money_scale`` money is rounded half to even to that many decimals.
+    """
+
+    def expression(field, kind):
+        if kind == "id":
+            return {"$toString": f"${field}"}
+        if kind == "money":
+            value = f"${field}"
+            if money_scale is not None:
+                value = {"$round": [value, money_scale]}
+            return {"$toString": value}
+        return 1
+
+    return {
+        "$project": {
+            "_id": 0,
+            **{field: expression(field, kind) for field, kind in columns},
+        }
+    }
+
+
+def _import_column(values, kind):
+    """Convert one Parquet or CSV column back to what the app stores.
+
+    Missing values become None and are left out of the document.
+    """
+    if kind == "str":
+        return list(values)
+    if kind == "id":
+        convert = ObjectId
+    elif kind == "money":
+        convert = Decimal
+    elif kind == "int":
+        convert = int
+    else:
+        convert = _parse_datetime
+    return [convert(value) if value not in (None, "") else None for value in values]
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _write_parquet(path, columns, chunks):
+    """Write column chunks as row groups of one Parquet file"""
+    pa = _pyarrow()
+    schema = pa.schema([(field, _arrow_type(pa, kind)) for field, kind in columns])
+    # File tetap ditulis dengan schema walaupun tidak ada chunk
+    with pa.parquet.ParquetWriter(path, schema) as writer:
+        for data in chunks:
+            arrays = []
+            for field, kind in columns:
+                if kind == "money":
+                    # Server mengirim string yang sudah dibulatkan ke MONEY_SCALE
+                    array = pa.array(data[field], pa.string()).cast(
+                        _arrow_type(pa, kind)
+                    )
+                else:
+                    array = pa.array(data[field], _arrow_type(pa, kind))
+                arrays.append(array)
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+
+
+def _write_csv(path, columns, chunks):
+    # csv menulis None sebagai string kosong
+    with gzip.open(path, "wt", compresslevel=6, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([field for field, _ in columns])
+        for data in chunks:
+            values = []
+            for field, kind in columns:
+                column = data[field]
+                if kind == "datetime":
+                    column = [value.isoformat() if value else None for value in column]
+                values.append(column)
+            writer.writerows(zip(*values))
+
+
+def _read_parquet(path, columns, batch_size) -> Iterator[Dict[str, list]]:
+    pa = _pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(
+        batch_size=batch_size, columns=[field for field, _ in columns]
+    ):
+        data = {}
+        for field, kind in columns:
+            column = batch.column(field)
+            if kind == "money":
+                # Decimal dari string lebih cepat daripada to_pylist() Arrow
+                column = column.cast(pa.string())
+            data[field] = column.to_pylist()
+        yield data
+
+
+def _read_csv(path, columns, batch_size) -> Iterator[Dict[str, list]]:
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        while True:
+            rows = list(islice(reader, batch_size))
+            if not rows:
+                return
+            data = dict(zip(header, zip(*rows)))
+            yield {field: data.get(field, ()) for field, _ in columns}
+
+
+WRITERS = {"parquet": _write_parquet, "csv": _write_csv}
+READERS = {"parquet": _read_parquet, "csv": _read_csv}
+
+
+def _partitions(collection_name, cursor):
+    field = PARTITION_FIELD.get(collection_name)
+    if field is None:
+        yield collection_name, cursor
+        return
+    # Cursor sudah urut per tanggal, jadi satu bulan selalu berurutan
+    for (year, month), docs in groupby(
+        cursor, key=lambda doc: (doc[field].year, doc[field].month)
+    ):
+        yield os.path.join(collection_name, f"{year:04d}-{month:02d}"), docs
+
+
+def _remove_previous_export(directory, collection_name):
+    """Delete files an earlier export of the collection left in ``directory``.
+
+    A month without transactions this time would otherwise still be
+    imported, the same goes for files of the other format.
+    """
+    for extension in EXTENSIONS.values():
+        single = os.path.join(directory, collection_name + extension)
+        if os.path.isfile(single):
+            os.remove(single)
+    folder = os.path.join(directory, collection_name)
+    if os.path.isdir(folder):
+        for name in os.listdir(folder):
+            if PARTITION_FILE.match(name):
+                os.remove(os.path.join(folder, name))
+
+
+def export_collections(
+    directory: str,
+    file_format: str = "parquet",
+    collections: Iterable[str] = ("transactions", "products"),
+    job=None,
+) -> Optional[Dict[str, int]]:
+    """Write collections as Parquet or gzip CSV files below ``directory``.
+
+    Transactions are streamed sorted by date and written as one file per
+    month (``transactions/2024-01.parquet``), other collections as a single
+    file, in batches of EXPORT_BATCH_SIZE documents. Files of an earlier
+    export are removed first. Parquet stores money with MONEY_SCALE decimals
+    rounded half to even. Returns the number of exported documents per
+    collection, or None if ``job`` was cancelled.
+    """
+    db = DatabaseConnection.get_instance()
+    writer = WRITERS[file_format]
+    extension = EXTENSIONS[file_format]
+    collections = list(collections)
+    if file_format == "parquet":
+        _pyarrow()
+
+    total = sum(
+        db.get_collection(name).estimated_document_count() for name in collections
+    )
+    done = 0
+    exported = {}
+    money_scale = MONEY_SCALE if file_format == "parquet" else None
+    for collection_name in collections:
+        columns = COLUMNS[collection_name]
+        pipeline = [_projection(columns, money_scale)]
+        _remove_previous_export(directory, collection_name)
+        if collection_name in PARTITION_FIELD:
+            pipeline.insert(0, {"$sort": {PARTITION_FIELD[collection_name]: 1}})
+            os.makedirs(os.path.join(directory, collection_name), exist_ok=True)
+        cursor = db.get_collection(collection_name).aggregate(
+            pipeline, allowDiskUse=True, batchSize=10000
+        )
+
+        count = 0
+
+        def chunks(docs):
+            nonlocal count, done
+            while not (job is not None and job.is_cancelled()):
+                batch = list(islice(docs, EXPORT_BATCH_SIZE))
+                if not batch:
+                    return
+                yield {field: [doc.get(field) for doc in batch] for field, _ in columns}
+                count += len(batch)
+                done += len(batch)
+                if job is not None:
+                    job.report_progress(done, total)
+
+        for name, docs in _partitions(collection_name, cursor):
+            writer(os.path.join(directory, name + extension), columns, chunks(docs))
+            if job is not None and job.is_cancelled():
+                return None
+        exported[collection_name] = count
+    return exported
+
+
+def _files(directory, collection_name, file_format):
+    extension = EXTENSIONS[file_format]
+    single = os.path.join(directory, collection_name + extension)
+    if os.path.exists(single):
+        return [single]
+    folder = os.path.join(directory, collection_name)
+    if not os.path.isdir(folder):
+        return []
+    return [
+        os.path.join(folder, name)
+        for name in sorted(os.listdir(folder))
+        if name.endswith(extension)
+    ]
+
+
+def detect_format(directory: str) -> Optional[str]:
+    """Format of an export directory, None if no export files are found"""
+    for file_format in EXTENSIONS:
+        if any(_files(directory, name, file_format) for name in COLUMNS):
+            return file_format
+    return None
+
+
+def _insert(collection, docs) -> Dict[str, int]:
+    """insert_many one partition, documents that already exist are skipped"""
+    if not docs:
+        return {"inserted": 0, "skipped": 0}
+    try:
+        result = collection.insert_many(docs, ordered=False)
+        return {"inserted": len(result.inserted_ids), "skipped": 0}
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error["code"] != 11000 for error in errors):
+            raise
+        return {"inserted": e.details["nInserted"], "skipped": len(errors)}
+
+
+def import_collections(
+    directory: str,
+    file_format: Optional[str] = None,
+    collections: Iterable[str] = ("transactions", "products"),
+    batch_size: int = 10000,
+    job=None,
+) -> Optional[Dict[str, Dict[str, int]]]:
+    """Bulk load files written by ``export_collections``.
+
+    Documents are inserted with unordered ``insert_many`` in batches, ids that
+    already exist are skipped so an import can be repeated. The daily_sales
+    rollup is rebuilt afterwards when transactions were added. Returns
+    ``{collection: {"inserted", "skipped"}}``, or None if ``job`` was
+    cancelled.
+    """
+    file_format = file_format or detect_format(directory)
+    if file_format is None:
+        raise ValueError(f"No exported data found in {directory}")
+    reader = READERS[file_format]
+    db = DatabaseConnection.get_instance()
+
+    files = {name: _files(directory, name, file_format) for name in collections}
+    total = sum(len(paths) for paths in files.values())
+    done = 0
+    imported = {}
+    for collection_name, paths in files.items():
+        collection = db.get_collection(collection_name)
+        columns = COLUMNS[collection_name]
+        counts = {"inserted": 0, "skipped": 0}
+        for path in paths:
+            if job is not None and job.is_cancelled():
+                return None
+            fields = [field for field, _ in columns]
+            # Partisi dibaca per batch, tidak pernah dimuat utuh
+            for data in reader(path, columns, batch_size):
+                converted = [
+                    _import_column(data[field], kind) for field, kind in columns
+                ]
+                docs = [
+                    {
+                        field: value
+                        for field, value in zip(fields, row)
+                        if value is not None
+                    }
+                    for row in zip(*converted)
+                ]
+                result = _insert(collection, docs)
+                counts["inserted"] += result["inserted"]
+                counts["skipped"] += result["skipped"]
+            done += 1
+            if job is not None:
+                job.report_progress(done, total)
+        imported[collection_name] = counts
+
+    if imported.get("transactions", {}).get("inserted"):
+        DailySalesManager().backfill()
+    return imported
@@ -12,6 +12,8 @@ from src.ui.dialogs.db_setup_dialog import DatabaseSetupDialog
 from src.ui.main_window import MainWindow
 from src.config import Config
 from src.database.connection import DatabaseConnection
+from src.database.indexes import IndexManager
+from src.models.daily_sales import DailySalesManager
 from src.ui.login_window import LoginWindow
 
 
@@ -36,6 +38,13 @@ def main():
 
         db_connection = DatabaseConnection.get_instance()
 
+        created_indexes = IndexManager().ensure_indexes()
+        if created_indexes:
+            print(f"Created indexes: {', '.join(created_indexes)}")
+
+        if DailySalesManager().ensure_backfilled():
+            print("Daily sales rollup built from existing transactions")
+
         while True:
             login_window = LoginWindow()
             user = login_window.run()
@@ -0,0 +1,362 @@
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pymongo import UpdateOne
+from src.database.codecs import to_decimal
+from src.database.connection import DatabaseConnection
+
+
+class DailySalesManager:
+    """Maintains the ``daily_sales`` rollup collection.
+
+    One document per (date, product_id) with the summed revenue, capital,
+    profit and quantity of that day's transactions plus their count.
+    TransactionManager keeps it current with ``$inc`` on every write,
+    ``backfill`` rebuilds it from the raw transactions. A failed rollup write
+    outside a transaction marks the rollup dirty, ``ensure_backfilled`` then
+    rebuilds it.
+    """
+
+    MONEY_FIELDS = ("revenue", "capital", "profit")
+    FIELDS = MONEY_FIELDS + ("quantity", "count")
+    STATE_ID = "daily_sales"
+
+    # Tetap True di proses ini meskipun penanda di database gagal ditulis
+    _dirty = False
+
+    def __init__(self):
+        self.db = DatabaseConnection.get_instance()
+        self.collection = self.db.get_collection("daily_sales")
+        self.transactions = self.db.get_collection("transactions")
+        self.state = self.db.get_collection("rollup_state")
+
+    @staticmethod
+    def _day(value) -> datetime:
+        if isinstance(value, datetime):
+            value = value.date()
+        return datetime.combine(value, datetime.min.time())
+
+    def _buckets(self, changes: Iterable[Tuple[Any, int]]) -> Dict[tuple, Dict]:
+        # Gabungkan perubahan dengan key yang sama jadi satu $inc
+        buckets = {}
+        for transaction, sign in changes:
+            key = (self._day(transaction.date), transaction.product_id)
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = {
+                    "product_name": transaction.product_name,
+                    "revenue": Decimal("0"),
+                    "capital": Decimal("0"),
+                    "profit": Decimal("0"),
+                    "quantity": 0,
+                    "count": 0,
+                }
+            if sign > 0:
+                bucket["product_name"] = transaction.product_name
+            bucket["revenue"] += transaction.total * sign
+            bucket["capital"] += transaction.capital * sign
+            bucket["profit"] += transaction.profit * sign
+            bucket["quantity"] += transaction.quantity * sign
+            bucket["count"] += sign
+        return buckets
+
+    def _apply(self, changes: List[Tuple[Any, int]], session=None) -> bool:
+        buckets = self._buckets(changes)
+        if not buckets:
+            return True
+
+        keys = [
+            {"date": day, "product_id": product_id} for day, product_id in buckets
+        ]
+        operations = [
+            UpdateOne(
+                key,
+                {
+                    "$inc": {field: bucket[field] for field in self.FIELDS},
+                    "$set": {"product_name": bucket["product_name"]},
+                },
+                upsert=True,
+            )
+            for key, bucket in zip(keys, buckets.values())
+        ]
+        try:
+            self.collection.bulk_write(operations, ordered=False, session=session)
+
+            # Hapus bucket yang sudah tidak punya transaksi
+            if any(sign < 0 for _, sign in changes):
+                self.collection.delete_many(
+                    {"$or": keys, "count": {"$lte": 0}}, session=session
+                )
+            return True
+        except Exception as e:
+            # Di dalam transaction, gagalkan seluruh transaction
+            if session is not None:
+                raise
+            print(f"Error updating daily sales: {e}")
+            # bulk_write unordered bisa sudah menerapkan sebagian bucket
+            self.mark_dirty()
+            return False
+
+    def mark_dirty(self):
+        """Flag the rollup as out of sync with the transactions."""
+        DailySalesManager._dirty = True
+        try:
+            self.state.update_one(
+                {"_id": self.STATE_ID},
+                {"$set": {"dirty": True, "marked_at": datetime.utcnow()}},
+                upsert=True,
+            )
+        except Exception as e:
+            print(f"Error marking daily sales for rebuild: {e}")
+
+    def is_dirty(self) -> bool:
+        if DailySalesManager._dirty:
+            return True
+        state = self.state.find_one({"_id": self.STATE_ID})
+        return bool(state and state.get("dirty"))
+
+    def record(self, transactions, session=None) -> bool:
+        return self._apply([(t, 1) for t in transactions], session=session)
+
+    def revert(self, transactions, session=None) -> bool:
+        return self._apply([(t, -1) for t in transactions], session=session)
+
+    def replace(self, old, new, session=None) -> bool:
+        return self._apply([(old, -1), (new, 1)], session=session)
+
+    @staticmethod
+    def _group_pipeline() -> List[Dict]:
+        """Aggregate raw transactions into rollup documents."""
+        return [
+            {
+                "$group": {
+                    "_id": {
+                        "date": {
+                            "$dateFromParts": {
+                                "year": {"$year": "$date"},
+                                "month": {"$month": "$date"},
+                                "day": {"$dayOfMonth": "$date"},
+                            }
+                        },
+                        "product_id": "$product_id",
+                    },
+                    "product_name": {"$last": "$product_name"},
+                    "revenue": {"$sum": {"$toDecimal": "$total"}},
+                    "capital": {"$sum": {"$toDecimal": "$capital"}},
+                    "profit": {"$sum": {"$toDecimal": "$profit"}},
+                    "quantity": {"$sum": "$quantity"},
+                    "count": {"$sum": 1},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "date": "$_id.date",
+                    "product_id": "$_id.product_id",
+                    "product_name": 1,
+                    "revenue": 1,
+                    "capital": 1,
+                    "profit": 1,
+                    "quantity": 1,
+                    "count": 1,
+                }
+            },
+        ]
+
+    def backfill(self) -> int:
+        """Rebuild the whole rollup from transactions, returns the bucket count.
+
+        ``$out`` swaps the collection in one step and keeps its indexes; sales
+        written while it runs are only in the rollup if they land after it.
+        Clears the dirty flag, a rollup write failing meanwhile sets it again.
+        """
+        DailySalesManager._dirty = False
+        self.state.delete_one({"_id": self.STATE_ID})
+        try:
+            self.transactions.aggregate(
+                self._group_pipeline() + [{"$out": "daily_sales"}], allowDiskUse=True
+            )
+        except Exception:
+            self.mark_dirty()
+            raise
+        return self.collection.count_documents({})
+
+    def ensure_backfilled(self) -> bool:
+        """Backfill if the rollup is dirty, or empty while transactions exist."""
+        try:
+            if self.is_dirty():
+                self.backfill()
+                return True
+            if self.collection.estimated_document_count() > 0:
+                return False
+            if self.transactions.estimated_document_count() == 0:
+                return False
+            self.backfill()
+            return True
+        except Exception as e:
+            print(f"Error backfilling daily sales: {e}")
+            return False
+
+    def verify(self) -> List[Dict[str, Any]]:
+        """Compare the rollup with a fresh aggregation of the transactions.
+
+        Returns one entry per differing bucket and field, empty if in sync.
+        """
+        expected = {
+            (doc["date"], doc["product_id"]): doc
+            for doc in self.transactions.aggregate(
+                self._group_pipeline(), allowDiskUse=True
+            )
+        }
+        actual = {
+            (doc["date"], doc["product_id"]): doc
+            for doc in self.collection.find({"count": {"$gt": 0}})
+        }
+
+        mismatches = []
+        keys = sorted(set(expected) | set(actual), key=lambda k: (k[0], str(k[1])))
+        for key in keys:
+            want, got = expected.get(key, {}), actual.get(key, {})
+            for field in self.FIELDS:
+                want_value = want.get(field, 0)
+                got_value = got.get(field, 0)
+                if field in self.MONEY_FIELDS:
+                    want_value = to_decimal(want_value)
+                    got_value = to_decimal(got_value)
+                if want_value != got_value:
+                    mismatches.append(
+                        {
+                            "date": key[0],
+                            "product_id": key[1],
+                            "field": field,
+                            "expected": want_value,
+                            "actual": got_value,
+                        }
+                    )
+        return mismatches
+
+    def daily_totals(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """Per-day sums over all products between two dates, oldest first."""
+        try:
+            return list(
+                self.collection.aggregate(
+                    [
+                        {
+                            "$match": {
+                                "date": {
+                                    "$gte": self._day(start_date),
+                                    "$lte": self._day(end_date),
+                                }
+                            }
+                        },
+                        {
+                            "$group": {
+                                "_id": "$date",
+                                **{
+                                    field: {"$sum": f"${field}"}
+                                    for field in self.FIELDS
+                                },
+                            }
+                        },
+                        {"$sort": {"_id": 1}},
+                        {"$addFields": {"date": "$_id"}},
+                    ]
+                )
+            )
+        except Exception as e:
+            print(f"Error getting daily sales: {e}")
+            return []
+
+    def monthly_totals(
+        self, first_year: int, last_year: int
+    ) -> Optional[Dict[int, Dict]]:
+        """Revenue and profit per month for a range of years.
+
+        Returns ``{year: {month: {"revenue", "profit"}}}``, months without
+        sales are left out. Returns None on failure.
+        """
+        try:
+            rows = self.collection.aggregate(
+                [
+                    {
+                        "$match": {
+                            "date": {
+                                "$gte": datetime(first_year, 1, 1),
+                                "$lt": datetime(last_year + 1, 1, 1),
+                            }
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": {
+                                "year": {"$year": "$date"},
+                                "month": {"$month": "$date"},
+                            },
+                            "revenue": {"$sum": "$revenue"},
+                            "profit": {"$sum": "$profit"},
+                        }
+                    },
+                ]
+            )
+            totals = {}
+            for row in rows:
+                totals.setdefault(row["_id"]["year"], {})[row["_id"]["month"]] = {
+                    "revenue": to_decimal(row["revenue"]),
+                    "profit": to_decimal(row["profit"]),
+                }
+            return totals
+        except Exception as e:
+            print(f"Error getting monthly sales: {e}")
+            return None
+
+    def get_sales_totals(self, today: Optional[date] = None) -> Optional[tuple]:
+        """Server-side equivalent of calculate_totals, returns None on failure."""
+        today = today or datetime.today().date()
+        start_of_month = self._day(today.replace(day=1))
+        start_of_day = self._day(today)
+
+        sum_stage = {
+            "$group": {
+                "_id": None,
+                "sales": {"$sum": "$revenue"},
+                "profit": {"$sum": "$profit"},
+            }
+        }
+
+        try:
+            result = next(
+                self.collection.aggregate(
+                    [
+                        {"$project": {"date": 1, "revenue": 1, "profit": 1}},
+                        {
+                            "$facet": {
+                                "all_time": [sum_stage],
+                                "this_month": [
+                                    {"$match": {"date": {"$gte": start_of_month}}},
+                                    sum_stage,
+                                ],
+                                "today": [
+                                    {"$match": {"date": start_of_day}},
+                                    sum_stage,
+                                ],
+                            }
+                        },
+                    ]
+                )
+            )
+        except Exception as e:
+            print(f"Error aggregating sales totals: {e}")
+            return None
+
+        def bucket(name, field):
+            rows = result.get(name) or []
+            return to_decimal(rows[0][field]) if rows else Decimal("0")
+
+        return (
+            bucket("all_time", "sales"),
+            bucket("this_month", "sales"),
+            bucket("today", "sales"),
+            bucket("all_time", "profit"),
+            bucket("this_month", "profit"),
+            bucket("today", "profit"),
+        )
@@ -1,11 +1,27 @@
+import copy
+import threading
+import time
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from src.database.codecs import to_decimal
 from src.database.connection import DatabaseConnection
 
 
 class Product:
+    __slots__ = (
+        "_id",
+        "name",
+        "price",
+        "capital",
+        "stock",
+        "created_at",
+        "updated_at",
+    )
+
     def __init__(
         self,
         name: str,
@@ -29,8 +45,8 @@ class Product:
         return cls(
             _id=data.get("_id"),
             name=data["name"],
-            price=Decimal(str(data["price"])),
-            capital=Decimal(str(data["capital"])),
+            price=to_decimal(data["price"]),
+            capital=to_decimal(data["capital"]),
             stock=data["stock"],
             created_at=data.get("created_at"),
             updated_at=data.get("updated_at"),
@@ -40,50 +56,357 @@ class Product:
         return {
             "_id": self._id,
             "name": self.name,
-            "price": str(self.price),
-            "capital": str(self.capital),
+            "price": self.price,
+            "capital": self.capital,
             "stock": self.stock,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
 
 
+class ProductCatalog:
+    """Process-wide cache of all products, indexed by ``_id`` and by name.
+
+    ProductManager puts every product it writes back into the cache, writes
+    made inside a transaction once it commits. Other changes (other clients)
+    are picked up by ``refresh``, at most once per ``PROBE_INTERVAL`` seconds
+    (reads in between are served from memory). It only fetches products whose
+    ``updated_at`` is at most ``PROBE_OVERLAP`` older than the newest one
+    already cached, and reloads everything if the product count no longer
+    matches (a product was deleted elsewhere). ``updated_at`` is always set by
+    the server with ``$currentDate``, so client clocks do not matter.
+
+    Cached products are private, callers always get copies.
+    """
+
+    # Transaction MongoDB dibatalkan setelah transactionLifetimeLimitSeconds
+    # (default 60 detik), jadi tulisan yang commit terlambat tetap punya
+    # updated_at paling lama 60 detik sebelum saat ia terlihat
+    PROBE_OVERLAP = timedelta(seconds=60)
+    # Jeda minimum antar probe ke database, tulisan sendiri langsung masuk cache
+    PROBE_INTERVAL = 10.0
+
+    _instance = None
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.db = DatabaseConnection.get_instance()
+        self.collection = self.db.get_collection("products")
+        self.by_id: Dict[ObjectId, Product] = {}
+        self.by_name: Dict[str, Product] = {}
+        self.latest_update = None
+        self.loaded = False
+        # time.monotonic() saat probe terakhir
+        self.last_probe = None
+        # Naik setiap isi cache berubah, tampilan yang lebih lama perlu dimuat ulang
+        self.version = 0
+        # Dipakai dari thread UI dan worker DataLoader
+        self._lock = threading.RLock()
+
+    def refresh(self):
+        """Bring the cache up to date with as little data transfer as possible.
+
+        Does nothing if the last probe is less than PROBE_INTERVAL seconds old.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self.last_probe is not None
+                and now - self.last_probe < self.PROBE_INTERVAL
+            ):
+                return
+
+            if not self.loaded:
+                self._reload()
+            else:
+                query = {}
+                if self.latest_update is not None:
+                    since = self.latest_update - self.PROBE_OVERLAP
+                    query = {"updated_at": {"$gte": since}}
+                for doc in self.collection.find(query):
+                    self._load(doc)
+
+                if self.collection.estimated_document_count() != len(self.by_id):
+                    self._reload()
+            # Probe yang gagal dicoba lagi pada panggilan berikutnya
+            self.last_probe = now
+
+    def _reload(self):
+        self.by_id.clear()
+        self.by_name.clear()
+        self.latest_update = None
+        self.version += 1
+        for doc in self.collection.find():
+            self._load(doc)
+        self.loaded = True
+
+    def _load(self, doc: Dict[str, Any]):
+        self._put(Product.from_dict(doc))
+        # Versi diambil dari dokumen database, bukan dari jam lokal
+        updated_at = doc.get("updated_at")
+        if updated_at and (
+            self.latest_update is None or updated_at > self.latest_update
+        ):
+            self.latest_update = updated_at
+
+    def _put(self, product: Product):
+        previous = self.by_id.get(product._id)
+        if previous is not None:
+            # Hasil tulisan yang lebih lama tidak boleh menimpa yang lebih baru,
+            # dokumen yang sama dari probe berikutnya tidak mengubah apa pun
+            if product.updated_at <= previous.updated_at:
+                return
+            if self.by_name.get(previous.name) is previous:
+                del self.by_name[previous.name]
+        self.by_id[product._id] = product
+        self.by_name[product.name] = product
+        self.version += 1
+
+    def products(self) -> List[Product]:
+        self.refresh()
+        return self.cached_products()
+
+    def versioned_products(self) -> Tuple[int, List[Product]]:
+        """Refreshed products together with the version they belong to"""
+        with self._lock:
+            self.refresh()
+            return self.version, self.cached_products()
+
+    def expire(self):
+        """Let the next refresh probe the database right away"""
+        with self._lock:
+            self.last_probe = None
+
+    def cached_products(self) -> List[Product]:
+        """Products as currently cached, without asking the database."""
+        with self._lock:
+            return [copy.copy(product) for product in self.by_id.values()]
+
+    def get(self, product_id: ObjectId) -> Optional[Product]:
+        with self._lock:
+            product = self.by_id.get(product_id)
+            return copy.copy(product) if product is not None else None
+
+    def find_by_name(self, name: str) -> Optional[Product]:
+        with self._lock:
+            product = self.by_name.get(name)
+            return copy.copy(product) if product is not None else None
+
+    def put_documents(self, docs):
+        """Cache products just read back after a write"""
+        with self._lock:
+            if self.loaded:
+                for doc in docs:
+                    self._put(Product.from_dict(doc))
+
+    def remove(self, product_id: ObjectId):
+        with self._lock:
+            product = self.by_id.pop(product_id, None)
+            if product is None:
+                return
+            if self.by_name.get(product.name) is product:
+                del self.by_name[product.name]
+            self.version += 1
+
+
 class ProductManager:
     def __init__(self):
         self.db = DatabaseConnection.get_instance()
         self.collection = self.db.get_collection("products")
+        self.catalog = ProductCatalog.get_instance()
 
     def create_product(self, product: Product) -> ObjectId:
-        result = self.collection.insert_one(product.to_dict())
-        return result.inserted_id
+        document = product.to_dict()
+        del document["updated_at"]
+        # Upsert agar updated_at diisi jam server, bukan jam client
+        self.collection.update_one(
+            {"_id": product._id},
+            {"$setOnInsert": document, "$currentDate": {"updated_at": True}},
+            upsert=True,
+        )
+        self.catalog.put_documents(self.collection.find({"_id": product._id}))
+        return product._id
 
     def get_all_products(self) -> List[Product]:
-        products = self.collection.find()
-        return [Product.from_dict(p) for p in products]
+        """All products from the shared catalog, refreshed if anything changed."""
+        return self.catalog.products()
 
     def get_product_by_id(self, product_id: ObjectId) -> Optional[Product]:
+        product = self.catalog.get(product_id)
+        if product is not None:
+            return product
+        # Catalog belum dimuat atau produk baru dari client lain
         product = self.collection.find_one({"_id": product_id})
         return Product.from_dict(product) if product else None
 
     def update_product(self, product: Product) -> bool:
         try:
-            result = self.collection.update_one(
+            updated = self.collection.find_one_and_update(
                 {"_id": product._id},
                 {
                     "$set": {
                         "name": product.name,
-                        "price": str(product.price),
-                        "capital": str(product.capital),
+                        "price": product.price,
+                        "capital": product.capital,
                         "stock": product.stock,
-                        "updated_at": datetime.utcnow(),
-                    }
+                    },
+                    "$currentDate": {"updated_at": True},
                 },
+                return_document=ReturnDocument.AFTER,
             )
-            return result.modified_count > 0
+            if updated:
+                self.catalog.put_documents([updated])
+            return updated is not None
         except Exception as e:
             print(f"Error updating product: {e}")
             return False
 
+    def reserve_stock(
+        self, product_id: ObjectId, quantity: int, session=None
+    ) -> Optional[Product]:
+        """Atomically take quantity from stock, None if there is not enough."""
+        product = self.collection.find_one_and_update(
+            {"_id": product_id, "stock": {"$gte": quantity}},
+            {"$inc": {"stock": -quantity}, "$currentDate": {"updated_at": True}},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if not product:
+            return None
+        # Perubahan dalam transaksi baru masuk ke catalog setelah commit
+        self.db.after_commit(session, lambda: self.catalog.put_documents([product]))
+        return Product.from_dict(product)
+
+    def release_stock(self, product_id: ObjectId, quantity: int, session=None) -> bool:
+        """Atomically put quantity back into stock."""
+        product = self.collection.find_one_and_update(
+            {"_id": product_id},
+            {"$inc": {"stock": quantity}, "$currentDate": {"updated_at": True}},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if not product:
+            return False
+        self.db.after_commit(session, lambda: self.catalog.put_documents([product]))
+        return True
+
+    def apply_stock_deltas(
+        self, deltas: Dict[ObjectId, int], session=None
+    ) -> Dict[str, Any]:
+        """Apply many stock changes with one unordered bulk_write of $inc.
+
+        Like reserve_stock, a negative delta is only applied when there is
+        enough stock. Returns the number of updated products and an
+        ``{"product_id", "error"}`` entry for every change that could not be
+        applied or whose write concern failed.
+        """
+        product_ids = [product_id for product_id, delta in deltas.items() if delta]
+        if not product_ids:
+            return {"updated": 0, "errors": []}
+
+        # Stok sebelum update untuk tahu perubahan mana yang tidak diterapkan
+        before = {
+            doc["_id"]: doc["stock"]
+            for doc in self.collection.find(
+                {"_id": {"$in": product_ids}}, {"stock": 1}, session=session
+            )
+        }
+        errors = []
+        for product_id in product_ids:
+            if product_id not in before:
+                errors.append({"product_id": product_id, "error": "Product not found"})
+            elif before[product_id] + deltas[product_id] < 0:
+                errors.append(
+                    {"product_id": product_id, "error": "Insufficient stock"}
+                )
+        skipped = {error["product_id"] for error in errors}
+        product_ids = [
+            product_id for product_id in product_ids if product_id not in skipped
+        ]
+
+        operations = []
+        for product_id in product_ids:
+            delta = deltas[product_id]
+            query = {"_id": product_id}
+            if delta < 0:
+                query["stock"] = {"$gte": -delta}
+            operations.append(
+                UpdateOne(
+                    query,
+                    {"$inc": {"stock": delta}, "$currentDate": {"updated_at": True}},
+                )
+            )
+
+        matched = 0
+        write_errors = []
+        concern_errors = []
+        if operations:
+            try:
+                result = self.collection.bulk_write(
+                    operations, ordered=False, session=session
+                )
+                matched = result.matched_count
+            except BulkWriteError as e:
+                matched = e.details.get("nMatched", 0)
+                write_errors = [
+                    {
+                        "product_id": product_ids[error["index"]],
+                        "error": error["errmsg"],
+                    }
+                    for error in e.details.get("writeErrors", [])
+                ]
+                concern_errors = e.details.get("writeConcernErrors", [])
+
+        failed = {error["product_id"] for error in write_errors}
+        errors += write_errors
+        after = {}
+        if product_ids:
+            after = {
+                doc["_id"]: doc
+                for doc in self.collection.find(
+                    {"_id": {"$in": product_ids}}, session=session
+                )
+            }
+
+        if matched + len(write_errors) < len(operations):
+            # Stok berubah di antara pembacaan dan bulk_write (tanpa transaksi),
+            # produk yang stoknya tidak sesuai hasil $inc dilaporkan
+            for product_id in product_ids:
+                if product_id in failed:
+                    continue
+                doc = after.get(product_id)
+                if doc is None:
+                    error = "Product not found"
+                elif doc["stock"] != before[product_id] + deltas[product_id]:
+                    error = "Stock changed during update, change may not be applied"
+                else:
+                    continue
+                errors.append({"product_id": product_id, "error": error})
+                failed.add(product_id)
+
+        if concern_errors:
+            # Tulisan sudah diterapkan di primary tapi belum tentu bertahan
+            message = "; ".join(error["errmsg"] for error in concern_errors)
+            errors.extend(
+                {"product_id": product_id, "error": f"Write concern error: {message}"}
+                for product_id in product_ids
+                if product_id not in failed
+            )
+
+        # Stok hasil akhir yang sudah dibaca masuk catalog setelah commit
+        self.db.after_commit(
+            session, lambda: self.catalog.put_documents(after.values())
+        )
+
+        return {"updated": matched, "errors": errors}
+
     def delete_product(self, product_id: ObjectId) -> bool:
         result = self.collection.delete_one({"_id": product_id})
+        if result.deleted_count > 0:
+            self.catalog.remove(product_id)
         return result.deleted_count > 0
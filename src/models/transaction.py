@@ -1,11 +1,28 @@
+import re
 from datetime import datetime, date
 from decimal import Decimal
-from typing import Dict, Any, List, Optional
-from bson import ObjectId
+from typing import Dict, Any, List, Optional, Tuple
+from bson import ObjectId, Decimal128
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+from src.database.codecs import to_decimal
 from src.database.connection import DatabaseConnection
+from src.models.daily_sales import DailySalesManager
 
 
 class Transaction:
+    __slots__ = (
+        "_id",
+        "product_id",
+        "product_name",
+        "quantity",
+        "total",
+        "capital",
+        "profit",
+        "date",
+        "created_at",
+    )
+
     def __init__(
         self,
         product_id: ObjectId,
@@ -34,9 +51,9 @@ class Transaction:
             "product_id": self.product_id,
             "product_name": self.product_name,
             "quantity": self.quantity,
-            "total": str(self.total),
-            "capital": str(self.capital),
-            "profit": str(self.profit),
+            "total": self.total,
+            "capital": self.capital,
+            "profit": self.profit,
             "date": datetime.combine(self.date, datetime.min.time()),
             "created_at": self.created_at,
         }
@@ -48,33 +65,102 @@ class Transaction:
             product_id=data["product_id"],
             product_name=data["product_name"],
             quantity=data["quantity"],
-            total=Decimal(str(data["total"])),
-            capital=Decimal(str(data["capital"])),
-            profit=Decimal(str(data["profit"])),
+            total=to_decimal(data["total"]),
+            capital=to_decimal(data["capital"]),
+            profit=to_decimal(data["profit"]),
             date=data["date"].date(),
             created_at=data.get("created_at"),
         )
 
 
 class TransactionManager:
+    # Urutan sama dengan sort_combobox di SalesTab: (field, direction)
+    SORT_ORDERS = [
+        ("date", -1),
+        ("date", 1),
+        ("created_at", -1),
+        ("created_at", 1),
+        ("total", -1),
+        ("total", 1),
+        ("quantity", -1),
+        ("quantity", 1),
+    ]
+
     def __init__(self):
         self.db = DatabaseConnection.get_instance()
         self.collection = self.db.get_collection("transactions")
+        self.daily_sales = DailySalesManager()
 
-    def create_transaction(self, transaction: Transaction) -> bool:
+    def create_transaction(self, transaction: Transaction, session=None) -> bool:
         try:
-            result = self.collection.insert_one(transaction.to_dict())
-            return bool(result.inserted_id)
+            result = self.collection.insert_one(transaction.to_dict(), session=session)
+            if not result.inserted_id:
+                return False
+            if not self.daily_sales.record([transaction], session=session):
+                # Rollup gagal ditulis (tanpa session), batalkan insert-nya
+                self.collection.delete_one({"_id": transaction._id})
+                return False
+            return True
         except Exception as e:
             print(f"Error creating transaction: {e}")
             return False
 
-    def update_transaction(self, transaction: Transaction) -> bool:
+    def create_transactions_bulk(
+        self, transactions: List[Transaction], session=None
+    ) -> Dict[str, Any]:
+        """Insert many transactions with one unordered insert_many.
+
+        Returns the inserted ids and an ``{"index", "error"}`` entry for every
+        row that failed, so one bad row does not stop the rest of the batch.
+        """
+        docs = [transaction.to_dict() for transaction in transactions]
+        if not docs:
+            return {"inserted_ids": [], "errors": []}
+
+        errors = []
         try:
-            result = self.collection.update_one(
-                {"_id": transaction._id}, {"$set": transaction.to_dict()}
+            self.collection.insert_many(docs, ordered=False, session=session)
+        except BulkWriteError as e:
+            errors = [
+                {"index": error["index"], "error": error["errmsg"]}
+                for error in e.details.get("writeErrors", [])
+            ]
+
+        failed = {error["index"] for error in errors}
+        inserted = [
+            transaction
+            for index, transaction in enumerate(transactions)
+            if index not in failed
+        ]
+        if not self.daily_sales.record(inserted, session=session):
+            # Rollup gagal ditulis (tanpa session), batalkan insert-nya
+            self.collection.delete_many({"_id": {"$in": [t._id for t in inserted]}})
+            errors += [
+                {"index": index, "error": "Failed to update daily sales"}
+                for index in range(len(transactions))
+                if index not in failed
+            ]
+            return {"inserted_ids": [], "errors": errors}
+        return {"inserted_ids": [t._id for t in inserted], "errors": errors}
+
+    def update_transaction(self, transaction: Transaction, session=None) -> bool:
+        try:
+            # Dokumen lama dibutuhkan untuk mengoreksi rollup daily_sales
+            old = self.collection.find_one_and_update(
+                {"_id": transaction._id},
+                {"$set": transaction.to_dict()},
+                return_document=ReturnDocument.BEFORE,
+                session=session,
             )
-            return result.modified_count > 0
+            if old is None:
+                return False
+            if not self.daily_sales.replace(
+                Transaction.from_dict(old), transaction, session=session
+            ):
+                # Rollup gagal ditulis (tanpa session), kembalikan dokumen lama
+                self.collection.replace_one({"_id": transaction._id}, old)
+                return False
+            return True
         except Exception as e:
             print(f"Error updating transaction: {e}")
             return False
@@ -83,20 +169,57 @@ class TransactionManager:
         transactions = self.collection.find().sort("date", -1)
         return [Transaction.from_dict(t) for t in transactions]
 
+    def get_transaction_batch(self, query: Optional[Dict[str, Any]] = None):
+        """Load matching transactions into a compact read-only TransactionBatch."""
+        from src.models.transaction_batch import TransactionBatch
+
+        cursor = self.collection.find(query or {}).sort("date", -1).batch_size(5000)
+        return TransactionBatch.from_documents(cursor)
+
+    def search_filter(self, search_text: str) -> Dict[str, Any]:
+        """Filter on the exact product names containing ``search_text``.
+
+        The names come from a distinct over the product_name index, the
+        filter itself is then an index lookup instead of a regex scan.
+        """
+        names = self.collection.distinct(
+            "product_name", self._search_filter(search_text)
+        )
+        return {"product_name": {"$in": names}}
+
+    def get_search_batch(self, query: Dict[str, Any], limit: int):
+        """TransactionBatch of a search_filter() query, None above ``limit`` rows"""
+        if self.collection.count_documents(query, limit=limit + 1) > limit:
+            return None
+        return self.get_transaction_batch(query)
+
+    def get_changed_batch(self, ids, search_text: str = ""):
+        """TransactionBatch of the given transactions still matching the search"""
+        query = {"_id": {"$in": list(ids)}}
+        if search_text:
+            query.update(self._search_filter(search_text))
+        return self.get_transaction_batch(query)
+
+    def get_transaction_batch_by_date_range(self, start_date: date, end_date: date):
+        return self.get_transaction_batch(self._date_range_filter(start_date, end_date))
+
     def get_transaction_by_id(self, transaction_id: ObjectId) -> Optional[Transaction]:
         transaction = self.collection.find_one({"_id": transaction_id})
         return Transaction.from_dict(transaction) if transaction else None
 
+    @staticmethod
+    def _date_range_filter(start_date: date, end_date: date) -> Dict[str, Any]:
+        # Konversi date ke datetime untuk query MongoDB
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date, datetime.max.time())
+        return {"date": {"$gte": start, "$lte": end}}
+
     def get_transactions_by_date_range(
         self, start_date: date, end_date: date
     ) -> List[Transaction]:
         try:
-            # Konversi date ke datetime untuk query MongoDB
-            start = datetime.combine(start_date, datetime.min.time())
-            end = datetime.combine(end_date, datetime.max.time())
-
             transactions = self.collection.find(
-                {"date": {"$gte": start, "$lte": end}}
+                self._date_range_filter(start_date, end_date)
             ).sort("date", -1)
 
             return [Transaction.from_dict(t) for t in transactions]
@@ -104,6 +227,237 @@ class TransactionManager:
             print(f"Error getting transactions: {e}")
             return []
 
-    def delete_transaction(self, transaction_id: ObjectId) -> bool:
-        result = self.collection.delete_one({"_id": transaction_id})
-        return result.deleted_count > 0
+    def count_transactions_by_date_range(self, start_date: date, end_date: date) -> int:
+        return self.collection.count_documents(
+            self._date_range_filter(start_date, end_date)
+        )
+
+    def iter_transactions_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        projection: Optional[Dict[str, Any]] = None,
+        batch_size: int = 5000,
+    ):
+        """Raw documents in a date range, newest first, fetched in batches.
+
+        Unlike get_transactions_by_date_range nothing is materialized, errors
+        are raised to the caller while iterating.
+        """
+        return (
+            self.collection.find(
+                self._date_range_filter(start_date, end_date), projection
+            )
+            .sort("date", -1)
+            .batch_size(batch_size)
+        )
+
+    @staticmethod
+    def _search_filter(search_text: str) -> Dict[str, Any]:
+        if not search_text:
+            return {}
+        return {"product_name": {"$regex": re.escape(search_text), "$options": "i"}}
+
+    def count_transactions(self, search_text: str = "", exact: bool = False) -> int:
+        # Tanpa filter cukup pakai metadata collection, kecuali diminta pasti
+        if not search_text and not exact:
+            return self.collection.estimated_document_count()
+        return self.collection.count_documents(self._search_filter(search_text))
+
+    @classmethod
+    def page_cursor(cls, transaction: Transaction, sort_option: int) -> Tuple:
+        """Seek key (sort value, _id) of a transaction for get_transactions_page."""
+        field, _ = cls.SORT_ORDERS[sort_option]
+        value = getattr(transaction, field)
+        if field == "date":
+            value = datetime.combine(value, datetime.min.time())
+        elif field == "total":
+            value = Decimal128(str(value))
+        return value, transaction._id
+
+    def get_transactions_page(
+        self,
+        sort_option: int = 0,
+        limit: int = 10,
+        search_text: str = "",
+        after: Optional[Tuple] = None,
+        before: Optional[Tuple] = None,
+        from_end: bool = False,
+    ) -> List[Transaction]:
+        """Keyset pagination on (sort key, _id) for one of SORT_ORDERS.
+
+        ``after``/``before`` are page_cursor() values of the last/first row of
+        the neighbouring page, ``from_end`` returns the last ``limit`` rows.
+        Every order is served by a (field, _id) index, total sorts on the
+        stored Decimal128 so migrate-money must have converted old string
+        totals (strings sort after every number).
+        """
+        field, direction = self.SORT_ORDERS[sort_option]
+        backwards = before is not None or from_end
+        if backwards:
+            direction = -direction
+        seek = before if before is not None else after
+
+        pipeline = [{"$match": self._search_filter(search_text)}]
+        if seek is not None:
+            value, last_id = seek
+            op = "$lt" if direction < 0 else "$gt"
+            pipeline.append(
+                {
+                    "$match": {
+                        "$or": [
+                            {field: {op: value}},
+                            {field: value, "_id": {op: last_id}},
+                        ]
+                    }
+                }
+            )
+
+        pipeline.append({"$sort": {field: direction, "_id": direction}})
+        pipeline.append({"$limit": limit})
+
+        try:
+            docs = list(self.collection.aggregate(pipeline, allowDiskUse=True))
+        except Exception as e:
+            print(f"Error getting transactions page: {e}")
+            return []
+
+        if backwards:
+            docs.reverse()
+        return [Transaction.from_dict(doc) for doc in docs]
+
+    def get_sales_totals(self, today: Optional[date] = None) -> Optional[tuple]:
+        """Server-side equivalent of calculate_totals, read from the rollup."""
+        return self.daily_sales.get_sales_totals(today)
+
+    def summarize_range(
+        self, start_date: date, end_date: date
+    ) -> Optional[Dict[str, Any]]:
+        """Totals, per-product summary and trends of a date range in one $facet.
+
+        Reads the daily_sales rollup, so the cost depends on the number of
+        (day, product) buckets in the range, not on the number of transactions.
+        Returns None on failure.
+        """
+        match = {
+            "date": {
+                "$gte": datetime.combine(start_date, datetime.min.time()),
+                "$lte": datetime.combine(end_date, datetime.min.time()),
+            }
+        }
+        pipeline = [
+            {"$match": match},
+            {
+                "$facet": {
+                    "overview": [
+                        {
+                            "$group": {
+                                "_id": None,
+                                "transactions": {"$sum": "$count"},
+                                "revenue": {"$sum": "$revenue"},
+                                "capital": {"$sum": "$capital"},
+                                "profit": {"$sum": "$profit"},
+                            }
+                        }
+                    ],
+                    "products": [
+                        {
+                            "$group": {
+                                "_id": "$product_name",
+                                "quantity": {"$sum": "$quantity"},
+                                "total": {"$sum": "$revenue"},
+                                "last_sale": {"$max": "$date"},
+                            }
+                        },
+                        {"$sort": {"last_sale": -1, "_id": 1}},
+                    ],
+                    "days": [
+                        {
+                            "$group": {
+                                "_id": "$date",
+                                "revenue": {"$sum": "$revenue"},
+                            }
+                        },
+                        # Hari dengan revenue terbesar, yang terlama jika seri
+                        # seperti laporan lama
+                        {"$sort": {"revenue": -1, "_id": 1}},
+                        {
+                            "$group": {
+                                "_id": None,
+                                "count": {"$sum": 1},
+                                "peak": {
+                                    "$first": {"revenue": "$revenue", "date": "$_id"}
+                                },
+                                # Growth rate dihitung dari hari terbaru ke hari
+                                # terlama, dokumen dibandingkan per field (date dulu)
+                                "newest": {
+                                    "$max": {"date": "$_id", "revenue": "$revenue"}
+                                },
+                                "oldest": {
+                                    "$min": {"date": "$_id", "revenue": "$revenue"}
+                                },
+                            }
+                        },
+                    ],
+                }
+            },
+        ]
+
+        try:
+            result = next(self.daily_sales.collection.aggregate(pipeline))
+        except Exception as e:
+            print(f"Error summarizing transactions: {e}")
+            return None
+
+        overview = result["overview"][0] if result["overview"] else {}
+        summary = {
+            "transactions": overview.get("transactions", 0),
+            "total_amount": to_decimal(overview.get("revenue", 0)),
+            "total_capital": to_decimal(overview.get("capital", 0)),
+            "total_profit": to_decimal(overview.get("profit", 0)),
+            "product_summary": {
+                row["_id"]: {
+                    "quantity": row["quantity"],
+                    "total": to_decimal(row["total"]),
+                }
+                for row in result["products"]
+            },
+            "trends": {},
+        }
+        if not result["days"]:
+            return summary
+
+        days = result["days"][0]
+        first_day_sales = to_decimal(days["newest"]["revenue"])
+        last_day_sales = to_decimal(days["oldest"]["revenue"])
+        if days["count"] >= 2 and first_day_sales > 0:
+            growth_rate = (last_day_sales - first_day_sales) / first_day_sales * 100
+        else:
+            growth_rate = 0
+
+        top_products = sorted(
+            result["products"], key=lambda row: row["quantity"], reverse=True
+        )[:5]
+        summary["trends"] = {
+            "peak_day": {
+                "date": days["peak"]["date"].strftime("%Y-%m-%d"),
+                "amount": to_decimal(days["peak"]["revenue"]),
+            },
+            "growth_rate": growth_rate,
+            "top_products": [(row["_id"], row["quantity"]) for row in top_products],
+        }
+        return summary
+
+    def delete_transaction(self, transaction_id: ObjectId, session=None) -> bool:
+        deleted = self.collection.find_one_and_delete(
+            {"_id": transaction_id}, session=session
+        )
+        if deleted is None:
+            return False
+        if not self.daily_sales.revert(
+            [Transaction.from_dict(deleted)], session=session
+        ):
+            # Rollup gagal ditulis (tanpa session), kembalikan transaksinya
+            self.collection.insert_one(deleted)
+            return False
+        return True
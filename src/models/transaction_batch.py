@@ -0,0 +1,215 @@
+from array import array
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator
+import numpy as np
+from bson import ObjectId
+from src.database.codecs import to_decimal
+from src.models.transaction import Transaction
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+class TransactionBatch:
+    """Read-only columnar container for bulk loaded transactions.
+
+    Dates are int32 day numbers since 1970-01-01, quantities int32 and money
+    int64 minor units (sen). Product id/name pairs are stored once and
+    referenced by an int32 code per row. Rows are only turned back into
+    Transaction objects when accessed.
+    """
+
+    MINOR_UNITS = 100
+
+    # Transaction field -> column used to sort it
+    SORT_COLUMNS = {
+        "date": "days",
+        "created_at": "created_ms",
+        "total": "total",
+        "quantity": "quantity",
+    }
+
+    __slots__ = (
+        "ids",
+        "product_codes",
+        "products",
+        "days",
+        "quantity",
+        "total",
+        "capital",
+        "profit",
+        "created_ms",
+    )
+
+    def __init__(
+        self,
+        ids,
+        product_codes,
+        products,
+        days,
+        quantity,
+        total,
+        capital,
+        profit,
+        created_ms,
+    ):
+        self.ids = ids
+        self.product_codes = product_codes
+        self.products = products  # list of (product_id, product_name)
+        self.days = days
+        self.quantity = quantity
+        self.total = total
+        self.capital = capital
+        self.profit = profit
+        self.created_ms = created_ms
+
+    @classmethod
+    def to_minor(cls, value) -> int:
+        return int((to_decimal(value) * cls.MINOR_UNITS).to_integral_value())
+
+    @classmethod
+    def from_minor(cls, value) -> Decimal:
+        return Decimal(int(value)).scaleb(-2)
+
+    @classmethod
+    def from_documents(cls, docs: Iterable[Dict[str, Any]]) -> "TransactionBatch":
+        ids = bytearray()
+        product_codes = array("i")
+        days = array("i")
+        quantity = array("i")
+        total = array("q")
+        capital = array("q")
+        profit = array("q")
+        created_ms = array("q")
+        products = []
+        product_index = {}
+
+        for doc in docs:
+            key = (doc["product_id"], doc["product_name"])
+            code = product_index.get(key)
+            if code is None:
+                code = product_index[key] = len(products)
+                products.append(key)
+
+            ids += doc["_id"].binary
+            product_codes.append(code)
+            days.append(doc["date"].toordinal() - EPOCH_ORDINAL)
+            quantity.append(doc["quantity"])
+            total.append(cls.to_minor(doc["total"]))
+            capital.append(cls.to_minor(doc["capital"]))
+            profit.append(cls.to_minor(doc["profit"]))
+            created_at = doc.get("created_at") or EPOCH
+            created_ms.append((created_at - EPOCH) // timedelta(milliseconds=1))
+
+        return cls(
+            ids=np.frombuffer(bytes(ids), dtype="V12"),
+            product_codes=np.array(product_codes, dtype=np.int32),
+            products=products,
+            days=np.array(days, dtype=np.int32),
+            quantity=np.array(quantity, dtype=np.int32),
+            total=np.array(total, dtype=np.int64),
+            capital=np.array(capital, dtype=np.int64),
+            profit=np.array(profit, dtype=np.int64),
+            created_ms=np.array(created_ms, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __getitem__(self, index: int) -> Transaction:
+        product_id, product_name = self.products[self.product_codes[index]]
+        return Transaction(
+            _id=ObjectId(self.ids[index].tobytes()),
+            product_id=product_id,
+            product_name=product_name,
+            quantity=int(self.quantity[index]),
+            total=self.from_minor(self.total[index]),
+            capital=self.from_minor(self.capital[index]),
+            profit=self.from_minor(self.profit[index]),
+            date=date.fromordinal(int(self.days[index]) + EPOCH_ORDINAL),
+            created_at=EPOCH + timedelta(milliseconds=int(self.created_ms[index])),
+        )
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, indices) -> "TransactionBatch":
+        """New batch with the given rows, sharing the product table."""
+        return TransactionBatch(
+            ids=self.ids[indices],
+            product_codes=self.product_codes[indices],
+            products=self.products,
+            days=self.days[indices],
+            quantity=self.quantity[indices],
+            total=self.total[indices],
+            capital=self.capital[indices],
+            profit=self.profit[indices],
+            created_ms=self.created_ms[indices],
+        )
+
+    def replace_ids(self, ids, added: "TransactionBatch") -> "TransactionBatch":
+        """New batch without the rows of ``ids``, with the rows of ``added``.
+
+        Used to apply a few changed transactions without reloading the batch.
+        """
+        keys = np.frombuffer(b"".join(oid.binary for oid in ids), dtype="V12")
+        kept = self.take(np.flatnonzero(~np.isin(self.ids, keys)))
+
+        # Kode produk batch baru dipetakan ke tabel produk batch lama
+        products = list(self.products)
+        product_index = {key: code for code, key in enumerate(products)}
+        codes = np.empty(len(added.products), dtype=np.int32)
+        for code, key in enumerate(added.products):
+            if key not in product_index:
+                product_index[key] = len(products)
+                products.append(key)
+            codes[code] = product_index[key]
+
+        added_codes = codes[added.product_codes]
+        return TransactionBatch(
+            ids=np.concatenate([kept.ids, added.ids]),
+            product_codes=np.concatenate([kept.product_codes, added_codes]),
+            products=products,
+            days=np.concatenate([kept.days, added.days]),
+            quantity=np.concatenate([kept.quantity, added.quantity]),
+            total=np.concatenate([kept.total, added.total]),
+            capital=np.concatenate([kept.capital, added.capital]),
+            profit=np.concatenate([kept.profit, added.profit]),
+            created_ms=np.concatenate([kept.created_ms, added.created_ms]),
+        )
+
+    def sort_order(self, field: str, direction: int) -> np.ndarray:
+        """Row indices sorted on ``field`` with ``_id`` as tie breaker."""
+        # ObjectId dibandingkan per byte, sama dengan tiga uint32 big-endian
+        id_words = self.ids.view(">u4").reshape(-1, 3)
+        column = getattr(self, self.SORT_COLUMNS[field])
+        order = np.lexsort((id_words[:, 2], id_words[:, 1], id_words[:, 0], column))
+        return order[::-1] if direction < 0 else order
+
+    def match_products(self, text: str, codes=None) -> np.ndarray:
+        """Product codes whose name contains ``text``, case-insensitive.
+
+        Pass the codes of a previous, shorter search to only check those.
+        """
+        needle = text.lower()
+        candidates = range(len(self.products)) if codes is None else codes
+        return np.array(
+            [code for code in candidates if needle in self.products[code][1].lower()],
+            dtype=np.int32,
+        )
+
+    def rows_with_products(self, codes, rows) -> np.ndarray:
+        """Subset of ``rows`` (order kept) whose product code is in ``codes``."""
+        selected = np.zeros(len(self.products), dtype=bool)
+        selected[codes] = True
+        return rows[selected[self.product_codes[rows]]]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            getattr(self, column).nbytes
+            for column in self.__slots__
+            if column != "products"
+        )
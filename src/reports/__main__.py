@@ -0,0 +1,104 @@
+"""Headless report generation, no Qt involved.
+
+    python -m src.reports --range 2024-01-01 2024-12-31 --format html json
+    python -m src.reports --month 2024-01 --month 2024-02 --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from src.models.product import ProductManager
+from src.models.transaction import TransactionManager
+from src.reports.report import FORMATS, run_report, sales_totals
+
+
+def month_range(value):
+    first = date.fromisoformat(f"{value}-01")
+    next_month = (first.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def parse_ranges(args):
+    ranges = [
+        (date.fromisoformat(start), date.fromisoformat(end))
+        for start, end in args.range or []
+    ]
+    ranges += [month_range(value) for value in args.month or []]
+    if args.days:
+        today = date.today()
+        ranges.append((today - timedelta(days=args.days - 1), today))
+    for start, end in ranges:
+        if start > end:
+            raise SystemExit(f"Start date {start} is after end date {end}")
+    return ranges
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.reports", description="PyStockFlow sales reports"
+    )
+    parser.add_argument(
+        "--range",
+        nargs=2,
+        action="append",
+        metavar=("START", "END"),
+        help="Date range as YYYY-MM-DD YYYY-MM-DD, can be repeated",
+    )
+    parser.add_argument(
+        "--month", action="append", metavar="YYYY-MM", help="Can be repeated"
+    )
+    parser.add_argument("--days", type=int, help="The last N days up to today")
+    parser.add_argument(
+        "--format", nargs="+", choices=FORMATS, default=["html"], dest="formats"
+    )
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Date ranges processed concurrently"
+    )
+    args = parser.parse_args(argv)
+
+    ranges = parse_ranges(args)
+    if not ranges:
+        parser.error("give at least one --range, --month or --days")
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    transaction_manager = TransactionManager()
+    products = ProductManager().get_all_products()
+    totals = sales_totals(transaction_manager)
+
+    # pymongo aman dipakai bersama oleh beberapa thread
+    with ThreadPoolExecutor(max_workers=max(args.workers, 1)) as executor:
+        futures = [
+            executor.submit(
+                run_report,
+                transaction_manager,
+                products,
+                start,
+                end,
+                args.output_dir,
+                args.formats,
+                totals,
+            )
+            for start, end in ranges
+        ]
+        failed = 0
+        for future in futures:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error generating report: {e}")
+                failed += 1
+                continue
+            for path in result["files"]:
+                print(f"{result['start_date']} to {result['end_date']}: {path}")
+
+    print(f"{len(ranges) - failed} report(s) in {time.perf_counter() - started:.2f}s")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import json
+import math
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict
+
+from bson import ObjectId
+from src.reports.summary import format_summary_html
+from src.utils import excel_export
+from src.utils.calculate_metrics import calculate_metrics_vectorized
+from src.utils.calculate_totals import calculate_totals
+
+FORMATS = ("html", "json", "xlsx")
+TOTAL_FIELDS = (
+    "total_all_sales",
+    "total_this_month",
+    "total_today",
+    "total_all_profit",
+    "profit_this_month",
+    "profit_today",
+)
+
+
+def sales_totals(transaction_manager) -> Dict[str, Decimal]:
+    """All-time, this month and today totals, like the sidebar shows"""
+    totals = transaction_manager.get_sales_totals()
+    if totals is None:
+        # Fallback ke perhitungan di Python jika aggregation gagal
+        totals = calculate_totals(transaction_manager.get_all_transactions())
+    return dict(zip(TOTAL_FIELDS, totals))
+
+
+def build_report(transaction_manager, products, start_date, end_date):
+    """Summary and metrics of one date range, safe to run on a worker thread"""
+    summary = transaction_manager.summarize_range(start_date, end_date)
+    if summary is None:
+        raise RuntimeError(f"Failed to summarize {start_date} to {end_date}")
+
+    batch = transaction_manager.get_transaction_batch_by_date_range(
+        start_date, end_date
+    )
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "summary": summary,
+        "metrics": calculate_metrics_vectorized(batch, products),
+    }
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        # days_to_stockout tanpa penjualan bernilai inf
+        return None
+    return value
+
+
+def report_name(start_date, end_date) -> str:
+    return f"report_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+
+
+def write_report(report, directory, file_format, transaction_manager=None) -> str:
+    """Write one report as html, json or xlsx, returns the file path.
+
+    xlsx is the same streamed sales report as the Summary tab export and
+    needs ``transaction_manager`` to read the transactions.
+    """
+    start_date, end_date = report["start_date"], report["end_date"]
+    path = os.path.join(directory, f"{report_name(start_date, end_date)}.{file_format}")
+
+    if file_format == "html":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('<html><head><meta charset="utf-8"></head><body>')
+            f.write(format_summary_html(start_date, end_date, report["summary"]))
+            f.write("</body></html>\n")
+    elif file_format == "json":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(_jsonable(report), f, indent=2)
+            f.write("\n")
+    elif file_format == "xlsx":
+        documents = transaction_manager.iter_transactions_by_date_range(
+            start_date, end_date, projection=excel_export.PROJECTION
+        )
+        excel_export.write_sales_report(path, documents)
+    else:
+        raise ValueError(f"Unknown report format: {file_format}")
+    return path
+
+
+def run_report(
+    transaction_manager, products, start_date, end_date, directory, formats, totals
+) -> Dict[str, Any]:
+    """Build one date range and write it in every requested format"""
+    report = build_report(transaction_manager, products, start_date, end_date)
+    report["sales_totals"] = totals
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "files": [
+            write_report(report, directory, file_format, transaction_manager)
+            for file_format in formats
+        ],
+    }
@@ -0,0 +1,133 @@
+# Warna tema terang, dipakai saat laporan dibuat tanpa Qt
+REPORT_COLORS = {
+    "text_primary": "#000000",
+    "text_secondary": "#666666",
+    "accent": "#2563eb",
+}
+
+
+def format_summary_html(start_date, end_date, summary, colors=None):
+    """Format a summarize_range result as the HTML summary report"""
+    colors = colors or REPORT_COLORS
+    transaction_count = summary["transactions"]
+    total_amount = summary["total_amount"]
+    total_capital = summary["total_capital"]
+    total_profit = summary["total_profit"]
+    product_summary = summary["product_summary"]
+    trends = summary["trends"]
+
+    html = f"""
+    <style>
+        body {{ 
+            font-family: Arial, sans-serif; 
+            margin: 0; 
+            padding: 20px; 
+            background-color: #f9f9f9; 
+        }}
+        .header {{ 
+            color: {colors['text_secondary']}; 
+            font-size: 19px; 
+            font-weight: bold; 
+            margin-bottom: 20px; 
+        }}
+        .section {{ 
+            margin-bottom: 30px; 
+            padding-bottom: 10px; 
+            border-bottom: 1px solid {colors['text_secondary']}; 
+        }}
+        .subheader {{ 
+            color: {colors['text_secondary']}; 
+            font-size: 16px; 
+            margin-bottom: 10px; 
+            font-weight: bold;
+        }}
+        .data {{ 
+            color: {colors['text_primary']}; 
+            margin-left: 20px;
+            margin-bottom: 20px;
+            line-height: 1; 
+        }}
+        .highlight {{ 
+            color: {colors['accent']}; 
+            font-weight: bold;
+        }}
+        .transparent {{
+            background-color: transparent;
+            color: transparent;
+            border: none;
+        }}
+    </style>
+    
+    <div class="header">Summary Report ({start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')})</div>
+    """
+
+    if not transaction_count:
+        return (
+            html
+            + f"""
+        <div class="section">
+            <div class="subheader">No Data Available</div>
+            <div class="data">No transactions found for this period.</div>
+        </div>
+        """
+        )
+
+    html += f"""
+    <div class="section">
+        <div class="subheader">- Overview</div>
+        <div class="data">
+            Total Transactions: <span class="highlight">{transaction_count}</span><br>
+            Total Revenue: <span class="highlight">Rp{total_amount:,.2f}</span><br>
+            Total Capital: <span class="highlight">Rp{total_capital:,.2f}</span><br>
+            Total Profit: <span class="highlight">Rp{total_profit:,.2f}</span><br>
+            Average Transaction Value: <span class="highlight">Rp{(total_amount / transaction_count):,.2f}</span>
+        </div>
+    </div>
+    """
+
+    sections = [
+        {
+            "condition": trends.get("top_products"),
+            "subheader": "- Top Selling Products",
+            "data": "".join(
+                f"{product}: <span class='highlight'>{quantity}</span> units"
+                + ("<br>" if i < len(trends["top_products"]) - 1 else "")
+                for i, (product, quantity) in enumerate(trends["top_products"])
+            ),
+        },
+        {
+            "condition": trends.get("peak_day", {}).get("date"),
+            "subheader": "- Sales Analysis",
+            "data": f"""
+                Peak Sales Day: <span class="highlight">{trends['peak_day']['date']}</span><br>
+                Peak Day Revenue: <span class="highlight">Rp{trends['peak_day']['amount']:,.2f}</span><br>
+                Growth Rate: <span class="highlight">{trends['growth_rate']:.1f}%</span>
+            """,
+        },
+        {
+            "condition": product_summary,
+            "subheader": "- Detailed Product Summary",
+            "data": "".join(
+                f"""
+                <b>{product_name}</b><br>
+                Quantity Sold: <span class="highlight">{data['quantity']}</span><br>
+                Revenue: <span class="highlight">Rp{data['total']:,.2f}</span><br>
+                Average Price: <span class="highlight mb-10">Rp{(data['total'] / data['quantity']):,.2f}</span><br>
+                <span class="transparent">-</span><br>
+                """
+                for product_name, data in product_summary.items()
+                if data["quantity"] > 0
+            ),
+        },
+    ]
+
+    for section in sections:
+        if section["condition"]:
+            html += f"""
+            <div class="section">
+                <div class="subheader">{section['subheader']}</div>
+                <div class="data">{section['data']}</div>
+            </div>
+            """
+
+    return html
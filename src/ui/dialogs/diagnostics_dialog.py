@@ -0,0 +1,196 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+from src.config import Config
+from src.database.monitoring import BUCKETS_MS, CommandMonitor
+from src.style_config import Theme
+
+# (judul kolom, key di CommandStats.to_dict)
+COLUMNS = (
+    ("Collection", "collection"),
+    ("Command", "command"),
+    ("Count", "count"),
+    ("Failures", "failures"),
+    ("Total ms", "total_ms"),
+    ("Avg ms", "average_ms"),
+    ("p50 ms", "p50_ms"),
+    ("p95 ms", "p95_ms"),
+    ("Max ms", "max_ms"),
+    ("Documents", "documents"),
+    ("≈ Bytes", "est_bytes"),
+)
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class DiagnosticsDialog(QDialog):
+    """MongoDB command latency collected by CommandMonitor, refreshed live"""
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.monitor = CommandMonitor.get_instance()
+        self.stats = []
+        self.setWindowTitle("Query Diagnostics")
+        self.resize(1000, 600)
+        self.setup_ui()
+        self.refresh()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+
+    def setup_ui(self):
+        btn = Theme.btn()
+        stroke_btn = Theme.border_btn_sec()
+        layout = QVBoxLayout(self)
+
+        control_layout = QHBoxLayout()
+        self.since_label = QLabel()
+        self.since_label.setStyleSheet("color: gray;")
+
+        slow_label = QLabel("Slow query threshold:")
+        self.slow_spin = QSpinBox()
+        self.slow_spin.setRange(1, 600000)
+        self.slow_spin.setSuffix(" ms")
+        self.slow_spin.setValue(int(self.monitor.slow_ms))
+        self.slow_spin.valueChanged.connect(self.set_slow_ms)
+
+        reset_btn = QPushButton("Reset")
+        reset_btn.setStyleSheet(stroke_btn)
+        reset_btn.clicked.connect(self.reset)
+
+        control_layout.addWidget(self.since_label)
+        control_layout.addStretch()
+        control_layout.addWidget(slow_label)
+        control_layout.addWidget(self.slow_spin)
+        control_layout.addWidget(reset_btn)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for title, _ in COLUMNS])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.itemSelectionChanged.connect(self.show_histogram)
+
+        self.histogram_label = QLabel("Select a row to see its latency histogram")
+        self.histogram_label.setWordWrap(True)
+
+        slow_title = QLabel(
+            f"Recent slow queries (also written to slow_queries_*.log in "
+            f"{Config.LOG_DIR})"
+        )
+        slow_title.setWordWrap(True)
+        self.slow_text = QPlainTextEdit()
+        self.slow_text.setReadOnly(True)
+        self.slow_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+        close_btn = QPushButton("Close")
+        close_btn.setStyleSheet(btn)
+        close_btn.clicked.connect(self.accept)
+
+        layout.addLayout(control_layout)
+        layout.addWidget(self.table, 3)
+        layout.addWidget(self.histogram_label)
+        layout.addWidget(slow_title)
+        layout.addWidget(self.slow_text, 2)
+        layout.addWidget(close_btn, alignment=Qt.AlignRight)
+
+    def refresh(self):
+        self.stats, slow_queries = self.monitor.snapshot()
+        selected = self.selected_key()
+        self.since_label.setText(
+            f"Collected since {self.monitor.since:%Y-%m-%d %H:%M:%S}"
+        )
+
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        self.table.clearSelection()
+        self.table.setRowCount(len(self.stats))
+        for row, stats in enumerate(self.stats):
+            for column, (_, key) in enumerate(COLUMNS):
+                value = stats[key]
+                if key == "est_bytes":
+                    text = format_bytes(value)
+                elif isinstance(value, float):
+                    text = f"{value:.1f}"
+                else:
+                    text = str(value)
+                item = QTableWidgetItem(text)
+                if not isinstance(value, str):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+            if (stats["collection"], stats["command"]) == selected:
+                self.table.selectRow(row)
+        self.table.blockSignals(False)
+        self.table.setUpdatesEnabled(True)
+        self.show_histogram()
+
+        text = "\n".join(
+            f"{entry['time']:%H:%M:%S} {entry['duration_ms']:>9.1f}ms "
+            f"{entry['namespace']} {entry['command']}"
+            f"{' FAILED' if entry['failed'] else ''} docs={entry['documents']} "
+            f"bytes={entry['bytes']} {entry['details']}"
+            for entry in reversed(slow_queries)
+        )
+        if text != self.slow_text.toPlainText():
+            self.slow_text.setPlainText(text)
+
+    def selected_key(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        row = rows[0].row()
+        return self.table.item(row, 0).text(), self.table.item(row, 1).text()
+
+    def show_histogram(self):
+        selected = self.selected_key()
+        stats = next(
+            (
+                stats
+                for stats in self.stats
+                if (stats["collection"], stats["command"]) == selected
+            ),
+            None,
+        )
+        if stats is None:
+            self.histogram_label.setText("Select a row to see its latency histogram")
+            return
+
+        labels = [f"≤{bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        counts = stats["histogram"].values()
+        self.histogram_label.setText(
+            f"{stats['collection'] or '(database)'} {stats['command']}: "
+            + "   ".join(
+                f"{label}: {count}" for label, count in zip(labels, counts) if count
+            )
+        )
+
+    def set_slow_ms(self, value):
+        self.monitor.slow_ms = value
+
+    def reset(self):
+        self.monitor.reset()
+        self.table.clearSelection()
+        self.refresh()
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QDate
 from src.models.transaction import Transaction
 from src.style_config import Theme
+from src.utils.data_loader import DataLoader
 from src.utils.logger import Logger
 
 
@@ -30,7 +31,10 @@ class SaleDialog(QDialog):
         self.logger = logger
         self.transaction = transaction
         self.refresh_callback = refresh_callback
+        self.catalog = product_manager.catalog
+        self.loader = DataLoader(self)
         self.setup_dialog()
+        self.load_products()
 
     def setup_dialog(self):
         colors = Theme.get_theme_colors()
@@ -65,14 +69,10 @@ class SaleDialog(QDialog):
 
         # Product field
         layout.addWidget(QLabel("Product:"))
-        self.products = self.product_manager.get_all_products()
-        product_names = [p.name for p in self.products]
-
         self.product_combo = QComboBox(self)
-        self.product_combo.addItems(product_names)
+        self.product_combo.setPlaceholderText("Loading products...")
+        self.product_combo.setEnabled(False)
         self.product_combo.setStyleSheet(cbox)
-        if self.transaction:
-            self.product_combo.setCurrentText(self.transaction.product_name)
         layout.addWidget(self.product_combo)
 
         # Stock info
@@ -111,15 +111,50 @@ class SaleDialog(QDialog):
         separator.setFrameShadow(QLabel.Sunken)
         layout.addWidget(separator)
 
-        save_button = QPushButton("Save", self)
-        save_button.setStyleSheet(btn)
-        save_button.clicked.connect(self.save_sale)
-        layout.addWidget(save_button)
+        self.save_button = QPushButton("Save", self)
+        self.save_button.setStyleSheet(btn)
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.save_sale)
+        layout.addWidget(self.save_button)
 
         self.setLayout(layout)
         self.center_dialog()
         self.update_profit_preview()
 
+    def load_products(self):
+        # Tampilkan isi catalog dulu, perubahan terbaru menyusul dari background
+        if self.catalog.loaded:
+            self.on_products_loaded(self.catalog.cached_products())
+        self.loader.submit(
+            "products",
+            lambda job: self.product_manager.get_all_products(),
+            self.on_products_loaded,
+            self.on_products_error,
+        )
+
+    def on_products_loaded(self, products):
+        current = self.product_combo.currentText()
+        if not current and self.transaction:
+            current = self.transaction.product_name
+
+        self.product_combo.blockSignals(True)
+        self.product_combo.clear()
+        self.product_combo.addItems([p.name for p in products])
+        self.product_combo.blockSignals(False)
+        if current:
+            self.product_combo.setCurrentText(current)
+        else:
+            self.product_combo.setCurrentIndex(0 if products else -1)
+        self.product_combo.setEnabled(True)
+        self.save_button.setEnabled(True)
+
+        self.update_stock_info(self.product_combo.currentText())
+        self.update_profit_preview()
+
+    def on_products_error(self, message):
+        self.product_combo.setPlaceholderText("No products")
+        self.stock_info.setText(f"Failed to load products: {message}")
+
     def center_dialog(self):
         screen = self.screen().geometry()
         x = (screen.width() - self.width()) // 2
@@ -139,11 +174,7 @@ class SaleDialog(QDialog):
                 raise ValueError("Quantity must be positive")
 
             # Find selected product
-            selected_product = None
-            for product in self.products:
-                if product.name == product_name:
-                    selected_product = product
-                    break
+            selected_product = self.catalog.find_by_name(product_name)
 
             if not selected_product:
                 raise ValueError("Product not found")
@@ -155,40 +186,8 @@ class SaleDialog(QDialog):
 
             if self.transaction:
                 # Mode Edit
-                old_product = self.product_manager.get_product_by_id(
-                    self.transaction.product_id
-                )
-
-                # Cek apakah produk yang dipilih sama dengan produk lama
-                if old_product._id == selected_product._id:
-                    # Produk sama, cek apakah stok mencukupi
-                    available_stock = selected_product.stock + self.transaction.quantity
-                    if quantity > available_stock:
-                        raise ValueError(
-                            f"Insufficient stock!\n"
-                            f"Requested: {quantity}\n"
-                            f"Available: {available_stock}"
-                        )
-
-                    # Update stok
-                    selected_product.stock = available_stock - quantity
-                else:
-                    # Produk berbeda
-                    # Kembalikan stok produk lama
-                    old_product.stock += self.transaction.quantity
-                    if not self.product_manager.update_product(old_product):
-                        raise ValueError("Failed to restore old product stock")
-
-                    # Cek stok produk baru
-                    if quantity > selected_product.stock:
-                        raise ValueError(
-                            f"Insufficient stock!\n"
-                            f"Requested: {quantity}\n"
-                            f"Available: {selected_product.stock}"
-                        )
-
-                    # Update stok produk baru
-                    selected_product.stock -= quantity
+                old_product_id = self.transaction.product_id
+                old_quantity = self.transaction.quantity
 
                 # Update transaksi
                 self.transaction.date = sale_date
@@ -199,33 +198,85 @@ class SaleDialog(QDialog):
                 self.transaction.capital = total_capital
                 self.transaction.profit = profit
 
-                # Simpan perubahan
-                if not self.transaction_manager.update_transaction(self.transaction):
-                    raise ValueError("Failed to update transaction")
-
-                if not self.product_manager.update_product(selected_product):
-                    raise ValueError("Failed to update product stock")
+                def apply_edit(session):
+                    undo = []
+                    try:
+                        if old_product_id == selected_product._id:
+                            # Produk sama, cukup ubah stok sebesar selisihnya
+                            delta = quantity - old_quantity
+                            if delta > 0:
+                                if not self.product_manager.reserve_stock(
+                                    selected_product._id, delta, session=session
+                                ):
+                                    raise self.insufficient_stock_error(
+                                        selected_product._id, quantity, old_quantity
+                                    )
+                                undo.append((selected_product._id, delta))
+                            elif delta < 0:
+                                if not self.product_manager.release_stock(
+                                    selected_product._id, -delta, session=session
+                                ):
+                                    raise ValueError(
+                                        "Failed to restore old product stock"
+                                    )
+                                undo.append((selected_product._id, delta))
+                        else:
+                            # Produk berbeda, kembalikan stok produk lama
+                            if not self.product_manager.release_stock(
+                                old_product_id, old_quantity, session=session
+                            ):
+                                raise ValueError("Failed to restore old product stock")
+                            undo.append((old_product_id, -old_quantity))
+
+                            if not self.product_manager.reserve_stock(
+                                selected_product._id, quantity, session=session
+                            ):
+                                raise self.insufficient_stock_error(
+                                    selected_product._id, quantity
+                                )
+                            undo.append((selected_product._id, quantity))
+
+                        if not self.transaction_manager.update_transaction(
+                            self.transaction, session=session
+                        ):
+                            raise ValueError("Failed to update transaction")
+                    except Exception as e:
+                        # Tanpa transaction MongoDB, batalkan perubahan stok manual
+                        if session is None:
+                            failed = []
+                            for product_id, taken in reversed(undo):
+                                if taken > 0:
+                                    restored = self.product_manager.release_stock(
+                                        product_id, taken
+                                    )
+                                else:
+                                    restored = self.product_manager.reserve_stock(
+                                        product_id, -taken
+                                    )
+                                if not restored:
+                                    failed.append(str(product_id))
+                            if failed:
+                                raise ValueError(
+                                    f"{e}\n\nStock changes could not be rolled "
+                                    f"back for product: {', '.join(failed)}"
+                                ) from e
+                        raise
+
+                self.transaction_manager.db.run_in_transaction(apply_edit)
+                saved_id = self.transaction._id
 
                 self.logger.log_action(
                     f"Sale updated:\n"
                     f"  Transaction ID: {self.transaction._id}\n"
                     f"  Product: {product_name}\n"
-                    f"  Quantity: {quantity}\n"
+                    f"  Quantity: {old_quantity} → {quantity}\n"
                     f"  Total: {total}\n"
                     f"  Capital: {total_capital}\n"
-                    f"  Profit: {profit}\n"
-                    f"  Stock: {available_stock} → {selected_product.stock}"
+                    f"  Profit: {profit}"
                 )
 
             else:
                 # Mode Add New
-                if quantity > selected_product.stock:
-                    raise ValueError(
-                        f"Insufficient stock!\n"
-                        f"Requested: {quantity}\n"
-                        f"Available: {selected_product.stock}"
-                    )
-
                 transaction = Transaction(
                     product_id=selected_product._id,
                     product_name=product_name,
@@ -236,26 +287,42 @@ class SaleDialog(QDialog):
                     date=sale_date,
                 )
 
-                old_stock = selected_product.stock
-                selected_product.stock -= quantity
-
-                if not self.transaction_manager.create_transaction(transaction):
-                    raise ValueError("Failed to create transaction")
+                def apply_sale(session):
+                    # Stok dikurangi atomik hanya jika stok >= quantity
+                    product = self.product_manager.reserve_stock(
+                        selected_product._id, quantity, session=session
+                    )
+                    if not product:
+                        raise self.insufficient_stock_error(
+                            selected_product._id, quantity
+                        )
 
-                if not self.product_manager.update_product(selected_product):
-                    self.transaction_manager.delete_transaction(transaction._id)
-                    raise ValueError("Failed to update product stock")
+                    if not self.transaction_manager.create_transaction(
+                        transaction, session=session
+                    ):
+                        if session is None and not self.product_manager.release_stock(
+                            selected_product._id, quantity
+                        ):
+                            raise ValueError(
+                                "Failed to create transaction, and the reserved "
+                                "stock could not be restored"
+                            )
+                        raise ValueError("Failed to create transaction")
+                    return product
+
+                product = self.transaction_manager.db.run_in_transaction(apply_sale)
+                saved_id = transaction._id
 
                 self.logger.log_action(
                     f"New sale recorded:\n"
                     f"  Product: {product_name}\n"
                     f"  Quantity: {quantity}\n"
                     f"  Total: {total}\n"
-                    f"  Stock: {old_stock} → {selected_product.stock}"
+                    f"  Stock: {product.stock + quantity} → {product.stock}"
                 )
 
             if self.refresh_callback:
-                self.refresh_callback()
+                self.refresh_callback([saved_id])
 
             QMessageBox.information(
                 self,
@@ -273,12 +340,19 @@ class SaleDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
 
+    def insufficient_stock_error(self, product_id, requested, reserved=0):
+        product = self.product_manager.get_product_by_id(product_id)
+        available = (product.stock if product else 0) + reserved
+        return ValueError(
+            f"Insufficient stock!\n"
+            f"Requested: {requested}\n"
+            f"Available: {available}"
+        )
+
     def update_profit_preview(self):
         try:
             product_name = self.product_combo.currentText()
-            selected_product = next(
-                (p for p in self.products if p.name == product_name), None
-            )
+            selected_product = self.catalog.find_by_name(product_name)
             quantity = int(self.quantity_entry.text() or "0")
 
             if selected_product:
@@ -297,9 +371,7 @@ class SaleDialog(QDialog):
             self.profit_preview.setText("")
 
     def update_stock_info(self, product_name):
-        selected_product = next(
-            (p for p in self.products if p.name == product_name), None
-        )
+        selected_product = self.catalog.find_by_name(product_name)
 
         if selected_product:
             current_stock = selected_product.stock
@@ -21,6 +21,7 @@ from src.ui.tabs.sales_tab import SalesTab
 from src.ui.tabs.summary_tab import SummaryTab
 from src.ui.tabs.chart_tab import ChartTab
 from src.utils.calculate_totals import calculate_totals
+from src.utils.data_loader import DataLoader
 from PySide6.QtGui import QGuiApplication
 from src.style_config import Theme
 from src.utils.menu_bar import MenuBar
@@ -35,6 +36,7 @@ class MainWindow(QMainWindow):
         self.product_manager = ProductManager()
         self.transaction_manager = TransactionManager()
         self.config = Config()
+        self.loader = DataLoader(self)
 
         self.is_dark_mode = Theme.detect_system_theme()
 
@@ -229,7 +231,28 @@ class MainWindow(QMainWindow):
         self.refresh_sidebar_totals()
 
     def refresh_sidebar_totals(self):
-        transactions = self.transaction_manager.get_all_transactions()
+        for label in (
+            self.totalSales,
+            self.totalThisMonth,
+            self.totalToday,
+            self.totalProfit,
+            self.profitThisMonth,
+            self.profitToday,
+        ):
+            label.setText("Loading...")
+
+        self.loader.submit(
+            "sidebar_totals", self.load_sidebar_totals, self.show_sidebar_totals
+        )
+
+    def load_sidebar_totals(self, job):
+        totals = self.transaction_manager.get_sales_totals()
+        if totals is None:
+            # Fallback ke perhitungan di Python jika aggregation gagal
+            totals = calculate_totals(self.transaction_manager.get_all_transactions())
+        return totals
+
+    def show_sidebar_totals(self, totals):
         (
             total_all_sales,
             total_this_month,
@@ -237,7 +260,7 @@ class MainWindow(QMainWindow):
             total_all_profit,
             profit_this_month,
             profit_today,
-        ) = calculate_totals(transactions)
+        ) = totals
 
         self.totalSales.setText(f"Rp {total_all_sales:,.2f}")
         self.totalThisMonth.setText(f"Rp {total_this_month:,.2f}")
@@ -267,13 +290,21 @@ class MainWindow(QMainWindow):
         notebook.addTab(self.summary_tab, "Summary")
         notebook.addTab(self.chart_tab, "Charts")
 
-    def refresh_all(self):
+    def refresh_all(self, changed_ids=None):
         if hasattr(self, "product_tab"):
             self.product_tab.refresh_product_list()
         if hasattr(self, "sales_tab"):
-            self.sales_tab.refresh_sales_list()
+            self.sales_tab.refresh_sales_list(changed_ids)
         if hasattr(self, "chart_tab"):
-            self.chart_tab.update_chart()
+            self.chart_tab.refresh_chart()
+
+    def reload_all(self):
+        """Refresh everything, including caches of data from past years"""
+        if hasattr(self, "chart_tab"):
+            self.chart_tab.clear_cache()
+        # Refresh biasa memakai catalog di memori selama PROBE_INTERVAL
+        self.product_manager.catalog.expire()
+        self.refresh_all()
 
     def logout(self):
         reply = QMessageBox.question(
@@ -1,15 +1,29 @@
-from PySide6.QtCore import Qt, QAbstractTableModel
-
-
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor
+from src.ui.models.row_table_model import RowTableModel
+
+RESTOCK_COLOR = QColor("red")
+
 
+def format_product(product) -> tuple:
+    if product.stock < 3:
+        stock = f"{product.stock} (Need Restock)"
+    else:
+        stock = str(product.stock)
 
-class ProductTableModel(QAbstractTableModel):
+    return (
+        str(product._id),
+        product.name,
+        f"Rp{product.price:,}",
+        f"Rp{product.capital:,}",
+        stock,
+    )
+
+
+class ProductTableModel(RowTableModel):
     def __init__(self, products=None, parent=None):
-        super().__init__(parent)
+        super().__init__(format_product, products, parent)
         self.parent = parent
-        self._products = products or []
         self._headers = [
             "ID",
             "Name",
@@ -18,9 +32,6 @@ class ProductTableModel(QAbstractTableModel):
             "Stock",
         ]
 
-    def rowCount(self, parent=None):
-        return len(self._products)
-
     def columnCount(self, parent=None):
         return len(self._headers)
 
@@ -30,27 +41,14 @@ class ProductTableModel(QAbstractTableModel):
 
         row = index.row()
         col = index.column()
-        product = self._products[row]
 
         if role == Qt.DisplayRole:
-            if col == 0:
-                return str(product._id)
-            elif col == 1:
-                return product.name
-            elif col == 2:
-                return f"Rp{product.price:,}"
-            elif col == 3:
-                return f"Rp{product.capital:,}"
-            elif col == 4:
-                if product.stock < 3:
-                    return f"{product.stock} (Need Restock)"
-                else:
-                    return str(product.stock)
+            return self._display[row][col]
 
         elif role == Qt.ForegroundRole:
             if col == 4:
-                if product.stock < 3:
-                    return QColor("red")
+                if self._rows[row].stock < 3:
+                    return RESTOCK_COLOR
 
         return None
 
@@ -0,0 +1,57 @@
+class ListSource:
+    """Serves rows of an in-memory sequence block by block.
+
+    ``position`` is the index of the first requested row, for ``fetch_before``
+    the index of ``before``.
+    """
+
+    def __init__(self, rows, convert=None):
+        self.rows = rows
+        self.convert = convert
+
+    def fetch(self, limit, on_rows, after=None, position=0):
+        self._deliver(self.rows[position : position + limit], on_rows)
+
+    def fetch_before(self, limit, on_rows, before, position):
+        self._deliver(self.rows[max(position - limit, 0) : position], on_rows)
+
+    def _deliver(self, block, on_rows):
+        on_rows(self.convert(block) if self.convert else list(block))
+
+
+class TransactionCursorSource:
+    """Pulls neighbouring transactions with a keyset query on a worker thread.
+
+    The query seeks from the row next to the requested block, positions are
+    not used.
+    """
+
+    def __init__(self, transaction_manager, loader, sort_option, search_text=""):
+        self.transaction_manager = transaction_manager
+        self.loader = loader
+        self.sort_option = sort_option
+        self.search_text = search_text
+
+    def fetch(self, limit, on_rows, after=None, position=0):
+        cursor = None
+        if after is not None:
+            cursor = self.transaction_manager.page_cursor(after, self.sort_option)
+        self._load({"limit": limit, "after": cursor}, on_rows)
+
+    def fetch_before(self, limit, on_rows, before, position):
+        cursor = self.transaction_manager.page_cursor(before, self.sort_option)
+        self._load({"limit": limit, "before": cursor}, on_rows)
+
+    def _load(self, query, on_rows):
+        query.update(sort_option=self.sort_option, search_text=self.search_text)
+
+        def on_error(message):
+            print(f"Error fetching transactions: {message}")
+            on_rows([])
+
+        self.loader.submit(
+            "fetch_more",
+            lambda job: self.transaction_manager.get_transactions_page(**query),
+            on_rows,
+            on_error,
+        )
@@ -0,0 +1,263 @@
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QItemSelection,
+    QItemSelectionModel,
+    QModelIndex,
+    QObject,
+)
+from PySide6.QtWidgets import QAbstractItemView
+
+
+class RowTableModel(QAbstractTableModel):
+    """Long-lived table model over a list of rows.
+
+    Rows are either replaced in one go with ``set_rows`` or pulled in blocks
+    from a row source with ``set_source``, in which case the view asks for the
+    next block through ``canFetchMore``/``fetchMore`` while scrolling. At most
+    ``MAX_ROWS`` source rows are kept: rows far above the viewport are evicted
+    and fetched again with ``fetchPrevious`` when the view scrolls back up
+    (see RowViewKeeper).
+
+    Display strings are formatted once per row by the ``display_row``
+    callable when rows are loaded, so ``data()`` only does a lookup on
+    repaint. Rows must not be mutated in place afterwards, models are given
+    copies (see ProductCatalog) and get new rows when the data changes.
+    """
+
+    FETCH_SIZE = 100
+    MAX_ROWS = 1000
+
+    def __init__(self, display_row, rows=None, parent=None):
+        super().__init__(parent)
+        # Mengembalikan teks setiap kolom untuk satu baris
+        self.display_row = display_row
+        self._rows = list(rows or [])
+        self._display = [self.display_row(item) for item in self._rows]
+        self._source = None
+        self._fetching = False
+        # Posisi baris pertama di source, baris sebelumnya sudah dikeluarkan
+        self._offset = 0
+        self._has_more = False
+        self._has_previous = False
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._display = [self.display_row(item) for item in self._rows]
+        self._reset_source(None)
+        self.endResetModel()
+
+    def set_source(self, source):
+        self.beginResetModel()
+        self._rows = []
+        self._display = []
+        self._reset_source(source)
+        self.endResetModel()
+        # Blok pertama langsung dimuat tanpa menunggu view
+        self.fetchMore()
+
+    def _reset_source(self, source):
+        self._source = source
+        self._fetching = False
+        self._offset = 0
+        self._has_more = source is not None
+        self._has_previous = False
+
+    def row_id(self, row):
+        return self._rows[row]._id
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._source is None:
+            return False
+        return self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        source = self._source
+        source.fetch(
+            self.FETCH_SIZE,
+            lambda rows: self.append_rows(rows, source),
+            self._rows[-1] if self._rows else None,
+            self._offset + len(self._rows),
+        )
+
+    def canFetchPrevious(self):
+        return self._source is not None and self._has_previous and not self._fetching
+
+    def fetchPrevious(self):
+        if not self.canFetchPrevious():
+            return
+        self._fetching = True
+        source = self._source
+        source.fetch_before(
+            self.FETCH_SIZE,
+            lambda rows: self.prepend_rows(rows, source),
+            self._rows[0],
+            self._offset,
+        )
+
+    def append_rows(self, rows, source):
+        # Blok dari source lama (sebelum reset) diabaikan
+        if source is not self._source:
+            return
+        self._fetching = False
+        self._has_more = len(rows) == self.FETCH_SIZE
+        if not rows:
+            return
+
+        display = [self.display_row(item) for item in rows]
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._display.extend(display)
+        self.endInsertRows()
+
+        excess = len(self._rows) - self.MAX_ROWS
+        if excess > 0:
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            del self._rows[:excess]
+            del self._display[:excess]
+            self._offset += excess
+            self._has_previous = True
+            self.endRemoveRows()
+
+    def prepend_rows(self, rows, source):
+        if source is not self._source:
+            return
+        self._fetching = False
+        # Data bisa berubah sejak dikeluarkan, blok pendek berarti awal source
+        self._has_previous = len(rows) == self.FETCH_SIZE and self._offset > len(rows)
+        if not rows:
+            return
+
+        display = [self.display_row(item) for item in rows]
+        self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+        self._rows[:0] = rows
+        self._display[:0] = display
+        self._offset = max(self._offset - len(rows), 0)
+        self.endInsertRows()
+
+        excess = len(self._rows) - self.MAX_ROWS
+        if excess > 0:
+            first = len(self._rows) - excess
+            self.beginRemoveRows(QModelIndex(), first, len(self._rows) - 1)
+            del self._rows[first:]
+            del self._display[first:]
+            self._has_more = True
+            self.endRemoveRows()
+
+
+class RowViewKeeper(QObject):
+    """Keeps a view over a RowTableModel steady while its rows change.
+
+    Selected rows are selected again by ``_id`` after a reset or eviction, as
+    soon as they are loaded again. When rows above the viewport are evicted
+    or fetched back the scroll position is moved so the same rows stay in
+    view, and scrolling to the top fetches the evicted rows.
+    """
+
+    def __init__(self, view, model):
+        super().__init__(view)
+        self.view = view
+        self.model = model
+        self.pending = set()
+        self.restoring = False
+        self.scroll_value = None
+
+        # Terhubung sebelum setModel, jadi pilihan dibaca sebelum selection
+        # model milik view membuang baris yang dihapus
+        model.modelAboutToBeReset.connect(self.remember_selection)
+        model.rowsAboutToBeRemoved.connect(self.before_remove)
+        model.rowsRemoved.connect(self.after_remove)
+        model.rowsAboutToBeInserted.connect(self.before_insert)
+        model.rowsInserted.connect(self.after_insert)
+        view.setModel(model)
+        # Setelah setModel, pilihan dipulihkan sesudah selection model di-reset
+        model.modelReset.connect(self.restore_all)
+        view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        view.verticalScrollBar().valueChanged.connect(self.on_scroll)
+
+    def selected_ids(self, first=0, last=None):
+        if self.view.selectionModel() is None:
+            return set()
+        rows = (index.row() for index in self.view.selectionModel().selectedRows())
+        return {
+            self.model.row_id(row)
+            for row in rows
+            if row >= first and (last is None or row <= last)
+        }
+
+    def remember_selection(self):
+        # Pilihan yang belum sempat dipulihkan tetap diingat
+        self.pending |= self.selected_ids()
+
+    def on_selection_changed(self, selected, deselected):
+        # Pilihan baru dari user menggantikan pilihan yang diingat
+        if not self.restoring and selected.indexes():
+            self.pending = set()
+
+    def restore_all(self):
+        self.restore(0, self.model.rowCount() - 1)
+
+    def restore(self, first, last):
+        if not self.pending:
+            return
+        selection = QItemSelection()
+        for row in range(first, last + 1):
+            if self.model.row_id(row) in self.pending:
+                self.pending.discard(self.model.row_id(row))
+                selection.select(self.model.index(row, 0), self.model.index(row, 0))
+        if selection.isEmpty():
+            return
+        self.restoring = True
+        self.view.selectionModel().select(
+            selection, QItemSelectionModel.Select | QItemSelectionModel.Rows
+        )
+        self.restoring = False
+
+    def row_step(self):
+        if self.view.verticalScrollMode() == QAbstractItemView.ScrollPerItem:
+            return 1
+        return self.view.verticalHeader().defaultSectionSize()
+
+    def before_remove(self, parent, first, last):
+        self.pending |= self.selected_ids(first, last)
+        selection_model = self.view.selectionModel()
+        current = selection_model.currentIndex() if selection_model else None
+        if current is not None and first <= current.row() <= last:
+            # Kalau tidak, view menggulir ke baris pengganti current index
+            selection_model.setCurrentIndex(
+                QModelIndex(), QItemSelectionModel.NoUpdate
+            )
+        if first == 0:
+            self.scroll_value = self.view.verticalScrollBar().value()
+
+    def after_remove(self, parent, first, last):
+        if first == 0 and self.scroll_value is not None:
+            removed = (last - first + 1) * self.row_step()
+            self.view.verticalScrollBar().setValue(max(self.scroll_value - removed, 0))
+        self.scroll_value = None
+
+    def before_insert(self, parent, first, last):
+        # Baris pertama dari blok pertama tidak menggeser apa pun
+        if first == 0 and self.model.rowCount():
+            self.scroll_value = self.view.verticalScrollBar().value()
+
+    def after_insert(self, parent, first, last):
+        if self.scroll_value is not None:
+            inserted = (last - first + 1) * self.row_step()
+            scroll_bar = self.view.verticalScrollBar()
+            # Range scroll bar baru diperbarui saat layout berikutnya
+            scroll_bar.setMaximum(scroll_bar.maximum() + inserted)
+            scroll_bar.setValue(self.scroll_value + inserted)
+            self.scroll_value = None
+        self.restore(first, last)
+
+    def on_scroll(self, value):
+        if value == self.view.verticalScrollBar().minimum():
+            self.model.fetchPrevious()
@@ -1,13 +1,21 @@
-from PySide6.QtCore import Qt, QAbstractTableModel
+from PySide6.QtCore import Qt
+from src.ui.models.row_table_model import RowTableModel
 
 
-class SalesTableModel(QAbstractTableModel):
-    def __init__(self, transactions=None, parent=None):
-        super().__init__(parent)
-        self._transactions = transactions or []
+def format_transaction(transaction) -> tuple:
+    return (
+        str(transaction._id),
+        transaction.date.strftime("%Y-%m-%d"),
+        transaction.product_name,
+        str(transaction.quantity),
+        f"Rp{transaction.total:,}",
+        f"Rp{transaction.profit:,}",
+    )
+
 
-    def rowCount(self, parent=None):
-        return len(self._transactions)
+class SalesTableModel(RowTableModel):
+    def __init__(self, transactions=None, parent=None):
+        super().__init__(format_transaction, transactions, parent)
 
     def columnCount(self, parent=None):
         return 6
@@ -16,23 +24,8 @@ class SalesTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        row = index.row()
-        col = index.column()
-        transaction = self._transactions[row]
-
         if role == Qt.DisplayRole:
-            if col == 0:
-                return str(transaction._id)
-            elif col == 1:
-                return transaction.date.strftime("%Y-%m-%d")
-            elif col == 2:
-                return transaction.product_name
-            elif col == 3:
-                return str(transaction.quantity)
-            elif col == 4:
-                return f"Rp{transaction.total:,}"
-            elif col == 5:
-                return f"Rp{transaction.profit:,}"
+            return self._display[index.row()][index.column()]
         return None
 
     def headerData(self, section, orientation, role):
@@ -6,26 +6,53 @@ from PySide6.QtWidgets import (
     QFrame,
     QLabel,
     QSizePolicy,
+    QDateEdit,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QDate, QPointF
 from PySide6.QtCharts import (
     QChart,
     QChartView,
+    QLineSeries,
     QSplineSeries,
     QValueAxis,
     QDateTimeAxis,
 )
 from PySide6.QtGui import QPainter
-from datetime import datetime
-from collections import defaultdict
+from datetime import datetime, timedelta
+import numpy as np
 
+from src.database.codecs import to_decimal
 from src.style_config import Theme
+from src.utils.data_loader import DataLoader
+from src.utils.downsample import DAY_MS, lttb, weekly_sums
+
+EPOCH = datetime(1970, 1, 1)
 
 
 class ChartTab(QWidget):
+    # (label, number of years shown up to the selected year)
+    VIEW_OPTIONS = [
+        ("Single Year", 1),
+        ("Compare Last 3 Years", 3),
+        ("Compare Last 5 Years", 5),
+    ]
+    # (label, granularity), monthly memakai pilihan tahun di atas
+    GRANULARITY_OPTIONS = [
+        ("Monthly", "monthly"),
+        ("Weekly", "weekly"),
+        ("Daily", "daily"),
+    ]
+    # Above this many points per series animations make the chart sluggish
+    ANIMATION_POINT_LIMIT = 500
+    # Lower bound of points kept after downsampling, before the view has a size
+    MIN_CHART_POINTS = 200
+
     def __init__(self, parent, transaction_manager):
         super().__init__(parent)
         self.transaction_manager = transaction_manager
+        # year -> {month: {"revenue", "profit"}}, tahun lalu tidak berubah lagi
+        self.monthly_cache = {}
+        self.loader = DataLoader(self)
         self.setup_ui()
 
     def setup_ui(self):
@@ -83,7 +110,82 @@ class ChartTab(QWidget):
 
         year_layout.addWidget(year_label)
         year_layout.addWidget(self.year_combo)
+
+        # Granularity Selection
+        granularity_widget = QFrame()
+        granularity_widget.setStyleSheet("border: none;")
+        granularity_layout = QVBoxLayout(granularity_widget)
+
+        granularity_label = QLabel("Granularity")
+        granularity_label.setStyleSheet(
+            f"color: {colors['text_secondary']}; font-size: 13px;"
+        )
+
+        self.granularity_combo = QComboBox()
+        for label, granularity in self.GRANULARITY_OPTIONS:
+            self.granularity_combo.addItem(label, granularity)
+        self.granularity_combo.setStyleSheet(self.year_combo.styleSheet())
+        self.granularity_combo.currentIndexChanged.connect(
+            self.on_granularity_changed
+        )
+
+        granularity_layout.addWidget(granularity_label)
+        granularity_layout.addWidget(self.granularity_combo)
+        control_layout.addWidget(granularity_widget)
         control_layout.addWidget(year_widget)
+        self.year_widget = year_widget
+
+        # Date Range Selection, hanya untuk weekly/daily
+        self.range_widget = QFrame()
+        self.range_widget.setStyleSheet("border: none;")
+        range_layout = QHBoxLayout(self.range_widget)
+        range_layout.setContentsMargins(0, 0, 0, 0)
+
+        today = QDate.currentDate()
+        self.start_date_edit = QDateEdit(today.addYears(-1))
+        self.end_date_edit = QDateEdit(today)
+        for label_text, date_edit in (
+            ("From", self.start_date_edit),
+            ("To", self.end_date_edit),
+        ):
+            date_widget = QFrame()
+            date_layout = QVBoxLayout(date_widget)
+            date_label = QLabel(label_text)
+            date_label.setStyleSheet(
+                f"color: {colors['text_secondary']}; font-size: 13px;"
+            )
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("dd MMM yyyy")
+            date_edit.setStyleSheet(
+                f"background-color: {colors['background']}; "
+                f"border: 1px solid {colors['border']}; border-radius: 4px; "
+                f"padding: 5px; color: {colors['text_primary']};"
+            )
+            date_edit.dateChanged.connect(self.update_chart)
+            date_layout.addWidget(date_label)
+            date_layout.addWidget(date_edit)
+            range_layout.addWidget(date_widget)
+        self.range_widget.hide()
+        control_layout.addWidget(self.range_widget)
+
+        # View Selection
+        view_widget = QFrame()
+        view_widget.setStyleSheet("border: none;")
+        view_layout = QVBoxLayout(view_widget)
+
+        view_label = QLabel("View")
+        view_label.setStyleSheet(f"color: {colors['text_secondary']}; font-size: 13px;")
+
+        self.view_combo = QComboBox()
+        for label, year_count in self.VIEW_OPTIONS:
+            self.view_combo.addItem(label, year_count)
+        self.view_combo.setStyleSheet(self.year_combo.styleSheet())
+        self.view_combo.currentIndexChanged.connect(self.update_chart)
+
+        view_layout.addWidget(view_label)
+        view_layout.addWidget(self.view_combo)
+        control_layout.addWidget(view_widget)
+        self.view_widget = view_widget
         control_layout.addStretch()
 
         control_chart_layout.addLayout(control_layout)
@@ -134,25 +236,173 @@ class ChartTab(QWidget):
 
         return chart_view
 
+    def selected_years(self):
+        last_year = int(self.year_combo.currentText())
+        year_count = self.view_combo.currentData()
+        return list(range(last_year - year_count + 1, last_year + 1))
+
+    def on_granularity_changed(self):
+        monthly = self.granularity_combo.currentData() == "monthly"
+        self.year_widget.setVisible(monthly)
+        self.view_widget.setVisible(monthly)
+        self.range_widget.setVisible(not monthly)
+        self.update_chart()
+
+    def set_animation(self, point_count):
+        """Animate only small series, large ones redraw without animation"""
+        chart = self.chart_view.chart()
+        if point_count > self.ANIMATION_POINT_LIMIT:
+            chart.setAnimationOptions(QChart.NoAnimation)
+        else:
+            chart.setAnimationOptions(QChart.SeriesAnimations)
+
     def update_chart(self):
-        colors = Theme.get_theme_colors()
-        selected_year = int(self.year_combo.currentText())
+        if self.granularity_combo.currentData() != "monthly":
+            self.update_range_chart()
+            return
+
+        years = self.selected_years()
+        missing = [year for year in years if year not in self.monthly_cache]
+        if not missing:
+            # Semua tahun sudah ada di cache, tidak perlu query
+            self.loader.cancel("chart")
+            self.show_chart(years)
+            return
+
+        self.chart_view.chart().setTitle(f"{self.chart_title(years)} (Loading...)")
+        first_year, last_year = min(missing), max(missing)
+        self.loader.submit(
+            "chart",
+            lambda job: self.transaction_manager.daily_sales.monthly_totals(
+                first_year, last_year
+            ),
+            lambda totals: self.on_monthly_totals_loaded(
+                first_year, last_year, totals
+            ),
+        )
 
-        # Get transactions for the selected year
-        start_date = datetime(selected_year, 1, 1)
-        end_date = datetime(selected_year, 12, 31)
-        transactions = self.transaction_manager.get_transactions_by_date_range(
-            start_date, end_date
+    def on_monthly_totals_loaded(self, first_year, last_year, totals):
+        if totals is None:
+            self.chart_view.chart().setTitle("Failed to load sales data")
+            return
+        for year in range(first_year, last_year + 1):
+            self.monthly_cache[year] = totals.get(year, {})
+        self.update_chart()
+
+    def update_range_chart(self):
+        granularity = self.granularity_combo.currentData()
+        start = self.start_date_edit.date().toPython()
+        end = self.end_date_edit.date().toPython()
+        start, end = min(start, end), max(start, end)
+        # Satu titik per piksel sudah cukup, sisanya tidak terlihat
+        threshold = max(
+            int(self.chart_view.chart().plotArea().width()), self.MIN_CHART_POINTS
+        )
+
+        self.chart_view.chart().setTitle(
+            f"{self.range_title(granularity, start, end)} (Loading...)"
+        )
+        self.loader.submit(
+            "chart",
+            lambda job: self.range_series(granularity, start, end, threshold),
+            lambda series: self.show_range_chart(granularity, start, end, series),
+        )
+
+    def range_series(self, granularity, start, end, threshold):
+        """Daily or weekly revenue/profit downsampled to ``threshold`` points.
+
+        Runs on the worker thread. Returns ``{name: (x_ms, y)}`` with x in
+        local epoch milliseconds, as QDateTimeAxis expects.
+        """
+        days = self.transaction_manager.daily_sales.daily_totals(start, end)
+        x = np.array(
+            [(day["date"] - EPOCH).days * DAY_MS for day in days], dtype=np.int64
+        )
+        revenue = np.array(
+            [float(to_decimal(day["revenue"])) for day in days], dtype=np.float64
+        )
+        profit = np.array(
+            [float(to_decimal(day["profit"])) for day in days], dtype=np.float64
+        )
+        if granularity == "weekly":
+            x, revenue, profit = weekly_sums(x, revenue, profit)
+
+        series = {}
+        for name, y in (("revenue", revenue), ("profit", profit)):
+            kept_x, kept_y = lttb(x, y, threshold)
+            # Tanggal rollup disimpan sebagai UTC tengah malam, tampilkan lokal
+            local_x = [
+                datetime.timestamp(EPOCH + timedelta(milliseconds=int(ms))) * 1000
+                for ms in kept_x
+            ]
+            series[name] = (local_x, kept_y.tolist())
+        return series
+
+    def range_title(self, granularity, start, end):
+        label = "Weekly" if granularity == "weekly" else "Daily"
+        return (
+            f"{label} Sales Profit and Revenue - "
+            f"{start:%d %b %Y} to {end:%d %b %Y}"
+        )
+
+    def show_range_chart(self, granularity, start, end, data):
+        colors = Theme.get_theme_colors()
+        chart = self.chart_view.chart()
+        chart.removeAllSeries()
+        chart.legend().setVisible(True)
+        chart.legend().setLabelColor(colors["text_primary"])
+
+        point_count = max(len(x) for x, _ in data.values())
+        self.set_animation(point_count)
+
+        label = "Weekly" if granularity == "weekly" else "Daily"
+        min_value, max_value = 0.0, 0.0
+        for name, (x, y) in (("Profit", data["profit"]), ("Revenue", data["revenue"])):
+            series = QLineSeries()
+            series.setName(f"{label} {name}")
+            # Satu kali replace(), bukan append() per titik
+            series.replace([QPointF(px, py) for px, py in zip(x, y)])
+            chart.addSeries(series)
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
+            if y:
+                min_value = min(min_value, min(y))
+                max_value = max(max_value, max(y))
+
+        span_days = (end - start).days
+        axis_start = start
+        if granularity == "weekly":
+            # Titik minggu pertama ada di hari Senin sebelum tanggal awal
+            axis_start = start - timedelta(days=start.weekday())
+        self.axis_x.setFormat("MMM yyyy" if span_days > 180 else "dd MMM")
+        self.axis_x.setRange(
+            datetime.combine(axis_start, datetime.min.time()),
+            datetime.combine(end, datetime.min.time()),
         )
+        self.axis_y.setRange(min_value, max_value * 1.1 if max_value else 1)
+        chart.setTitle(self.range_title(granularity, start, end))
+
+    def refresh_chart(self):
+        """Reload after a data change, an edit or delete can touch any year"""
+        self.clear_cache()
+        self.update_chart()
+
+    def clear_cache(self):
+        self.monthly_cache.clear()
 
-        # Group transactions by month
-        monthly_profits = defaultdict(float)
-        monthly_revenue = defaultdict(float)
+    def chart_title(self, years):
+        if len(years) == 1:
+            return f"Monthly Sales Profit and Revenue - {years[0]}"
+        return f"Monthly Revenue - {years[0]} to {years[-1]}"
 
-        for transaction in transactions:
-            month = transaction.date.month
-            monthly_profits[month] += float(transaction.profit)
-            monthly_revenue[month] += float(transaction.total)
+    def show_chart(self, years):
+        if len(years) > 1:
+            self.show_comparison_chart(years)
+            return
+
+        colors = Theme.get_theme_colors()
+        selected_year = years[0]
+        monthly_totals = self.monthly_cache[selected_year]
 
         # Create series
         profit_series = QSplineSeries()
@@ -165,24 +415,33 @@ class ChartTab(QWidget):
         min_value = float("inf")
         max_value = float("-inf")
 
+        profit_points = []
+        revenue_points = []
         for month in range(1, 13):
             date = datetime(selected_year, month, 15)
             timestamp = int(datetime.timestamp(date) * 1000)
-            profit_value = monthly_profits.get(month, 0)
-            revenue_value = monthly_revenue.get(month, 0)
+            totals = monthly_totals.get(month, {})
+            profit_value = float(totals.get("profit", 0))
+            revenue_value = float(totals.get("revenue", 0))
 
-            profit_series.append(timestamp, profit_value)
-            revenue_series.append(timestamp, revenue_value)
+            profit_points.append(QPointF(timestamp, profit_value))
+            revenue_points.append(QPointF(timestamp, revenue_value))
 
             min_value = min(min_value, profit_value, revenue_value)
             max_value = max(max_value, profit_value, revenue_value)
 
+        profit_series.replace(profit_points)
+        revenue_series.replace(revenue_points)
+
         # Ensure minimum value is non-negative
         min_value = min(min_value, 0)
 
         # Update chart
         chart = self.chart_view.chart()
         chart.removeAllSeries()
+        self.set_animation(len(profit_points))
+        self.axis_x.setFormat("MMM")
+        chart.legend().setVisible(False)
         chart.addSeries(profit_series)
         chart.addSeries(revenue_series)
 
@@ -198,7 +457,7 @@ class ChartTab(QWidget):
         revenue_series.attachAxis(self.axis_x)
         revenue_series.attachAxis(self.axis_y)
 
-        chart.setTitle(f"Monthly Sales Profit and Revenue - {selected_year}")
+        chart.setTitle(self.chart_title(years))
         # Customize Y-axis appearance
         self.axis_y.setLabelsColor(colors["text_primary"])
 
@@ -206,7 +465,39 @@ class ChartTab(QWidget):
         self.axis_y.setTickCount(11)
         self.axis_y.setMinorTickCount(4)
 
-        # print("Transactions:", transactions)
-        # print("Monthly Profits:", dict(monthly_profits))
-        # print("Monthly Revenue:", dict(monthly_revenue))
         # print(f"Min Value: {min_value}, Max Value: {max_value}")
+
+    def show_comparison_chart(self, years):
+        """One revenue line per year, drawn over the months of the last year"""
+        colors = Theme.get_theme_colors()
+        chart = self.chart_view.chart()
+        chart.removeAllSeries()
+        chart.legend().setVisible(True)
+        chart.legend().setLabelColor(colors["text_primary"])
+        self.set_animation(12)
+        self.axis_x.setFormat("MMM")
+
+        reference_year = years[-1]
+        max_value = 0.0
+        for year in years:
+            series = QSplineSeries()
+            series.setName(str(year))
+            monthly_totals = self.monthly_cache[year]
+            points = []
+            for month in range(1, 13):
+                # Semua tahun digambar di sumbu bulan yang sama
+                date = datetime(reference_year, month, 15)
+                value = float(monthly_totals.get(month, {}).get("revenue", 0))
+                points.append(QPointF(int(datetime.timestamp(date) * 1000), value))
+                max_value = max(max_value, value)
+            series.replace(points)
+
+            chart.addSeries(series)
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
+
+        self.axis_x.setRange(
+            datetime(reference_year, 1, 1), datetime(reference_year, 12, 31)
+        )
+        self.axis_y.setRange(0, max_value * 1.1 if max_value else 1)
+        chart.setTitle(self.chart_title(years))
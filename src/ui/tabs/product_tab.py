@@ -12,23 +12,32 @@ from PySide6.QtWidgets import (
     QComboBox,
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, QTimer
 from bson import ObjectId
 from src.style_config import Theme
 from src.ui.dialogs.product_dialog import ProductDialog
 from src.ui.models.product_table_model import ProductTableModel
+from src.ui.models.row_sources import ListSource
+from src.ui.models.row_table_model import RowViewKeeper
+from src.utils.data_loader import DataLoader
 from src.utils.pagination import PaginationWidget
 
 
 class ProductTab(QWidget):
+    SEARCH_DELAY_MS = 300
+
     def __init__(self, parent, product_manager, logger):
         super().__init__(parent)
         self.product_manager = product_manager
         self.logger = logger
         self.user = parent.user
         self.cached_products = []
+        self.sorted_products = []
         self.filtered_products = []
-        self.cached_products = self.product_manager.get_all_products()
+        self.last_search = None
+        # Versi catalog dari produk yang sedang ditampilkan
+        self.catalog_version = None
+        self.loader = DataLoader(self)
         self.setup_ui()
         self.refresh_product_list()
 
@@ -58,9 +67,15 @@ class ProductTab(QWidget):
             }}
             """
         )
-        self.search_entry.textChanged.connect(self.refresh_product_list)
         control_layout.addWidget(self.search_entry)
 
+        # Pencarian baru dijalankan setelah user berhenti mengetik
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_entry.textChanged.connect(self.search_timer.start)
+
         self.sort_combobox = QComboBox()
         self.sort_combobox.addItems(
             [
@@ -86,9 +101,16 @@ class ProductTab(QWidget):
             }}
             """
         )
-        self.sort_combobox.currentIndexChanged.connect(self.refresh_product_list)
+        self.sort_combobox.currentIndexChanged.connect(self.apply_sort)
         control_layout.addWidget(self.sort_combobox)
 
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet(
+            f"color: {colors['text_secondary']}; padding: 5px"
+        )
+        self.loading_label.hide()
+        control_layout.addWidget(self.loading_label)
+
         # Product Table
         self.product_table = QTableView()
         self.product_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -96,6 +118,9 @@ class ProductTab(QWidget):
         self.product_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.product_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.product_table.customContextMenuRequested.connect(self.show_context_menu)
+        self.model = ProductTableModel(parent=self)
+        # Pilihan dan posisi scroll tetap saat baris dimuat ulang
+        self.view_keeper = RowViewKeeper(self.product_table, self.model)
         # self.product_table.setStyleSheet(
         #     f"""
         #     QTableView {{
@@ -124,33 +149,73 @@ class ProductTab(QWidget):
         main_layout.addWidget(self.pagination)
 
     def refresh_product_list(self):
-        search_text = self.search_entry.text().strip().lower()
+        self.loading_label.setText("Loading...")
+        self.loading_label.show()
+        self.loader.submit(
+            "products",
+            lambda job: self.product_manager.catalog.versioned_products(),
+            self.on_products_loaded,
+            self.on_load_error,
+        )
 
-        self.cached_products = self.product_manager.get_all_products()
+    def on_products_loaded(self, result):
+        self.loading_label.hide()
+        self.catalog_version, self.cached_products = result
+        self.apply_sort()
 
-        self.filtered_products = [
-            product
-            for product in self.cached_products
-            if search_text in product.name.lower()
-        ]
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Catalog bisa berubah dari tab atau dialog lain sejak terakhir dimuat
+        if (
+            self.catalog_version is not None
+            and self.catalog_version != self.product_manager.catalog.version
+            and not self.loader.is_loading("products")
+        ):
+            self.refresh_product_list()
+
+    def on_load_error(self, message):
+        self.loading_label.setText(f"Failed to load products: {message}")
+        self.loading_label.show()
+
+    def apply_sort(self):
+        # Filter dan sort dilakukan pada data cache, tanpa query ulang ke database
+        self.sorted_products = list(self.cached_products)
 
         sort_option = self.sort_combobox.currentIndex()
         if sort_option == 0:
-            self.filtered_products.sort(key=lambda p: p.created_at, reverse=True)
+            self.sorted_products.sort(key=lambda p: p.created_at, reverse=True)
         elif sort_option == 1:
-            self.filtered_products.sort(key=lambda p: p.created_at)
+            self.sorted_products.sort(key=lambda p: p.created_at)
         elif sort_option == 2:
-            self.filtered_products.sort(key=lambda p: p.price, reverse=True)
+            self.sorted_products.sort(key=lambda p: p.price, reverse=True)
         elif sort_option == 3:
-            self.filtered_products.sort(key=lambda p: p.price)
+            self.sorted_products.sort(key=lambda p: p.price)
         elif sort_option == 4:
-            self.filtered_products.sort(key=lambda p: p.name.lower())
+            self.sorted_products.sort(key=lambda p: p.name.lower())
         elif sort_option == 5:
-            self.filtered_products.sort(key=lambda p: p.name.lower(), reverse=True)
+            self.sorted_products.sort(key=lambda p: p.name.lower(), reverse=True)
         elif sort_option == 6:
-            self.filtered_products.sort(key=lambda p: p.stock, reverse=True)
+            self.sorted_products.sort(key=lambda p: p.stock, reverse=True)
         elif sort_option == 7:
-            self.filtered_products.sort(key=lambda p: p.stock)
+            self.sorted_products.sort(key=lambda p: p.stock)
+
+        self.last_search = None
+        self.apply_filter()
+
+    def apply_filter(self):
+        self.search_timer.stop()
+        search_text = self.search_entry.text().strip().lower()
+
+        # Query yang memperluas query sebelumnya cukup menyaring hasil sebelumnya
+        if self.last_search is not None and self.last_search in search_text:
+            candidates = self.filtered_products
+        else:
+            candidates = self.sorted_products
+
+        self.filtered_products = [
+            product for product in candidates if search_text in product.name.lower()
+        ]
+        self.last_search = search_text
 
         # Update pagination
         self.pagination.set_total_items(len(self.filtered_products))
@@ -159,6 +224,11 @@ class ProductTab(QWidget):
         self.update_current_page()
 
     def update_current_page(self):
+        if self.pagination.infinite_scroll:
+            # Baris dimuat bertahap oleh view saat di-scroll
+            self.model.set_source(ListSource(self.filtered_products))
+            return
+
         # Calculate slice indices
         start_idx = (self.pagination.current_page - 1) * self.pagination.items_per_page
         end_idx = start_idx + self.pagination.items_per_page
@@ -167,8 +237,7 @@ class ProductTab(QWidget):
         page_products = self.filtered_products[start_idx:end_idx]
 
         # Update model
-        self.model = ProductTableModel(page_products, self)
-        self.product_table.setModel(self.model)
+        self.model.set_rows(page_products)
 
     def on_page_changed(self):
         self.update_current_page()
@@ -12,15 +12,22 @@ from PySide6.QtWidgets import (
     QComboBox,
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt, QPoint
+from PySide6.QtCore import Qt, QPoint, QTimer
 from bson import ObjectId
 from src.style_config import Theme
 from src.ui.dialogs.sale_dialog import SaleDialog
+from src.ui.models.row_sources import ListSource, TransactionCursorSource
+from src.ui.models.row_table_model import RowViewKeeper
 from src.ui.models.sales_table_model import SalesTableModel
+from src.utils.data_loader import DataLoader
 from src.utils.pagination import PaginationWidget
 
 
 class SalesTab(QWidget):
+    SEARCH_DELAY_MS = 300
+    # Hasil pencarian lebih besar dari ini dicari lewat server paging
+    SNAPSHOT_LIMIT = 100_000
+
     def __init__(
         self,
         parent,
@@ -34,8 +41,18 @@ class SalesTab(QWidget):
         self.transaction_manager = transaction_manager
         self.logger = logger
         self.refresh_callback = refresh_callback
-        self.cached_transactions = []
-        self.filtered_transactions = []
+        self.page_transactions = []
+        self.loaded_page = 0
+        self.page_query = None
+        self.list_state = None
+        # Transaksi yang cocok dengan snapshot_text, disaring lagi di memori
+        self.snapshot = None
+        self.snapshot_text = None
+        self.loading_text = None
+        self.changed_ids = set()
+        self.sort_orders = {}
+        self.search_result = None
+        self.loader = DataLoader(self)
         self.setup_ui()
         self.refresh_sales_list()
 
@@ -65,9 +82,15 @@ class SalesTab(QWidget):
             }}
             """
         )
-        self.search_entry.textChanged.connect(self.refresh_sales_list)
         control_layout.addWidget(self.search_entry)
 
+        # Pencarian baru dijalankan setelah user berhenti mengetik
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_entry.textChanged.connect(self.search_timer.start)
+
         self.sort_combobox = QComboBox()
         self.sort_combobox.addItems(
             [
@@ -93,9 +116,16 @@ class SalesTab(QWidget):
             }}
             """
         )
-        self.sort_combobox.currentIndexChanged.connect(self.refresh_sales_list)
+        self.sort_combobox.currentIndexChanged.connect(self.apply_search)
         control_layout.addWidget(self.sort_combobox)
 
+        self.loading_label = QLabel("Loading...")
+        self.loading_label.setStyleSheet(
+            f"color: {colors['text_secondary']}; padding: 5px"
+        )
+        self.loading_label.hide()
+        control_layout.addWidget(self.loading_label)
+
         # Sales Table
         self.sales_table = QTableView()
         self.sales_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -103,63 +133,309 @@ class SalesTab(QWidget):
         self.sales_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.sales_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.sales_table.customContextMenuRequested.connect(self.show_context_menu)
+        self.model = SalesTableModel(parent=self)
+        # Pilihan dan posisi scroll tetap saat baris dimuat ulang
+        self.view_keeper = RowViewKeeper(self.sales_table, self.model)
         main_layout.addWidget(self.sales_table)
 
         self.pagination = PaginationWidget()
         self.pagination.pageChanged.connect(self.on_page_changed)
         main_layout.addWidget(self.pagination)
 
-    def refresh_sales_list(self):
+    def refresh_sales_list(self, changed_ids=None):
+        """Reload after an explicit refresh or a data change.
+
+        With ``changed_ids`` only those transactions are fetched again into
+        the search snapshot, otherwise the snapshot is dropped.
+        """
+        # Snapshot yang sedang dimuat mungkin belum berisi perubahan ini
+        if (
+            changed_ids is not None
+            and self.snapshot is not None
+            and self.loading_text is None
+        ):
+            self.update_snapshot(changed_ids)
+            return
+
+        # Snapshot pencarian sudah basi, dimuat ulang saat dibutuhkan
+        self.loader.cancel("snapshot")
+        self.loader.cancel("snapshot_update")
+        self.snapshot = None
+        self.snapshot_text = None
+        self.loading_text = None
+        self.changed_ids = set()
+        self.sort_orders = {}
+        self.search_result = None
+        self.apply_search()
+
+    def data_changed(self, changed_ids):
+        if self.refresh_callback:
+            self.refresh_callback(changed_ids)
+        else:
+            self.refresh_sales_list(changed_ids)
+
+    def apply_search(self):
+        self.search_timer.stop()
         search_text = self.search_entry.text().strip().lower()
 
-        # Update cache jika perlu
-        self.cached_transactions = self.transaction_manager.get_all_transactions()
+        if not search_text:
+            self.loader.cancel("snapshot")
+            self.loading_text = None
+            self.search_result = None
+            self.load_sales_list()
+        elif self.snapshot is not None and self.snapshot_text in search_text:
+            self.show_search_result(search_text)
+        else:
+            self.load_snapshot(search_text)
+
+    def load_sales_list(self):
+        search_text = self.search_entry.text().strip()
+        sort_option = self.sort_combobox.currentIndex()
+        items_per_page = self.pagination.items_per_page
+        infinite_scroll = self.pagination.infinite_scroll
+        current_state, current_query = self.list_state, self.page_query
+
+        def load(job):
+            total = self.transaction_manager.count_transactions(search_text)
+            list_state = (search_text, sort_option, total)
+            if infinite_scroll:
+                # Baris diambil oleh model lewat fetchMore
+                return list_state, None, None
+
+            # Jika filter, urutan dan jumlah data sama, cukup muat ulang halaman aktif
+            if list_state == current_state and current_query is not None:
+                query = current_query
+            else:
+                query = {
+                    "sort_option": sort_option,
+                    "limit": items_per_page,
+                    "search_text": search_text,
+                }
+            transactions = self.transaction_manager.get_transactions_page(**query)
+            return list_state, query, transactions
+
+        self.set_loading(True)
+        self.loader.submit("sales", load, self.on_sales_loaded, self.on_load_error)
+
+    def load_snapshot(self, search_text):
+        # Snapshot yang sedang dimuat juga berlaku untuk query yang lebih sempit
+        if self.loading_text is not None and self.loading_text in search_text:
+            return
+
+        sort_option = self.sort_combobox.currentIndex()
+        self.loading_text = search_text
+
+        def load(job):
+            # Query pertama lewat index product_name, sisanya disaring di memori
+            query = self.transaction_manager.search_filter(search_text)
+            snapshot = self.transaction_manager.get_search_batch(
+                query, self.SNAPSHOT_LIMIT
+            )
+            if snapshot is None:
+                return search_text, None, {}
+            field, direction = self.transaction_manager.SORT_ORDERS[sort_option]
+            sort_orders = {sort_option: snapshot.sort_order(field, direction)}
+            return search_text, snapshot, sort_orders
+
+        self.loader.cancel("sales")
+        self.loader.cancel("snapshot_update")
+        self.changed_ids = set()
+        self.set_loading(True)
+        self.loader.submit(
+            "snapshot", load, self.on_snapshot_loaded, self.on_snapshot_error
+        )
+
+    def on_snapshot_loaded(self, result):
+        search_text, snapshot, sort_orders = result
+        self.loading_text = None
+        self.snapshot_text = search_text
+        self.snapshot, self.sort_orders = snapshot, sort_orders
+        self.search_result = None
+
+        current_text = self.search_entry.text().strip().lower()
+        if snapshot is None and current_text == search_text:
+            # Terlalu banyak hasil untuk disimpan di memori
+            self.load_sales_list()
+        else:
+            self.apply_search()
+
+    def on_snapshot_error(self, message):
+        self.loading_text = None
+        self.on_load_error(message)
+
+    def update_snapshot(self, changed_ids):
+        # Update yang belum selesai dibatalkan, id-nya ikut dimuat ulang
+        self.changed_ids.update(changed_ids)
+        ids = set(self.changed_ids)
+        snapshot, snapshot_text = self.snapshot, self.snapshot_text
+
+        def load(job):
+            changed = self.transaction_manager.get_changed_batch(ids, snapshot_text)
+            return snapshot, snapshot.replace_ids(ids, changed)
+
+        self.loader.submit(
+            "snapshot_update",
+            load,
+            self.on_snapshot_updated,
+            lambda message: self.refresh_sales_list(),
+        )
 
-        # Filter dari cache
-        self.filtered_transactions = [
-            transaction
-            for transaction in self.cached_transactions
-            if search_text in transaction.product_name.lower()
-        ]
+    def on_snapshot_updated(self, result):
+        base, snapshot = result
+        # Snapshot sudah diganti saat update berjalan
+        if base is not self.snapshot:
+            return
+        self.snapshot = snapshot
+        self.changed_ids = set()
+        self.sort_orders = {}
+        self.search_result = None
+        self.apply_search()
 
+    def show_search_result(self, search_text):
         sort_option = self.sort_combobox.currentIndex()
-        if sort_option == 0:
-            self.filtered_transactions.sort(key=lambda x: x.date, reverse=True)
-        elif sort_option == 1:
-            self.filtered_transactions.sort(key=lambda x: x.date)
-        elif sort_option == 2:
-            self.filtered_transactions.sort(key=lambda x: x.created_at, reverse=True)
-        elif sort_option == 3:
-            self.filtered_transactions.sort(key=lambda x: x.created_at)
-        elif sort_option == 4:
-            self.filtered_transactions.sort(key=lambda x: x.total, reverse=True)
-        elif sort_option == 5:
-            self.filtered_transactions.sort(key=lambda x: x.total)
-        elif sort_option == 6:
-            self.filtered_transactions.sort(key=lambda x: x.quantity, reverse=True)
-        elif sort_option == 7:
-            self.filtered_transactions.sort(key=lambda x: x.quantity)
-
-        # Update pagination
-        self.pagination.set_total_items(len(self.filtered_transactions))
-
-        # Get page data
+        previous = self.search_result
+
+        if (
+            previous is not None
+            and previous[1] == sort_option
+            and previous[0] in search_text
+        ):
+            # Query baru memperluas query lama, cukup persempit hasil sebelumnya
+            codes = self.snapshot.match_products(search_text, previous[2])
+            rows = self.snapshot.rows_with_products(codes, previous[3])
+        else:
+            if sort_option not in self.sort_orders:
+                field, direction = self.transaction_manager.SORT_ORDERS[sort_option]
+                self.sort_orders[sort_option] = self.snapshot.sort_order(
+                    field, direction
+                )
+            codes = self.snapshot.match_products(search_text)
+            rows = self.snapshot.rows_with_products(
+                codes, self.sort_orders[sort_option]
+            )
+
+        self.search_result = (search_text, sort_option, codes, rows)
+        self.loader.cancel("sales")
+        # Mode server paging harus mulai dari awal saat pencarian dikosongkan
+        self.list_state = None
+        self.page_query = None
+        self.pagination.reset(len(rows))
         self.update_current_page()
 
+    def on_sales_loaded(self, result):
+        list_state, query, transactions = result
+        if query is None or query is not self.page_query:
+            self.list_state = list_state
+            self.pagination.reset(list_state[2])
+            self.loaded_page = 1
+
+        if query is None:
+            self.update_current_page()
+        else:
+            self.show_page(query, transactions)
+
     def update_current_page(self):
-        # Calculate slice indices
-        start_idx = (self.pagination.current_page - 1) * self.pagination.items_per_page
-        end_idx = start_idx + self.pagination.items_per_page
+        page = self.pagination.current_page
+        items_per_page = self.pagination.items_per_page
+
+        if self.search_result is not None:
+            rows = self.search_result[3]
+            if self.pagination.infinite_scroll:
+                self.show_source(ListSource(rows, self.snapshot_transactions))
+                return
+
+            start_idx = (page - 1) * items_per_page
+            rows = rows[start_idx : start_idx + items_per_page]
+            self.loaded_page = page
+            self.show_page(None, self.snapshot_transactions(rows))
+            return
+
+        search_text, sort_option, _ = self.list_state
+        if self.pagination.infinite_scroll:
+            self.show_source(
+                TransactionCursorSource(
+                    self.transaction_manager, self.loader, sort_option, search_text
+                )
+            )
+            return
+
+        query = {
+            "sort_option": sort_option,
+            "limit": items_per_page,
+            "search_text": search_text,
+        }
+
+        # Ambil hanya halaman yang terlihat dengan seek dari halaman sebelumnya
+        last_page_start = None
+        if page != 1 and page != self.pagination.total_pages and not (
+            abs(page - self.loaded_page) == 1 and self.page_transactions
+        ):
+            # Tanpa halaman tetangga sebagai titik seek, mulai lagi dari awal
+            # daripada $skip yang biayanya sebanding dengan offset
+            page = 1
+            self.pagination.reset(self.pagination.total_items)
+
+        if page == 1:
+            pass
+        elif page == self.pagination.total_pages:
+            query["from_end"] = True
+            last_page_start = (page - 1) * items_per_page
+        elif page == self.loaded_page + 1 and self.page_transactions:
+            query["after"] = self.transaction_manager.page_cursor(
+                self.page_transactions[-1], sort_option
+            )
+        elif page == self.loaded_page - 1 and self.page_transactions:
+            query["before"] = self.transaction_manager.page_cursor(
+                self.page_transactions[0], sort_option
+            )
 
-        # Get transactions for current page
-        page_transactions = self.filtered_transactions[start_idx:end_idx]
+        def on_page_loaded(transactions):
+            self.loaded_page = page
+            self.show_page(query, transactions)
+
+        def load(job):
+            if last_page_start is not None:
+                # Total halaman bisa dari estimated_document_count, isi halaman
+                # terakhir dihitung dari jumlah yang pasti
+                total = self.transaction_manager.count_transactions(
+                    search_text, exact=True
+                )
+                query["limit"] = min(
+                    items_per_page, max(1, total - last_page_start)
+                )
+            return self.transaction_manager.get_transactions_page(**query)
+
+        self.set_loading(True)
+        self.loader.submit("sales", load, on_page_loaded, self.on_load_error)
+
+    def show_page(self, query, transactions):
+        self.page_query = query
+        self.page_transactions = transactions
+        self.set_loading(False)
 
         # Update model
-        self.model = SalesTableModel(page_transactions)
-        self.sales_table.setModel(self.model)
+        self.model.set_rows(self.page_transactions)
+
+    def show_source(self, source):
+        self.page_query = None
+        self.page_transactions = []
+        self.set_loading(False)
+        self.model.set_source(source)
+
+    def snapshot_transactions(self, rows):
+        return [self.snapshot[int(row)] for row in rows]
+
+    def set_loading(self, loading):
+        self.loading_label.setText("Loading...")
+        self.loading_label.setVisible(loading)
+
+    def on_load_error(self, message):
+        self.loading_label.setText(f"Failed to load sales: {message}")
+        self.loading_label.show()
 
     def on_page_changed(self, page, items_per_page):
-        self.update_current_page()
+        if self.list_state is not None or self.search_result is not None:
+            self.update_current_page()
 
     def show_add_sale_dialog(self):
         dialog = SaleDialog(
@@ -167,10 +443,9 @@ class SalesTab(QWidget):
             self.product_manager,
             self.transaction_manager,
             self.logger,
-            refresh_callback=self.refresh_callback,
+            refresh_callback=self.data_changed,
         )
         dialog.exec()
-        self.refresh_sales_list()
 
     def edit_selected_sale(self):
         selected_row = self.sales_table.selectionModel().selectedRows()[0].row()
@@ -188,10 +463,9 @@ class SalesTab(QWidget):
                 self.transaction_manager,
                 self.logger,
                 transaction,
-                refresh_callback=self.refresh_callback,
+                refresh_callback=self.data_changed,
             )
             dialog.exec()
-            self.refresh_sales_list()
 
     def delete_selected_sale(self):
         selected_row = self.sales_table.selectionModel().selectedRows()[0].row()
@@ -210,19 +484,32 @@ class SalesTab(QWidget):
                 QMessageBox.Yes | QMessageBox.No,
             )
             if response == QMessageBox.Yes:
-                # Restore product stock
-                product = self.product_manager.get_product_by_id(transaction.product_id)
-                if product:
-                    product.stock += transaction.quantity
-                    self.product_manager.update_product(product)
 
-                if self.transaction_manager.delete_transaction(transaction._id):
+                def apply_delete(session):
+                    if not self.transaction_manager.delete_transaction(
+                        transaction._id, session=session
+                    ):
+                        return False
+                    # Restore product stock
+                    self.product_manager.release_stock(
+                        transaction.product_id, transaction.quantity, session=session
+                    )
+                    return True
+
+                try:
+                    deleted = self.transaction_manager.db.run_in_transaction(
+                        apply_delete
+                    )
+                except Exception as e:
+                    # Misalnya rollup daily_sales gagal ditulis, transaction batal
+                    print(f"Error deleting sale: {e}")
+                    deleted = False
+
+                if deleted:
                     self.logger.log_action(
                         f"Deleted sale: {transaction._id} - Product: {transaction.product_name}"
                     )
-                    self.refresh_sales_list()
-                    if self.refresh_callback:
-                        self.refresh_callback()
+                    self.data_changed([transaction._id])
                     QMessageBox.information(
                         self, "Success", "Sale deleted successfully!"
                     )
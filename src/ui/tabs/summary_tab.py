@@ -10,18 +10,20 @@ from PySide6.QtWidgets import (
     QFrame,
     QScrollArea,
     QFileDialog,
+    QProgressDialog,
 )
+from src.reports.summary import format_summary_html
 from src.style_config import Theme
-from PySide6.QtCore import QDate
-from decimal import Decimal
-from collections import defaultdict
-import xlsxwriter
+from src.utils import excel_export
+from src.utils.data_loader import DataLoader
+from PySide6.QtCore import QDate, Qt
 
 
 class SummaryTab(QWidget):
     def __init__(self, parent, transaction_manager):
         super().__init__(parent)
         self.transaction_manager = transaction_manager
+        self.loader = DataLoader(self)
         self.setup_ui()
 
     def setup_ui(self):
@@ -207,52 +209,6 @@ class SummaryTab(QWidget):
         elif period == "month":
             self.start_date.setDate(end_date.addMonths(-1))
 
-    def calculate_trends(self, transactions):
-        """Calculate sales trends"""
-        if not transactions:
-            return {}
-
-        # Sort transactions by date
-        sorted_transactions = sorted(transactions, key=lambda x: x.date)
-
-        # Daily sales trend
-        daily_sales = defaultdict(Decimal)
-        for trans in transactions:
-            date_str = trans.date.strftime("%Y-%m-%d")
-            daily_sales[date_str] += trans.total
-
-        # Find peak sales day
-        peak_day = max(daily_sales.items(), key=lambda x: x[1])
-
-        # Calculate growth rate
-        if len(daily_sales) >= 2:
-            first_day_sales = list(daily_sales.values())[0]
-            last_day_sales = list(daily_sales.values())[-1]
-            if first_day_sales > 0:
-                growth_rate = (
-                    (last_day_sales - first_day_sales) / first_day_sales
-                ) * 100
-            else:
-                growth_rate = 0
-        else:
-            growth_rate = 0
-
-        # Most popular products
-        product_sales = defaultdict(int)
-        for trans in transactions:
-            product_sales[trans.product_name] += trans.quantity
-
-        top_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)[
-            :5
-        ]
-
-        return {
-            "peak_day": {"date": peak_day[0], "amount": peak_day[1]},
-            "growth_rate": growth_rate,
-            "top_products": top_products,
-            "daily_sales": dict(daily_sales),
-        }
-
     def export_to_excel(self):
         try:
             # Get date range
@@ -262,17 +218,6 @@ class SummaryTab(QWidget):
             if start_date > end_date:
                 raise ValueError("Start date cannot be after end date")
 
-            # Get transactions
-            transactions = self.transaction_manager.get_transactions_by_date_range(
-                start_date, end_date
-            )
-
-            if not transactions:
-                QMessageBox.warning(
-                    self, "No Data", "No transactions found in the selected date range."
-                )
-                return
-
             # Ask for save location
             file_name, _ = QFileDialog.getSaveFileName(
                 self,
@@ -284,64 +229,73 @@ class SummaryTab(QWidget):
             if not file_name:
                 return
 
-            # Create workbook
-            workbook = xlsxwriter.Workbook(file_name)
-            worksheet = workbook.add_worksheet("Sales Report")
-
-            # Set column widths
-            worksheet.set_column("A:A", 12)  # Date
-            worksheet.set_column("B:B", 30)  # Product
-            worksheet.set_column("C:C", 10)  # Quantity
-            worksheet.set_column("D:D", 15)  # Total
-
-            # Add headers
-            headers = ["Date", "Product", "Quantity", "Total (Rp)"]
-            header_format = workbook.add_format(
-                {
-                    "bold": True,
-                    "bg_color": "#2563eb",
-                    "font_color": "white",
-                    "border": 1,
-                }
-            )
-
-            for col, header in enumerate(headers):
-                worksheet.write(0, col, header, header_format)
-
-            # Add data
-            date_format = workbook.add_format({"num_format": "yyyy-mm-dd"})
-            number_format = workbook.add_format({"num_format": "#,##0"})
-            currency_format = workbook.add_format({"num_format": "#,##0.00"})
-
-            for row, transaction in enumerate(transactions, start=1):
-                worksheet.write(row, 0, transaction.date, date_format)
-                worksheet.write(row, 1, transaction.product_name)
-                worksheet.write(row, 2, transaction.quantity, number_format)
-                worksheet.write(row, 3, float(transaction.total), currency_format)
-
-            # Add summary
-            summary_row = len(transactions) + 2
-            total_sales = sum(float(t.total) for t in transactions)
-            total_quantity = sum(t.quantity for t in transactions)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
 
-            bold_format = workbook.add_format({"bold": True})
+        self.export_progress = QProgressDialog(
+            "Exporting transactions...", "Cancel", 0, 0, self
+        )
+        self.export_progress.setWindowTitle("Export to Excel")
+        self.export_progress.setWindowModality(Qt.WindowModal)
+        self.export_progress.setMinimumDuration(0)
+        self.export_progress.canceled.connect(self.cancel_export)
+        self.export_button.setEnabled(False)
+
+        self.loader.submit(
+            "export",
+            lambda job: self.write_export(job, file_name, start_date, end_date),
+            lambda count: self.on_export_finished(file_name, count),
+            self.on_export_failed,
+            self.on_export_progress,
+        )
 
-            worksheet.write(summary_row, 1, "Total", bold_format)
-            worksheet.write(summary_row, 2, total_quantity, number_format)
-            worksheet.write(summary_row, 3, total_sales, currency_format)
+    def write_export(self, job, file_name, start_date, end_date):
+        """Stream the transactions into the workbook, runs on a worker thread"""
+        total = self.transaction_manager.count_transactions_by_date_range(
+            start_date, end_date
+        )
+        if not total:
+            return 0
+        documents = self.transaction_manager.iter_transactions_by_date_range(
+            start_date, end_date, projection=excel_export.PROJECTION
+        )
+        return excel_export.write_sales_report(file_name, documents, total, job)
 
-            workbook.close()
+    def on_export_progress(self, done, total):
+        self.export_progress.setMaximum(total)
+        self.export_progress.setValue(done)
+        self.export_progress.setLabelText(
+            f"Exporting transactions... {done:,} of {total:,}"
+        )
 
-            QMessageBox.information(
-                self, "Success", f"Report exported successfully to:\n{file_name}"
+    def close_export_progress(self):
+        self.export_progress.canceled.disconnect(self.cancel_export)
+        self.export_progress.close()
+        self.export_progress.deleteLater()
+        self.export_button.setEnabled(True)
+
+    def cancel_export(self):
+        # Job menghapus file yang belum selesai
+        self.loader.cancel("export")
+        self.close_export_progress()
+
+    def on_export_finished(self, file_name, count):
+        self.close_export_progress()
+        if not count:
+            QMessageBox.warning(
+                self, "No Data", "No transactions found in the selected date range."
             )
+            return
+        QMessageBox.information(
+            self, "Success", f"Report exported successfully to:\n{file_name}"
+        )
 
-        except ValueError as e:
-            QMessageBox.critical(self, "Error", str(e))
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Error", f"An error occurred while exporting: {str(e)}"
-            )
+    def on_export_failed(self, message):
+        self.close_export_progress()
+        QMessageBox.critical(
+            self, "Error", f"An error occurred while exporting: {message}"
+        )
 
     def generate_summary(self):
         try:
@@ -351,175 +305,35 @@ class SummaryTab(QWidget):
             if start_date > end_date:
                 raise ValueError("Start date cannot be after end date")
 
-            transactions = self.transaction_manager.get_transactions_by_date_range(
-                start_date, end_date
-            )
-
-            # Basic calculations
-            total_amount = sum(t.total for t in transactions)
-            total_capital = sum(t.capital for t in transactions)
-            total_profit = sum(t.profit for t in transactions)
-            profit_margin = (
-                (total_profit / total_amount * 100) if total_amount > 0 else 0
-            )
-            product_summary = defaultdict(
-                lambda: {"quantity": 0, "total": Decimal("0")}
-            )
-
-            for transaction in transactions:
-                prod_data = product_summary[transaction.product_name]
-                prod_data["quantity"] += transaction.quantity
-                prod_data["total"] += transaction.total
-
-            # Calculate advanced metrics
-            trends = self.calculate_trends(transactions)
-
-            # Generate formatted summary
-            summary = self.format_summary_report(
-                start_date,
-                end_date,
-                transactions,
-                total_amount,
-                total_capital,
-                total_profit,
-                product_summary,
-                trends,
+            self.summary_text.setPlainText("Loading...")
+            self.loader.submit(
+                "summary",
+                lambda job: self.load_summary(start_date, end_date),
+                self.show_summary,
+                lambda message: QMessageBox.critical(
+                    self, "Error", f"An error occurred: {message}"
+                ),
             )
 
-            # Update text widget with custom formatting
-            self.summary_text.setHtml(summary)
-
         except ValueError as e:
             QMessageBox.critical(self, "Error", str(e))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred: {str(e)}")
-
-    def format_summary_report(
-        self,
-        start_date,
-        end_date,
-        transactions,
-        total_amount,
-        total_capital,
-        total_profit,
-        product_summary,
-        trends,
-    ):
-        """Format the summary report with HTML styling and consistent spacing"""
-        colors = Theme.get_theme_colors()
 
-        html = f"""
-        <style>
-            body {{ 
-                font-family: Arial, sans-serif; 
-                margin: 0; 
-                padding: 20px; 
-                background-color: #f9f9f9; 
-            }}
-            .header {{ 
-                color: {colors['text_secondary']}; 
-                font-size: 19px; 
-                font-weight: bold; 
-                margin-bottom: 20px; 
-            }}
-            .section {{ 
-                margin-bottom: 30px; 
-                padding-bottom: 10px; 
-                border-bottom: 1px solid {colors['text_secondary']}; 
-            }}
-            .subheader {{ 
-                color: {colors['text_secondary']}; 
-                font-size: 16px; 
-                margin-bottom: 10px; 
-                font-weight: bold;
-            }}
-            .data {{ 
-                color: {colors['text_primary']}; 
-                margin-left: 20px;
-                margin-bottom: 20px;
-                line-height: 1; 
-            }}
-            .highlight {{ 
-                color: {colors['accent']}; 
-                font-weight: bold;
-            }}
-            .transparent {{
-                background-color: transparent;
-                color: transparent;
-                border: none;
-            }}
-        </style>
-        
-        <div class="header">Summary Report ({start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')})</div>
-        """
+    def load_summary(self, start_date, end_date):
+        """Fetch the aggregated summary data, runs on a worker thread"""
+        summary = self.transaction_manager.summarize_range(start_date, end_date)
+        if summary is None:
+            raise RuntimeError("Failed to load the summary from the database")
+        return start_date, end_date, summary
 
-        if not transactions:
-            return (
-                html
-                + f"""
-            <div class="section">
-                <div class="subheader">No Data Available</div>
-                <div class="data">No transactions found for this period.</div>
-            </div>
-            """
-            )
+    def show_summary(self, summary_data):
+        # Generate formatted summary
+        summary = self.format_summary_report(*summary_data)
 
-        html += f"""
-        <div class="section">
-            <div class="subheader">- Overview</div>
-            <div class="data">
-                Total Transactions: <span class="highlight">{len(transactions)}</span><br>
-                Total Revenue: <span class="highlight">Rp{total_amount:,.2f}</span><br>
-                Total Capital: <span class="highlight">Rp{total_capital:,.2f}</span><br>
-                Total Profit: <span class="highlight">Rp{total_profit:,.2f}</span><br>
-                Average Transaction Value: <span class="highlight">Rp{(total_amount / len(transactions)):,.2f}</span>
-            </div>
-        </div>
-        """
+        # Update text widget with custom formatting
+        self.summary_text.setHtml(summary)
 
-        sections = [
-            {
-                "condition": trends.get("top_products"),
-                "subheader": "- Top Selling Products",
-                "data": "".join(
-                    f"{product}: <span class='highlight'>{quantity}</span> units"
-                    + ("<br>" if i < len(trends["top_products"]) - 1 else "")
-                    for i, (product, quantity) in enumerate(trends["top_products"])
-                ),
-            },
-            {
-                "condition": trends.get("peak_day", {}).get("date"),
-                "subheader": "- Sales Analysis",
-                "data": f"""
-                    Peak Sales Day: <span class="highlight">{trends['peak_day']['date']}</span><br>
-                    Peak Day Revenue: <span class="highlight">Rp{trends['peak_day']['amount']:,.2f}</span><br>
-                    Growth Rate: <span class="highlight">{trends['growth_rate']:.1f}%</span>
-                """,
-            },
-            {
-                "condition": product_summary,
-                "subheader": "- Detailed Product Summary",
-                "data": "".join(
-                    f"""
-                    <b>{product_name}</b><br>
-                    Quantity Sold: <span class="highlight">{data['quantity']}</span><br>
-                    Revenue: <span class="highlight">Rp{data['total']:,.2f}</span><br>
-                    Average Price: <span class="highlight mb-10">Rp{(data['total'] / data['quantity']):,.2f}</span><br>
-                    <span class="transparent">-</span><br>
-                    """
-                    for product_name, data in product_summary.items()
-                    if data["quantity"] > 0
-                ),
-            },
-        ]
-
-        for section in sections:
-            if section["condition"]:
-                html += f"""
-                <div class="section">
-                    <div class="subheader">{section['subheader']}</div>
-                    <div class="data">{section['data']}</div>
-                </div>
-                """
-
-        return html
+    def format_summary_report(self, start_date, end_date, summary):
+        """Format the summary report with HTML styling and consistent spacing"""
+        return format_summary_html(
+            start_date, end_date, summary, Theme.get_theme_colors()
+        )
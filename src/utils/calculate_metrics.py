@@ -1,5 +1,7 @@
 from collections import defaultdict
+from datetime import date
 from decimal import Decimal
+import numpy as np
 
 
 def calculate_metrics(self, transactions, products):
@@ -137,3 +139,241 @@ def calculate_metrics(self, transactions, products):
         },
         "days_analyzed": len(daily_metrics),
     }
+
+
+MINOR_UNITS = 100
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _to_minor(value):
+    return int((value * MINOR_UNITS).to_integral_value())
+
+
+def _from_minor(value):
+    return Decimal(int(value)).scaleb(-2)
+
+
+def _int_sum(keys, values, size):
+    """Exact int64 sum per key, bincount with weights would go through float64"""
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, keys, values)
+    return sums
+
+
+def _group_sum(keys, weights, size):
+    """Sum weights per integer key, returns (keys present, sums, row counts)."""
+    if size <= max(1 << 20, 4 * len(keys)):
+        counts = np.bincount(keys, minlength=size)
+        present = np.flatnonzero(counts)
+        sums = np.bincount(keys, weights, size)
+        return present, sums[present], counts[present]
+
+    # Kombinasi key terlalu jarang untuk array rapat
+    present, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    return present, np.bincount(inverse, weights, len(present)), counts
+
+
+def _metric_columns(transactions, product_ids):
+    """Turn transactions (list or TransactionBatch) into per-row numpy columns.
+
+    Product names get dense codes in order of first appearance, which keeps
+    the dict ordering of calculate_metrics.
+    """
+    names = []
+    name_index = {}
+
+    if getattr(transactions, "product_codes", None) is not None:
+        # TransactionBatch: kolom sudah tersedia, cukup petakan tabel produknya
+        pair_names = np.empty(len(transactions.products), dtype=np.int64)
+        pair_known = np.empty(len(transactions.products), dtype=bool)
+        for code, (product_id, product_name) in enumerate(transactions.products):
+            if product_name not in name_index:
+                name_index[product_name] = len(names)
+                names.append(product_name)
+            pair_names[code] = name_index[product_name]
+            pair_known[code] = str(product_id) in product_ids
+
+        codes = transactions.product_codes
+        return {
+            "names": names,
+            "name_codes": pair_names[codes],
+            "known": pair_known[codes],
+            "days": transactions.days.astype(np.int64) + EPOCH_ORDINAL,
+            "quantity": transactions.quantity.astype(np.int64),
+            "total": transactions.total,
+            "profit": transactions.profit,
+            "product_id": lambda row: transactions.products[codes[row]][0],
+        }
+
+    name_codes = []
+    for trans in transactions:
+        code = name_index.get(trans.product_name)
+        if code is None:
+            code = name_index[trans.product_name] = len(names)
+            names.append(trans.product_name)
+        name_codes.append(code)
+
+    return {
+        "names": names,
+        "name_codes": np.array(name_codes, dtype=np.int64),
+        "known": np.array(
+            [str(t.product_id) in product_ids for t in transactions], dtype=bool
+        ),
+        "days": np.array([t.date.toordinal() for t in transactions], dtype=np.int64),
+        "quantity": np.array([t.quantity for t in transactions], dtype=np.int64),
+        "total": np.array([_to_minor(t.total) for t in transactions], dtype=np.int64),
+        "profit": np.array(
+            [_to_minor(t.profit) for t in transactions], dtype=np.int64
+        ),
+        "product_id": lambda row: transactions[row].product_id,
+    }
+
+
+def calculate_metrics_vectorized(transactions, products):
+    """Array based calculate_metrics, linear in the number of transactions.
+
+    Accepts a list of Transaction or a TransactionBatch and returns the same
+    dict as calculate_metrics. Money is summed in int64 sen, so amounts with
+    more than two decimals are rounded to the sen.
+    """
+    if not len(transactions):
+        return {}
+
+    all_products = {str(p._id): p for p in products}
+
+    stock_alerts = {"critical": [], "warning": []}
+    for product in products:
+        if product.stock <= 5:
+            level = "critical"
+        elif product.stock <= 10:
+            level = "warning"
+        else:
+            continue
+        stock_alerts[level].append(
+            {"name": product.name, "stock": product.stock, "avg_daily_sales": 0}
+        )
+
+    columns = _metric_columns(transactions, all_products)
+    names = columns["names"]
+    name_codes = columns["name_codes"]
+    quantity = columns["quantity"]
+    row_count = len(name_codes)
+    name_count = len(names)
+    rows = np.arange(row_count)
+
+    # Hari dibuat rapat (0..n_days-1) agar bisa dikelompokkan dengan bincount
+    first_day = int(columns["days"].min())
+    day_codes = columns["days"] - first_day
+    day_count = int(day_codes.max()) + 1
+
+    # Total per produk
+    revenue = _int_sum(name_codes, columns["total"], name_count)
+    profit = _int_sum(name_codes, columns["profit"], name_count)
+    sold = _int_sum(name_codes, quantity, name_count)
+
+    # days_to_stockout memakai transaksi terakhir (urutan input) per produk
+    # yang product_id-nya masih ada, dengan akumulasi sampai transaksi itu
+    last_known = np.full(name_count, -1, dtype=np.int64)
+    known = columns["known"]
+    np.maximum.at(last_known, name_codes[known], rows[known])
+    counted = rows <= last_known[name_codes]
+
+    pair_keys = day_codes * name_count + name_codes
+    pairs, pair_quantity, _ = _group_sum(
+        pair_keys[counted], quantity[counted], day_count * name_count
+    )
+    pair_names = pairs % name_count
+    counted_sold = np.bincount(pair_names, pair_quantity, name_count)
+    counted_days = np.bincount(pair_names[pair_quantity > 0], minlength=name_count)
+
+    product_metrics = {}
+    for code, name in enumerate(names):
+        metrics = {
+            "total_revenue": _from_minor(revenue[code]),
+            "total_profit": _from_minor(profit[code]),
+            "quantity_sold": int(sold[code]),
+            "profit_margin": Decimal("0"),
+            "stock_turnover": 0,
+            "days_to_stockout": float("inf"),
+        }
+        if metrics["total_revenue"] > 0:
+            metrics["profit_margin"] = (
+                metrics["total_profit"] / metrics["total_revenue"] * 100
+            )
+
+        days = int(counted_days[code])
+        if last_known[code] >= 0 and days > 0:
+            avg_daily_sales = int(counted_sold[code]) / days
+            if avg_daily_sales > 0:
+                product_id = columns["product_id"](int(last_known[code]))
+                current_stock = all_products[str(product_id)].stock
+                metrics["days_to_stockout"] = current_stock / avg_daily_sales
+                for alert in stock_alerts["critical"] + stock_alerts["warning"]:
+                    if alert["name"] == name:
+                        alert["avg_daily_sales"] = avg_daily_sales
+
+        product_metrics[name] = metrics
+
+    # Metrik harian, urut sesuai kemunculan pertama seperti versi aslinya
+    day_sales = _int_sum(day_codes, columns["total"], day_count)
+    day_profit = _int_sum(day_codes, columns["profit"], day_count)
+    day_transactions = np.bincount(day_codes, minlength=day_count)
+    pairs, pair_quantity, _ = _group_sum(
+        pair_keys, quantity, day_count * name_count
+    )
+    # pairs terurut menurut hari, jadi tiap hari adalah satu potongan berurutan
+    pair_days = pairs // name_count
+    pair_starts = np.searchsorted(pair_days, np.arange(day_count + 1))
+
+    first_seen = np.full(day_count, row_count, dtype=np.int64)
+    np.minimum.at(first_seen, day_codes, rows)
+    present_days = np.flatnonzero(first_seen < row_count)
+    present_days = present_days[np.argsort(first_seen[present_days], kind="stable")]
+
+    daily_metrics = {}
+    for day in present_days:
+        date_str = date.fromordinal(first_day + int(day)).strftime("%Y-%m-%d")
+        start, end = pair_starts[day], pair_starts[day + 1]
+        daily_metrics[date_str] = {
+            "sales": _from_minor(day_sales[day]),
+            "profit": _from_minor(day_profit[day]),
+            "transactions": int(day_transactions[day]),
+            "products_sold": {
+                names[code]: int(sold_qty)
+                for code, sold_qty in zip(
+                    pairs[start:end] % name_count, pair_quantity[start:end]
+                )
+            },
+        }
+
+    sales_trend = 0
+    if len(daily_metrics) >= 2:
+        dates = sorted(daily_metrics.keys())
+        week_days = min(7, len(dates) // 2)
+        first_week = sum(daily_metrics[d]["sales"] for d in dates[:week_days])
+        last_week = sum(daily_metrics[d]["sales"] for d in dates[-week_days:])
+        if week_days > 0 and first_week > 0:
+            sales_trend = (
+                ((last_week / week_days) - (first_week / week_days))
+                / (first_week / week_days)
+                * 100
+            )
+
+    sorted_by_profit = sorted(
+        product_metrics.items(), key=lambda x: x[1]["total_profit"], reverse=True
+    )
+    sorted_by_revenue = sorted(
+        product_metrics.items(), key=lambda x: x[1]["total_revenue"], reverse=True
+    )
+
+    return {
+        "stock_alerts": stock_alerts,
+        "product_metrics": product_metrics,
+        "daily_metrics": daily_metrics,
+        "sales_trend": sales_trend,
+        "best_performing": {
+            "by_profit": sorted_by_profit[:3],
+            "by_revenue": sorted_by_revenue[:3],
+        },
+        "days_analyzed": len(daily_metrics),
+    }
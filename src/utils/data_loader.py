@@ -0,0 +1,110 @@
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+
+class JobSignals(QObject):
+    done = Signal(object, object, object)  # job, result, error message
+    progress = Signal(object, int, int)  # job, done, total
+
+
+class Job(QRunnable):
+    """Runs ``fn(job)`` on a worker thread.
+
+    Long running functions can call ``job.is_cancelled()`` to stop early and
+    ``job.report_progress(done, total)`` to update the UI.
+    """
+
+    def __init__(self, fn, on_result, on_error=None, on_progress=None):
+        super().__init__()
+        # Lifetime diatur oleh DataLoader, bukan oleh QThreadPool
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.signals = JobSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled
+
+    def report_progress(self, done: int, total: int):
+        if not self._cancelled:
+            self.signals.progress.emit(self, done, total)
+
+    def run(self):
+        result, error = None, None
+        try:
+            result = self.fn(self)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self.signals.done.emit(self, result, error)
+
+
+class DataLoader(QObject):
+    """Runs data loading jobs on a QThreadPool, one active job per key.
+
+    Submitting a job under a key that is still loading cancels the older job,
+    so only the result of the newest request is delivered. Callbacks always
+    run on the GUI thread.
+    """
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._jobs = {}
+        self._running = set()
+
+    def submit(self, key, fn, on_result, on_error=None, on_progress=None) -> Job:
+        self.cancel(key)
+
+        job = Job(fn, on_result, on_error, on_progress)
+        job.signals.done.connect(self._on_done)
+        job.signals.progress.connect(self._on_progress)
+        self._jobs[key] = job
+        self._running.add(job)
+        self.pool.start(job)
+        return job
+
+    def cancel(self, key):
+        job = self._jobs.pop(key, None)
+        if job is not None:
+            job.cancel()
+            # Job yang belum sempat jalan langsung dikeluarkan dari antrian
+            if self.pool.tryTake(job):
+                self._running.discard(job)
+
+    def cancel_all(self):
+        for key in list(self._jobs):
+            self.cancel(key)
+
+    def is_loading(self, key) -> bool:
+        return key in self._jobs
+
+    def is_idle(self) -> bool:
+        """True when no job is waiting to deliver its result"""
+        return not self._jobs
+
+    @Slot(object, object, object)
+    def _on_done(self, job, result, error):
+        self._running.discard(job)
+
+        # Hasil job yang dibatalkan atau sudah digantikan job baru diabaikan
+        key = next((k for k, active in self._jobs.items() if active is job), None)
+        if key is None or job.is_cancelled():
+            return
+        del self._jobs[key]
+
+        if error is None:
+            job.on_result(result)
+        elif job.on_error:
+            job.on_error(error)
+        else:
+            print(f"Error loading {key}: {error}")
+
+    @Slot(object, int, int)
+    def _on_progress(self, job, done, total):
+        if job.on_progress and not job.is_cancelled():
+            job.on_progress(done, total)
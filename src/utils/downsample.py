@@ -0,0 +1,69 @@
+import numpy as np
+
+DAY_MS = 24 * 60 * 60 * 1000
+WEEK_MS = 7 * DAY_MS
+# 1970-01-01 adalah hari Kamis, geser supaya minggu dimulai hari Senin
+MONDAY_OFFSET_MS = 3 * DAY_MS
+
+
+def weekly_sums(x_ms: np.ndarray, *columns: np.ndarray):
+    """Sum daily values into Monday-based weeks.
+
+    ``x_ms`` are day timestamps in milliseconds, sorted ascending. Returns the
+    week start timestamps followed by one summed array per column.
+    """
+    if len(x_ms) == 0:
+        return (x_ms,) + columns
+
+    weeks = (x_ms + MONDAY_OFFSET_MS) // WEEK_MS
+    week_starts, inverse = np.unique(weeks, return_inverse=True)
+    sums = tuple(
+        np.bincount(inverse, weights=column, minlength=len(week_starts))
+        for column in columns
+    )
+    return (week_starts * WEEK_MS - MONDAY_OFFSET_MS,) + sums
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by largest-triangle-three-buckets.
+
+    Keeps the first and last point and, for every bucket in between, the point
+    forming the largest triangle with the previously kept point and the mean of
+    the next bucket. Returns every index if there are fewer points than
+    ``threshold``.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # Batas bucket untuk titik 1..n-2, titik pertama dan terakhir selalu dipakai
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0] = 0
+    kept[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start = end
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        kept[bucket + 1] = previous
+
+    return kept
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int):
+    """Downsample one series to at most ``threshold`` points with LTTB."""
+    indices = lttb_indices(x, y, threshold)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
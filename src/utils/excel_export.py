@@ -0,0 +1,107 @@
+import os
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional
+
+import xlsxwriter
+from src.database.codecs import to_decimal
+
+HEADERS = ["Date", "Product", "Quantity", "Total (Rp)"]
+# Hanya field ini yang diambil dari MongoDB untuk laporan
+PROJECTION = {"_id": 0, "date": 1, "product_name": 1, "quantity": 1, "total": 1}
+# Batas baris satu worksheet Excel
+MAX_SHEET_ROWS = 1048576
+PROGRESS_EVERY = 1000
+
+
+def _add_sheet(workbook, formats, number):
+    name = "Sales Report" if number == 1 else f"Sales Report ({number})"
+    worksheet = workbook.add_worksheet(name)
+
+    # Set column widths
+    worksheet.set_column("A:A", 12)  # Date
+    worksheet.set_column("B:B", 30)  # Product
+    worksheet.set_column("C:C", 10)  # Quantity
+    worksheet.set_column("D:D", 15)  # Total
+
+    for col, header in enumerate(HEADERS):
+        worksheet.write(0, col, header, formats["header"])
+    return worksheet
+
+
+def write_sales_report(
+    file_name: str,
+    documents: Iterable[Dict[str, Any]],
+    total: int = 0,
+    job=None,
+) -> Optional[int]:
+    """Stream transaction documents into an xlsx sales report.
+
+    The workbook runs in ``constant_memory`` mode, so only the current row is
+    held in memory and rows must arrive in the order they are written. Sheets
+    roll over when Excel's row limit is reached, the totals row goes after the
+    last transaction. Returns the number of transactions written, or None if
+    ``job`` was cancelled, in which case the partial file is removed.
+    """
+    workbook = xlsxwriter.Workbook(file_name, {"constant_memory": True})
+    formats = {
+        "header": workbook.add_format(
+            {
+                "bold": True,
+                "bg_color": "#2563eb",
+                "font_color": "white",
+                "border": 1,
+            }
+        ),
+        "date": workbook.add_format({"num_format": "yyyy-mm-dd"}),
+        "number": workbook.add_format({"num_format": "#,##0"}),
+        "currency": workbook.add_format({"num_format": "#,##0.00"}),
+        "bold": workbook.add_format({"bold": True}),
+    }
+
+    sheet_number = 1
+    worksheet = _add_sheet(workbook, formats, sheet_number)
+    row = 0
+    count = 0
+    total_sales = Decimal("0")
+    total_quantity = 0
+    cancelled = False
+
+    for document in documents:
+        # Sisakan dua baris untuk total di sheet terakhir
+        if row >= MAX_SHEET_ROWS - 3:
+            sheet_number += 1
+            worksheet = _add_sheet(workbook, formats, sheet_number)
+            row = 0
+
+        row += 1
+        amount = to_decimal(document.get("total"))
+        quantity = document.get("quantity", 0)
+        worksheet.write_datetime(row, 0, document["date"], formats["date"])
+        worksheet.write_string(row, 1, document.get("product_name", ""))
+        worksheet.write_number(row, 2, quantity, formats["number"])
+        worksheet.write_number(row, 3, float(amount), formats["currency"])
+
+        total_sales += amount
+        total_quantity += quantity
+        count += 1
+
+        if job is not None and count % PROGRESS_EVERY == 0:
+            if job.is_cancelled():
+                cancelled = True
+                break
+            job.report_progress(count, total)
+
+    if not cancelled:
+        summary_row = row + 2
+        worksheet.write(summary_row, 1, "Total", formats["bold"])
+        worksheet.write(summary_row, 2, total_quantity, formats["number"])
+        worksheet.write(summary_row, 3, float(total_sales), formats["currency"])
+
+    workbook.close()
+
+    if cancelled:
+        os.remove(file_name)
+        return None
+    if job is not None:
+        job.report_progress(count, total)
+    return count
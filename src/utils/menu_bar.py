@@ -1,16 +1,27 @@
 import os
+from PySide6.QtCore import Qt
 from PySide6.QtGui import QAction
-from PySide6.QtWidgets import QMessageBox
+from PySide6.QtWidgets import (
+    QFileDialog,
+    QInputDialog,
+    QMessageBox,
+    QProgressDialog,
+)
 from src.config import Config
+from src.database.transfer import export_collections, import_collections
 from src.style_config import Theme
 from src.ui.dialogs.change_conn_str import ChangeConnectionDialog
 from src.ui.dialogs.change_db_dialog import ChangeDatabaseDialog
 from src.ui.dialogs.change_pass_dialog import ChangePasswordDialog
+from src.ui.dialogs.diagnostics_dialog import DiagnosticsDialog
 from src.ui.dialogs.env_path_dialog import EnvironmentPathDialog
 from src.ui.dialogs.register_dialog import RegisterDialog
 
 
 class MenuBar:
+    # Label di dialog -> format transfer
+    FILE_FORMATS = {"Parquet": "parquet", "CSV (gzip)": "csv"}
+
     def __init__(self, main_window):
         self.main_window = main_window
         self.setup_menubar()
@@ -86,11 +97,29 @@ class MenuBar:
         settings_menu.addAction(change_connection)
         settings_menu.addAction(delete_env)
 
+        # Data Menu
+        data_menu = menubar.addMenu("Data")
+        data_menu.setStyleSheet(menu_style)
+
+        export_data = QAction("Export Data...", self.main_window)
+        export_data.triggered.connect(self.show_export_data_dialog)
+
+        import_data = QAction("Import Data...", self.main_window)
+        import_data.triggered.connect(self.show_import_data_dialog)
+
+        diagnostics = QAction("Query Diagnostics", self.main_window)
+        diagnostics.triggered.connect(self.show_diagnostics_dialog)
+
+        data_menu.addAction(export_data)
+        data_menu.addAction(import_data)
+        data_menu.addSeparator()
+        data_menu.addAction(diagnostics)
+
         refresh_menu = menubar.addMenu("Refresh")
         refresh_menu.setStyleSheet(menu_style)
 
         refresh = QAction("Refresh Data", self.main_window)
-        refresh.triggered.connect(self.main_window.refresh_all)
+        refresh.triggered.connect(self.main_window.reload_all)
 
         refresh_menu.addAction(refresh)
 
@@ -153,6 +182,115 @@ class MenuBar:
         )
         dialog.exec()
 
+    def show_export_data_dialog(self):
+        if not self.main_window.user:
+            QMessageBox.warning(self.main_window, "Error", "Please log in first")
+            return
+
+        label, ok = QInputDialog.getItem(
+            self.main_window,
+            "Export Data",
+            "Export transactions and products as:",
+            list(self.FILE_FORMATS),
+            0,
+            False,
+        )
+        if not ok:
+            return
+        directory = QFileDialog.getExistingDirectory(self.main_window, "Export To")
+        if not directory:
+            return
+
+        file_format = self.FILE_FORMATS[label]
+
+        def on_exported(exported):
+            QMessageBox.information(
+                self.main_window,
+                "Success",
+                "\n".join(
+                    f"{name}: {count} documents" for name, count in exported.items()
+                )
+                + f"\n\nExported to:\n{directory}",
+            )
+
+        self.run_transfer(
+            "Exporting data...",
+            lambda job: export_collections(directory, file_format, job=job),
+            on_exported,
+        )
+
+    def show_import_data_dialog(self):
+        if not self.main_window.user:
+            QMessageBox.warning(self.main_window, "Error", "Please log in first")
+            return
+
+        if self.main_window.user.role != "admin":
+            QMessageBox.warning(self.main_window, "Error", "Admin access required")
+            return
+
+        directory = QFileDialog.getExistingDirectory(self.main_window, "Import From")
+        if not directory:
+            return
+
+        def on_imported(imported):
+            QMessageBox.information(
+                self.main_window,
+                "Success",
+                "\n".join(
+                    f"{name}: {counts['inserted']} inserted, "
+                    f"{counts['skipped']} already present"
+                    for name, counts in imported.items()
+                ),
+            )
+            self.main_window.reload_all()
+
+        self.run_transfer(
+            "Importing data...",
+            lambda job: import_collections(directory, job=job),
+            on_imported,
+        )
+
+    def show_diagnostics_dialog(self):
+        # Non-modal agar statistik bisa diamati sambil memakai aplikasi
+        if getattr(self, "diagnostics_dialog", None) is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self.main_window)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_dialog.activateWindow()
+
+    def run_transfer(self, label, fn, on_result):
+        """Run an export/import job behind a cancellable progress dialog"""
+        loader = self.main_window.loader
+        progress = QProgressDialog(label, "Cancel", 0, 0, self.main_window)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def close_progress():
+            progress.canceled.disconnect(cancel)
+            progress.close()
+            progress.deleteLater()
+
+        def cancel():
+            loader.cancel("transfer")
+            close_progress()
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def on_done(result):
+            close_progress()
+            on_result(result)
+
+        def on_error(message):
+            close_progress()
+            QMessageBox.critical(
+                self.main_window, "Error", f"Transfer failed: {message}"
+            )
+
+        progress.canceled.connect(cancel)
+        loader.submit("transfer", fn, on_done, on_error, on_progress)
+
     def show_delete_env_dialog(self):
         if not self.main_window.user:
             QMessageBox.warning(self.main_window, "Error", "Please log in first")
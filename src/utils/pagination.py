@@ -12,11 +12,15 @@ from src.style_config import Theme
 class PaginationWidget(QWidget):
     pageChanged = Signal(int, int)
 
+    # Page size option that shows every item in one continuously loaded list
+    ALL = "All"
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.current_page = 1
         self.total_items = 0
         self.items_per_page = 10
+        self.infinite_scroll = False
         self._setting_total = False
         self.setup_ui()
 
@@ -32,7 +36,7 @@ class PaginationWidget(QWidget):
         )
 
         self.page_size_combo = QComboBox(self)
-        self.page_size_combo.addItems(["10", "25", "50", "100"])
+        self.page_size_combo.addItems(["10", "25", "50", "100", self.ALL])
         self.page_size_combo.setStyleSheet(
             f"""
             QComboBox {{
@@ -125,6 +129,12 @@ class PaginationWidget(QWidget):
         self.pageChanged.emit(self.current_page, self.items_per_page)
         self._setting_total = False
 
+    def reset(self, total):
+        """Set total number of items and go back to page 1 without emitting"""
+        self.total_items = total
+        self.current_page = 1
+        self.update_ui()
+
     def update_ui(self):
         """Update UI state based on current page and total items"""
         self.total_pages = max(
@@ -132,11 +142,15 @@ class PaginationWidget(QWidget):
         )
 
         # Update page info
-        start_item = (self.current_page - 1) * self.items_per_page + 1
-        end_item = min(self.current_page * self.items_per_page, self.total_items)
-        self.page_info.setText(
-            f"Page {self.current_page} of {self.total_pages} ({start_item}-{end_item} of {self.total_items})"
-        )
+        if self.infinite_scroll:
+            self.total_pages = 1
+            self.page_info.setText(f"All {self.total_items} items")
+        else:
+            start_item = (self.current_page - 1) * self.items_per_page + 1
+            end_item = min(self.current_page * self.items_per_page, self.total_items)
+            self.page_info.setText(
+                f"Page {self.current_page} of {self.total_pages} ({start_item}-{end_item} of {self.total_items})"
+            )
 
         # Update button states
         self.first_button.setEnabled(self.current_page > 1)
@@ -161,7 +175,9 @@ class PaginationWidget(QWidget):
 
     def on_page_size_changed(self, size):
         """Handle page size change"""
-        self.items_per_page = int(size)
+        self.infinite_scroll = size == self.ALL
+        if not self.infinite_scroll:
+            self.items_per_page = int(size)
         self.current_page = 1
         self.update_ui()
         self.pageChanged.emit(self.current_page, self.items_per_page)
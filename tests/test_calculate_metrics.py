@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from bson import ObjectId
+from src.models.product import Product
+from src.models.transaction import Transaction
+from src.models.transaction_batch import TransactionBatch
+from src.utils.calculate_metrics import calculate_metrics, calculate_metrics_vectorized
+
+
+def make_products(rng, count):
+    return [
+        Product(
+            name=f"Product {i}",
+            price=Decimal(int(rng.integers(10, 500)) * 100),
+            capital=Decimal(int(rng.integers(5, 400)) * 100),
+            # Sebagian stok rendah agar stock_alerts ikut diuji
+            stock=int(rng.integers(0, 30)),
+        )
+        for i in range(count)
+    ]
+
+
+def make_transactions(rng, products, count, days, start=date(2024, 1, 1)):
+    # Produk yang sudah dihapus: transaksinya ada, produknya tidak
+    deleted = [(ObjectId(), f"Deleted {i}") for i in range(3)]
+    choices = [(p._id, p.name) for p in products] + deleted
+
+    transactions = []
+    for _ in range(count):
+        product_id, product_name = choices[int(rng.integers(len(choices)))]
+        quantity = int(rng.integers(1, 6))
+        total = Decimal(int(rng.integers(1000, 2000000))).scaleb(-2) * quantity
+        capital = (total * Decimal("0.75")).quantize(Decimal("0.01"))
+        transactions.append(
+            Transaction(
+                product_id=product_id,
+                product_name=product_name,
+                quantity=quantity,
+                total=total,
+                capital=capital,
+                profit=total - capital,
+                date=start + timedelta(days=int(rng.integers(days))),
+            )
+        )
+    return transactions
+
+
+def as_batch(transactions):
+    return TransactionBatch.from_documents(t.to_dict() for t in transactions)
+
+
+def normalized(metrics):
+    """calculate_metrics leaves zero counts behind in products_sold through
+    defaultdict lookups, they carry no information and are dropped"""
+    for day in metrics.get("daily_metrics", {}).values():
+        day["products_sold"] = {
+            name: quantity
+            for name, quantity in day["products_sold"].items()
+            if quantity
+        }
+    return metrics
+
+
+def assert_same_metrics(transactions, products, batch=False):
+    expected = normalized(
+        calculate_metrics(SimpleNamespace(), transactions, products)
+    )
+    source = as_batch(transactions) if batch else transactions
+    actual = normalized(calculate_metrics_vectorized(source, products))
+
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert actual[key] == expected[key], key
+    # Urutan dict ikut dibandingkan, tabel di UI mengikuti urutan ini
+    assert list(actual.get("daily_metrics", {})) == list(
+        expected.get("daily_metrics", {})
+    )
+    assert list(actual.get("product_metrics", {})) == list(
+        expected.get("product_metrics", {})
+    )
+
+
+@pytest.mark.parametrize("batch", [False, True], ids=["list", "batch"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_calculate_metrics(seed, batch):
+    rng = np.random.default_rng(seed)
+    products = make_products(rng, 25)
+    transactions = make_transactions(rng, products, 2000, days=120)
+    assert_same_metrics(transactions, products, batch)
+
+
+@pytest.mark.parametrize("batch", [False, True], ids=["list", "batch"])
+def test_single_day(batch):
+    rng = np.random.default_rng(3)
+    products = make_products(rng, 10)
+    transactions = make_transactions(rng, products, 200, days=1)
+    assert_same_metrics(transactions, products, batch)
+
+
+def test_empty_input():
+    products = make_products(np.random.default_rng(4), 5)
+    assert calculate_metrics(SimpleNamespace(), [], products) == {}
+    assert calculate_metrics_vectorized([], products) == {}
+    assert calculate_metrics_vectorized(as_batch([]), products) == {}
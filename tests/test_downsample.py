@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from src.utils.downsample import DAY_MS, lttb, lttb_indices, weekly_sums
+
+
+def day_ms(year, month, day):
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+@pytest.mark.parametrize("threshold", [3, 10, 100])
+def test_lttb_keeps_endpoints(threshold):
+    rng = np.random.default_rng(threshold)
+    x = np.arange(1000) * DAY_MS
+    y = rng.normal(size=1000).cumsum()
+
+    indices = lttb_indices(x, y, threshold)
+
+    assert len(indices) == threshold
+    assert indices[0] == 0 and indices[-1] == len(x) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_spike():
+    x = np.arange(500)
+    y = np.zeros(500)
+    y[321] = 50
+    assert 321 in lttb_indices(x, y, 20)
+
+
+@pytest.mark.parametrize("threshold", [0, 2, 50, 51])
+def test_lttb_passthrough(threshold):
+    x = np.arange(50)
+    y = np.arange(50) ** 2
+    assert list(lttb_indices(x, y, threshold)) == list(range(50))
+
+    sampled_x, sampled_y = lttb(x, y, threshold)
+    assert np.array_equal(sampled_x, x)
+    assert np.array_equal(sampled_y, y)
+
+
+def test_weekly_sums_start_on_monday():
+    # Minggu 3 Maret 2024, Senin 4 Maret sampai Minggu 10 Maret, Senin 11 Maret
+    x = np.array([day_ms(2024, 3, day) for day in (3, 4, 10, 11)])
+    revenue = np.array([1.0, 2.0, 3.0, 4.0])
+    profit = np.array([10.0, 20.0, 30.0, 40.0])
+
+    weeks, revenue_sums, profit_sums = weekly_sums(x, revenue, profit)
+
+    assert list(weeks) == [day_ms(2024, 2, 26), day_ms(2024, 3, 4), day_ms(2024, 3, 11)]
+    assert list(revenue_sums) == [1.0, 5.0, 4.0]
+    assert list(profit_sums) == [10.0, 50.0, 40.0]
+    for week in weeks:
+        assert datetime.fromtimestamp(week / 1000, timezone.utc).weekday() == 0
+
+
+def test_weekly_sums_empty():
+    x = np.array([], dtype=np.int64)
+    revenue = np.array([], dtype=np.float64)
+    weeks, sums = weekly_sums(x, revenue)
+    assert len(weeks) == 0 and len(sums) == 0
@@ -0,0 +1,99 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import numpy as np
+from bson import ObjectId
+from src.models.transaction import Transaction
+from src.models.transaction_batch import TransactionBatch
+
+APPLE = ObjectId()
+BANANA = ObjectId()
+
+
+def make_transaction(product, name, day, quantity, total, created_at=None):
+    total = Decimal(total)
+    capital = (total * Decimal("0.6")).quantize(Decimal("0.01"))
+    return Transaction(
+        product_id=product,
+        product_name=name,
+        quantity=quantity,
+        total=total,
+        capital=capital,
+        profit=total - capital,
+        date=date(2024, 3, day),
+        created_at=created_at or datetime(2024, 3, day, 12, 30, 15, 250000),
+    )
+
+
+def make_transactions():
+    return [
+        make_transaction(APPLE, "Apple", 4, 2, "15000.50"),
+        make_transaction(BANANA, "Banana", 2, 1, "99999999999.99"),
+        make_transaction(APPLE, "Apple", 4, 5, "0.01"),
+        make_transaction(BANANA, "Green Banana", 9, 3, "15000.50"),
+    ]
+
+
+def as_batch(transactions):
+    return TransactionBatch.from_documents(t.to_dict() for t in transactions)
+
+
+def test_round_trip():
+    transactions = make_transactions()
+    batch = as_batch(transactions)
+
+    assert batch.ids.dtype == np.dtype("V12")
+    assert batch.total.dtype == np.int64
+    assert batch.total[1] == 9999999999999
+    # Pasangan produk yang sama hanya disimpan sekali
+    assert len(batch.products) == 3
+    assert batch.product_codes[0] == batch.product_codes[2]
+
+    assert len(batch) == len(transactions)
+    for expected, actual in zip(transactions, batch):
+        assert actual.to_dict() == expected.to_dict()
+
+
+def test_sort_order_breaks_ties_by_id():
+    transactions = make_transactions()
+    batch = as_batch(transactions)
+
+    def expected(field, reverse):
+        keys = [(getattr(t, field), t._id.binary) for t in transactions]
+        return sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+
+    for field in ("date", "total", "quantity", "created_at"):
+        assert list(batch.sort_order(field, 1)) == expected(field, False), field
+        assert list(batch.sort_order(field, -1)) == expected(field, True), field
+
+
+def test_match_products():
+    batch = as_batch(make_transactions())
+    names = [name for _, name in batch.products]
+
+    codes = batch.match_products("BAN")
+    assert sorted(names[code] for code in codes) == ["Banana", "Green Banana"]
+    # Query yang lebih panjang hanya memeriksa hasil sebelumnya
+    assert [names[code] for code in batch.match_products("green", codes)] == [
+        "Green Banana"
+    ]
+    assert len(batch.match_products("cherry")) == 0
+
+    rows = batch.sort_order("date", -1)
+    assert list(batch.rows_with_products(codes, rows)) == [3, 1]
+
+
+def test_replace_ids():
+    transactions = make_transactions()
+    batch = as_batch(transactions[:3])
+    edited = transactions[0]
+    edited.product_name = "Red Apple"
+    added = transactions[3]
+
+    result = batch.replace_ids(
+        [edited._id, transactions[1]._id, added._id], as_batch([edited, added])
+    )
+
+    assert [t._id for t in result] == [transactions[2]._id, edited._id, added._id]
+    assert [t.product_name for t in result] == ["Apple", "Red Apple", "Green Banana"]
+    assert result[2].total == added.total
@@ -0,0 +1,149 @@
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from pymongo.errors import BulkWriteError
+from src.database import transfer
+from src.models.product import Product
+from src.models.transaction import Transaction
+
+
+class FakeCollection:
+    """The part of a pymongo collection used by export and import"""
+
+    def __init__(self, docs=()):
+        self.docs = {doc["_id"]: doc for doc in docs}
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def aggregate(self, pipeline, **kwargs):
+        docs = list(self.docs.values())
+        for stage in pipeline:
+            if "$sort" in stage:
+                (field, direction), = stage["$sort"].items()
+                docs.sort(key=lambda doc: doc[field], reverse=direction < 0)
+            elif "$project" in stage:
+                docs = [self._project(doc, stage["$project"]) for doc in docs]
+        return iter(docs)
+
+    @staticmethod
+    def _project(doc, projection):
+        result = {}
+        for field, expression in projection.items():
+            if field not in doc:
+                continue
+            if isinstance(expression, dict):
+                # {"$toString": "$field"}, CSV tidak memakai $round
+                result[field] = str(doc[field])
+            elif expression:
+                result[field] = doc[field]
+        return result
+
+    def insert_many(self, docs, ordered=True):
+        errors = []
+        inserted = 0
+        for index, doc in enumerate(docs):
+            if doc["_id"] in self.docs:
+                errors.append({"index": index, "code": 11000})
+            else:
+                self.docs[doc["_id"]] = doc
+                inserted += 1
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": inserted})
+        return type("InsertManyResult", (), {"inserted_ids": [0] * inserted})()
+
+
+class FakeDatabase:
+    def __init__(self, **collections):
+        self.collections = collections
+
+    def get_collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def make_documents():
+    product = Product(
+        name='Kopi "Arabika", 250g',
+        price=Decimal("45000.50"),
+        capital=Decimal("30000.125"),
+        stock=12,
+        created_at=datetime(2024, 1, 2, 8, 0, 0, 123000),
+        updated_at=datetime(2024, 2, 3, 9, 30, 0),
+    )
+    transactions = [
+        Transaction(
+            product_id=product._id,
+            product_name=product.name,
+            quantity=quantity,
+            total=product.price * quantity,
+            capital=product.capital * quantity,
+            profit=(product.price - product.capital) * quantity,
+            date=day,
+            created_at=datetime.combine(day, datetime.min.time()),
+        )
+        for day, quantity in [
+            (date(2024, 1, 31), 1),
+            (date(2024, 2, 1), 3),
+            (date(2024, 2, 29), 2),
+            (date(2024, 4, 15), 5),
+        ]
+    ]
+    return [product.to_dict()], [t.to_dict() for t in transactions]
+
+
+@pytest.fixture
+def use_database(monkeypatch):
+    def use(database):
+        monkeypatch.setattr(
+            transfer.DatabaseConnection, "get_instance", staticmethod(lambda: database)
+        )
+
+    # Rollup daily_sales punya test sendiri, di sini cukup dicatat
+    use.backfills = []
+    monkeypatch.setattr(
+        transfer,
+        "DailySalesManager",
+        lambda: SimpleNamespace(backfill=lambda: use.backfills.append(True)),
+    )
+    return use
+
+
+def test_csv_round_trip(tmp_path, use_database):
+    products, transactions = make_documents()
+    use_database(
+        FakeDatabase(
+            products=FakeCollection(products),
+            transactions=FakeCollection(transactions),
+        )
+    )
+
+    exported = transfer.export_collections(str(tmp_path), "csv")
+
+    assert exported == {"transactions": 4, "products": 1}
+    assert sorted(os.listdir(tmp_path / "transactions")) == [
+        "2024-01.csv.gz",
+        "2024-02.csv.gz",
+        "2024-04.csv.gz",
+    ]
+    assert transfer.detect_format(str(tmp_path)) == "csv"
+
+    target = FakeDatabase()
+    use_database(target)
+    imported = transfer.import_collections(str(tmp_path), batch_size=2)
+
+    assert imported == {
+        "transactions": {"inserted": 4, "skipped": 0},
+        "products": {"inserted": 1, "skipped": 0},
+    }
+    assert list(target.get_collection("products").docs.values()) == products
+    assert sorted(
+        target.get_collection("transactions").docs.values(), key=lambda d: d["date"]
+    ) == transactions
+    assert use_database.backfills == [True]
+
+    # Import ulang melewati dokumen yang sudah ada
+    imported = transfer.import_collections(str(tmp_path), "csv")
+    assert imported["transactions"] == {"inserted": 0, "skipped": 4}